@@ -0,0 +1,30 @@
+"""add_catalog_footprint
+
+Revision ID: 7a3c9e1f2b4d
+Revises: 186be348bec8
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3c9e1f2b4d'
+down_revision = '186be348bec8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # catalog_items is created by Base.metadata.create_all on startup, so it may
+    # not exist yet; create_all then adds the column itself.
+    inspector = sa.inspect(op.get_bind())
+    if 'catalog_items' in inspector.get_table_names():
+        op.add_column('catalog_items', sa.Column('footprint', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if 'catalog_items' in inspector.get_table_names():
+        op.drop_column('catalog_items', 'footprint')
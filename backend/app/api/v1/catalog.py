@@ -7,6 +7,7 @@ Flow:
 - API requests: Read from DB, generate presigned URLs on demand
 """
 
+import asyncio
 from typing import List, Optional
 
 import boto3
@@ -17,6 +18,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_admin_user
 from app.config import settings
+from app.core.catalog_mounts import catalog_mounts
 from app.database import get_db, SessionLocal
 from app.models.catalog_item import CatalogItem
 from app.models.user import User
@@ -46,6 +48,7 @@ class FurnitureCatalogItemSchema(BaseModel):
     price: Optional[int] = None
     tags: List[str]
     mountType: Optional[str] = None
+    footprint: Optional[List[List[List[float]]]] = None
     glbUrl: Optional[str] = None
     glbKey: Optional[str] = None
 
@@ -84,6 +87,55 @@ def generate_presigned_url(s3_client, glb_key: str) -> Optional[str]:
         return None
 
 
+def _footprint_or_failed(footprint: Optional[List]) -> List:
+    """
+    Footprint to store for an extraction result.
+
+    A failed extraction is stored as [] so sync does not download the GLB again
+    on every run; collision code treats [] like a missing footprint and uses
+    the item's rectangle.
+    """
+    return footprint if footprint is not None else []
+
+
+def _download_footprint(s3, glb_key: str) -> List:
+    """Download a GLB from S3 and compute its footprint, [] on any failure."""
+    import os
+    import tempfile
+    from pathlib import Path
+    from app.utils.glb_utils import extract_glb_footprint
+
+    try:
+        with tempfile.NamedTemporaryFile(suffix='.glb', delete=False) as tmp:
+            s3.download_fileobj(settings.S3_BUCKET_NAME, glb_key, tmp)
+            tmp_path = Path(tmp.name)
+    except Exception as e:
+        logger.info(f"   -> Failed to download {glb_key}: {e}")
+        return []
+    try:
+        return _footprint_or_failed(extract_glb_footprint(tmp_path))
+    finally:
+        os.unlink(tmp_path)
+
+
+def _upload_footprint(fileobj) -> List:
+    """Compute the footprint of an uploaded GLB from a local copy, rewinding the upload."""
+    import os
+    import shutil
+    import tempfile
+    from pathlib import Path
+    from app.utils.glb_utils import extract_glb_footprint
+
+    with tempfile.NamedTemporaryFile(suffix='.glb', delete=False) as tmp:
+        shutil.copyfileobj(fileobj, tmp)
+        tmp_path = Path(tmp.name)
+    try:
+        return _footprint_or_failed(extract_glb_footprint(tmp_path))
+    finally:
+        os.unlink(tmp_path)
+        fileobj.seek(0)
+
+
 def sync_catalog_from_s3() -> dict:
     """
     Sync GLB files from S3 to database.
@@ -144,7 +196,7 @@ def sync_catalog_from_s3() -> dict:
             logger.info(f"Removing '{item_id}' (no longer in S3)")
 
         # Import here to avoid circular imports if any
-        from app.utils.glb_utils import extract_glb_dimensions
+        from app.utils.glb_utils import extract_glb_dimensions, extract_glb_footprint
         import tempfile
         import os
         from pathlib import Path
@@ -157,8 +209,10 @@ def sync_catalog_from_s3() -> dict:
             # 1. New item
             # 2. Existing item with default dimensions (1.0, 1.0, 1.0)
             # 3. Existing item with changed GLB key
+            # Existing items without a footprint yet only get the footprint
             
             needs_processing = False
+            needs_footprint = False
             is_new = False
             
             if not item:
@@ -172,9 +226,18 @@ def sync_catalog_from_s3() -> dict:
                 # Check if it's really 1x1x1 or just default
                 # We'll re-process to be sure
                 needs_processing = True
+            elif item.footprint is None:
+                # Keep the (possibly admin-edited) dimensions
+                needs_footprint = True
+
+            if needs_footprint:
+                logger.info(f"Computing footprint for {item_id}...")
+                item.footprint = _download_footprint(s3, glb_key)
+                result["updated"] += 1
                 
             if needs_processing:
                 logger.info(f"Processing dimensions for {item_id}...")
+                footprint = []
                 
                 # Download to temp file
                 try:
@@ -184,6 +247,7 @@ def sync_catalog_from_s3() -> dict:
                     
                     # Extract dimensions
                     dims = extract_glb_dimensions(tmp_path)
+                    footprint = _footprint_or_failed(extract_glb_footprint(tmp_path))
                     
                     # Clean up
                     if tmp_path.exists():
@@ -247,6 +311,7 @@ def sync_catalog_from_s3() -> dict:
                         price=100000,
                         tags=[item_type, category],
                         mount_type="floor",
+                        footprint=footprint,
                         glb_key=glb_key,
                     )
                     db.add(new_item)
@@ -257,9 +322,11 @@ def sync_catalog_from_s3() -> dict:
                     item.width = width
                     item.height = height
                     item.depth = depth
+                    item.footprint = footprint
                     result["updated"] += 1
 
         db.commit()
+        catalog_mounts.refresh()
         logger.info(f"Catalog sync complete: {result['added']} added, {result['updated']} updated, {result['deleted']} deleted")
 
     except ClientError as e:
@@ -299,6 +366,7 @@ async def get_catalog(db: Session = Depends(get_db)):
                 price=item.price,
                 tags=item.tags or [],
                 mountType=item.mount_type,
+                footprint=item.footprint,
                 glbUrl=glb_url,
                 glbKey=item.glb_key,
             ))
@@ -400,6 +468,7 @@ async def update_catalog_item(
         item.mount_type = mount_type
 
     db.commit()
+    catalog_mounts.refresh()
     db.refresh(item)
 
     s3 = get_s3_client()
@@ -421,6 +490,7 @@ async def delete_catalog_item(
 
     db.delete(item)
     db.commit()
+    catalog_mounts.refresh()
 
     return {"message": f"Item {item_id} deleted"}
 
@@ -440,6 +510,9 @@ async def upload_glb(
         s3 = get_s3_client()
         glb_key = f"catalog/models/{item_id}.glb"
 
+        # Compute the collision footprint once, off the event loop
+        footprint = await asyncio.to_thread(_upload_footprint, file.file)
+
         # Upload to S3
         s3.upload_fileobj(
             file.file,
@@ -452,6 +525,7 @@ async def upload_glb(
         item = db.query(CatalogItem).filter(CatalogItem.id == item_id).first()
         if item:
             item.glb_key = glb_key
+            item.footprint = footprint
         else:
             # Create new item
             name_parts = item_id.replace('_', ' ').title()
@@ -460,11 +534,13 @@ async def upload_glb(
                 name=name_parts,
                 type="decoration",
                 category="decoration",
+                footprint=footprint,
                 glb_key=glb_key,
             )
             db.add(item)
 
         db.commit()
+        catalog_mounts.refresh()
 
         presigned_url = generate_presigned_url(s3, glb_key)
 
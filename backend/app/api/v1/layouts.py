@@ -1,18 +1,32 @@
 """Layout management API endpoints."""
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Body, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
+from app.api.v1 import websocket
+from app.config import settings
 from app.database import get_db
 from app.models.user import User
-from app.schemas.layout import LayoutCreate, LayoutResponse, ValidationResult
+from app.schemas.layout import (
+    BatchValidationResult,
+    LayoutCreate,
+    LayoutResponse,
+    PlacementQuery,
+    PlacementResult,
+    ProximityQuery,
+    ProximityResult,
+    ValidationResult,
+)
 from app.services.layout_service import (
     LayoutService,
+    CatalogItemNotFoundError,
+    FurnitureNotFoundError,
     LayoutNotFoundError,
     ProjectNotFoundError,
+    PlacementNotSupportedError,
     ProjectAccessDeniedError,
 )
 
@@ -44,7 +58,7 @@ def create_layout(
         Created layout object
     """
     try:
-        return layout_service.create(
+        layout = layout_service.create(
             project_id=project_id,
             user=current_user,
             furniture_state=layout_data.furniture_state,
@@ -61,6 +75,10 @@ def create_layout(
             detail="Not authorized to access this project"
         )
 
+    # A live collaboration room of the project now follows the saved layout
+    websocket.notify_layout_replaced(project_id)
+    return layout
+
 
 @router.get("/projects/{project_id}/layouts/current", response_model=LayoutResponse)
 def get_current_layout(
@@ -98,6 +116,107 @@ def get_current_layout(
         )
 
 
+@router.post("/projects/{project_id}/layouts/current/proximity", response_model=ProximityResult)
+def query_current_layout_proximity(
+    project_id: int,
+    query: ProximityQuery,
+    current_user: User = Depends(get_current_user),
+    layout_service: LayoutService = Depends(get_layout_service),
+):
+    """
+    Distance and clearance queries against the current layout.
+
+    Args:
+        project_id: Project ID
+        query: k-nearest, within-distance and/or minimum pairwise distance checks
+        current_user: Current authenticated user
+        layout_service: Layout service instance
+
+    Returns:
+        Results for the requested checks
+    """
+    try:
+        return layout_service.proximity(
+            project_id,
+            current_user,
+            furniture_id=query.furniture_id,
+            k=query.k,
+            within=query.within,
+            min_distance=query.min_distance,
+        )
+    except ProjectNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    except ProjectAccessDeniedError:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this project"
+        )
+    except LayoutNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No current layout found"
+        )
+    except FurnitureNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Furniture not found in current layout"
+        )
+
+
+@router.post("/projects/{project_id}/layouts/current/placements", response_model=PlacementResult)
+def find_current_layout_placements(
+    project_id: int,
+    query: PlacementQuery,
+    current_user: User = Depends(get_current_user),
+    layout_service: LayoutService = Depends(get_layout_service),
+):
+    """
+    Find collision-free positions for a catalog item in the current layout.
+
+    Args:
+        project_id: Project ID
+        query: Catalog item, rotations to try, result count and optional target point
+        current_user: Current authenticated user
+        layout_service: Layout service instance
+
+    Returns:
+        Placements ranked by distance to the target point, or by clearance
+    """
+    try:
+        placements = layout_service.find_placements(
+            project_id,
+            current_user,
+            query.catalog_item_id,
+            rotations=query.rotations,
+            limit=query.limit,
+            near=query.near,
+        )
+        return {"placements": placements}
+    except ProjectNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    except ProjectAccessDeniedError:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this project"
+        )
+    except CatalogItemNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Catalog item not found"
+        )
+    except PlacementNotSupportedError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only floor items can be placed automatically"
+        )
+
+
 @router.get("/projects/{project_id}/layouts", response_model=List[LayoutResponse])
 def list_layouts(
     project_id: int,
@@ -149,7 +268,7 @@ def restore_layout(
         Restored layout object
     """
     try:
-        return layout_service.restore(project_id, layout_id, current_user)
+        layout = layout_service.restore(project_id, layout_id, current_user)
     except ProjectNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -166,11 +285,15 @@ def restore_layout(
             detail="Layout not found"
         )
 
+    websocket.notify_layout_replaced(project_id)
+    return layout
+
 
 @router.post("/validate", response_model=ValidationResult)
 def validate_furniture_layout(
     furniture_state: Dict[str, Any] = Body(...),
     room_dimensions: Dict[str, float] = Body(...),
+    room_structure: Optional[Dict[str, Any]] = Body(None),
 ):
     """
     Validate furniture layout for collisions and boundary violations.
@@ -179,9 +302,32 @@ def validate_furniture_layout(
     Args:
         furniture_state: Furniture state dict with 'furnitures' list
         room_dimensions: Room dimensions dict with width, height, depth
+        room_structure: Optional free-build room structure; items must sit on its floor tiles
 
     Returns:
         Validation result with collisions and out of bounds items
     """
-    result = LayoutService.validate(furniture_state, room_dimensions)
+    result = LayoutService.validate(furniture_state, room_dimensions, room_structure)
     return result
+
+
+@router.post("/validate/batch", response_model=BatchValidationResult)
+def validate_furniture_layouts(
+    furniture_states: List[Dict[str, Any]] = Body(..., min_length=1, max_length=settings.VALIDATION_MAX_BATCH),
+    room_dimensions: Dict[str, float] = Body(...),
+    room_structure: Optional[Dict[str, Any]] = Body(None),
+):
+    """
+    Validate many candidate layouts of one room in a single request.
+    Large batches are spread over a process pool. Does not save to database.
+
+    Args:
+        furniture_states: Furniture state dicts, one per candidate
+        room_dimensions: Room dimensions dict with width, height, depth
+        room_structure: Optional free-build room structure; items must sit on its floor tiles
+
+    Returns:
+        One validation result per candidate, in request order
+    """
+    results = LayoutService.validate_batch(furniture_states, room_dimensions, room_structure)
+    return {"results": results}
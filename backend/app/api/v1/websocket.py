@@ -1,7 +1,9 @@
 """WebSocket server for real-time collaboration."""
 
+import asyncio
+import functools
 import math
-from typing import Dict, Set
+from typing import Callable, Dict, Hashable, Optional, Set, Tuple
 
 import socketio
 from socketio.exceptions import ConnectionRefusedError
@@ -9,34 +11,142 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import resolve_user_from_token
 from app.config import settings
-from app.core.collision import validate_layout
+from app.core.access_cache import project_access_cache
+from app.core.catalog_mounts import catalog_mounts
+from app.core.collab_state import LOCK_EXPIRY_TICK, InMemoryStateStore, create_client_manager, create_state_store
+from app.core.layout_writer import LayoutWriteBehind
 from app.core.logging import get_logger
+from app.core.move_broadcast import MoveBroadcaster
+from app.core.presence import PresenceAggregator
+from app.core.rate_limit import EventRateLimiter
+from app.core.room_state import RoomState, RoomStateRegistry
+from app.core.validation_pool import validate_layout_offloaded
+from app.core.validation_runner import ValidationRunner
+from app.core.wire import WireEmitter, decoded, negotiate
 from app.database import SessionLocal
+from app.models.layout import Layout
+from app.models.project import Project
 from app.models.user import User
+from app.services.layout_service import LayoutReplacedError, LayoutService
 from app.services.project_service import ProjectAccessDeniedError, ProjectNotFoundError, ProjectService
 
 logger = get_logger("websocket")
 
-# Create Socket.IO server with restricted CORS origins
+# Create Socket.IO server with restricted CORS origins; the client manager
+# relays emits between workers when a message queue is configured
 sio = socketio.AsyncServer(
     async_mode="asgi",
+    client_manager=create_client_manager(settings.SOCKETIO_MESSAGE_QUEUE),
     cors_allowed_origins=settings.origins_list,
     logger=True,
     engineio_logger=False,
 )
 
-# Track active connections per project
-# {project_id: {sid: {user_id, nickname, color, sid}}}
-active_rooms: Dict[int, Dict[str, dict]] = {}
+# Room membership and furniture locks, shared by every worker
+state_store = create_state_store(settings.collab_state_url)
+if settings.SOCKETIO_MESSAGE_QUEUE and isinstance(state_store, InMemoryStateStore):
+    logger.warning("SOCKETIO_MESSAGE_QUEUE is set but collaboration state is per process; set COLLAB_STATE_URL")
+if not settings.collab_live_state:
+    logger.info("Multi-worker collaboration: live room state and write-behind saves are off; clients autosave")
 
-# Track locked objects
-# {project_id: {furniture_id: {sid, user_id}}}
-locked_objects: Dict[int, Dict[str, dict]] = {}
+# Emits in each socket's negotiated encoding (JSON or MessagePack)
+wire = WireEmitter(sio)
 
-# Track authenticated sockets and joined rooms
+# furniture_move is coalesced into furniture_updates frames per room
+move_broadcaster = MoveBroadcaster(wire, settings.COLLAB_BROADCAST_HZ)
+
+# update_presence is batched into presence_snapshot events per room
+presence_aggregator = PresenceAggregator(wire, settings.COLLAB_PRESENCE_HZ)
+
+# Authenticated sockets and joined rooms of connections owned by this worker
 socket_users: Dict[str, dict] = {}
 socket_rooms: Dict[str, Set[int]] = {}
 
+# Joins of this worker that have not yet added their member, per project
+_joining: Dict[int, int] = {}
+
+# Live furniture and collision state per project, loaded from the current layout
+# on first join. Kept per worker: it reflects the edits received by this process.
+room_states = RoomStateRegistry()
+
+# Live room state is written back to the current layout, coalescing every collaborator's edits
+layout_writer = LayoutWriteBehind(
+    lambda project_id, layout_id, furniture_state: _save_room_state(project_id, layout_id, furniture_state),
+    settings.COLLAB_SAVE_INTERVAL,
+    on_replaced=lambda project_id: _reseed_room(project_id),
+)
+
+# Loop running the Socket.IO handlers, so REST worker threads can schedule room work
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_tasks: Set[asyncio.Task] = set()
+
+# validate_furniture runs off the event loop, one validation at a time per project
+validation_runner = ValidationRunner(
+    validate_layout_offloaded,
+    lambda project_id, result: _publish_collisions(project_id, result),
+)
+
+
+def _rate_limits() -> Dict[str, Tuple[float, float]]:
+    """Configured (rate, burst) per limited event."""
+    rates = {
+        "furniture_move": settings.COLLAB_MOVE_RATE,
+        "update_presence": settings.COLLAB_PRESENCE_RATE,
+        "validate_furniture": settings.COLLAB_VALIDATE_RATE,
+        "furniture_add": settings.COLLAB_EDIT_RATE,
+        "furniture_resize": settings.COLLAB_EDIT_RATE,
+        "furniture_delete": settings.COLLAB_EDIT_RATE,
+        "request_lock": settings.COLLAB_EDIT_RATE,
+        "release_lock": settings.COLLAB_EDIT_RATE,
+        "lock_heartbeat": settings.COLLAB_EDIT_RATE,
+    }
+    return {event: (rate, max(1.0, rate * settings.COLLAB_RATE_BURST)) for event, rate in rates.items()}
+
+
+# Per-socket event budgets, so one flooding tab cannot degrade its room
+rate_limiter = EventRateLimiter(_rate_limits())
+
+
+def throttled(coalesce_key: Optional[Callable[[dict], Hashable]] = None):
+    """
+    Rate-limit a Socket.IO event handler per socket.
+
+    Events over the socket's budget are dropped, or with coalesce_key parked
+    so that only the newest event per key is handled once the budget allows.
+    The socket is told with a rate_limited event when notices are enabled.
+
+    Args:
+        coalesce_key: Function mapping a payload to its coalescing key
+    """
+
+    def decorate(handler):
+        event = handler.__name__
+
+        @functools.wraps(handler)
+        async def wrapper(sid, data):
+            if rate_limiter.allow(sid, event):
+                return await handler(sid, data)
+
+            if coalesce_key is None:
+                notify = rate_limiter.drop(sid, event)
+            else:
+                notify = rate_limiter.defer(sid, event, coalesce_key(data), lambda: handler(sid, data))
+            if notify and settings.COLLAB_RATE_LIMIT_NOTICE:
+                await wire.emit(
+                    "rate_limited",
+                    {
+                        "event": event,
+                        "coalesced": coalesce_key is not None,
+                        "retry_after": round(rate_limiter.retry_after(sid, event), 3),
+                    },
+                    to=sid,
+                )
+            return None
+
+        return wrapper
+
+    return decorate
+
 
 def _extract_token(auth: dict | None, environ: dict) -> str | None:
     """Extract a bearer token from the Socket.IO auth payload or headers."""
@@ -71,11 +181,191 @@ def _socket_joined_project(sid: str, project_id: int) -> bool:
     return project_id in socket_rooms.get(sid, set())
 
 
+def _room_dimensions(project: Project) -> dict:
+    """Return the project's room dimensions in validate_layout format."""
+    return {"width": project.room_width, "height": project.room_height, "depth": project.room_depth}
+
+
+def _has_project_access(db: Session, user_id: int, project_id: int) -> bool:
+    """
+    Check whether a user may open a project.
+
+    Raises:
+        ProjectNotFoundError: If the project does not exist
+    """
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None:
+        return False
+    try:
+        ProjectService(db).get_with_access_check(project_id, user)
+    except ProjectAccessDeniedError:
+        return False
+    return True
+
+
+async def _check_project_access(user_id: int, project_id: int) -> bool:
+    """Access check for join_project, answered from the access cache or a worker thread."""
+    allowed = project_access_cache.get(user_id, project_id)
+    if allowed is None:
+        allowed = await asyncio.to_thread(_with_db, lambda db: _has_project_access(db, user_id, project_id))
+        project_access_cache.put(user_id, project_id, allowed)
+    return allowed
+
+
+def _missed_ops(state: RoomState, data: dict) -> Optional[list]:
+    """Operations a rejoining client missed, or None if it needs a full room_snapshot."""
+    last_seq = data.get("last_seq")
+    if data.get("epoch") != state.epoch or not isinstance(last_seq, int) or isinstance(last_seq, bool):
+        return None
+    return state.ops_since(last_seq)
+
+
+def _build_room_state(db: Session, project_id: int) -> RoomState:
+    """Seed a room's live state from the project's current layout."""
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if project is None:
+        raise ProjectNotFoundError("Project not found")
+    layout = (
+        db.query(Layout)
+        .filter(Layout.project_id == project_id, Layout.is_current == True)
+        .first()
+    )
+    return RoomState(
+        project_id,
+        catalog_mounts.resolve_state(layout.furniture_state) if layout else None,
+        _room_dimensions(project),
+        project.room_structure,
+        layout_id=layout.id if layout else None,
+        op_log_size=settings.COLLAB_OP_LOG_SIZE,
+    )
+
+
+async def _load_room_state(project_id: int) -> RoomState:
+    """Load a room's live state without blocking the event loop."""
+    return await asyncio.to_thread(_with_db, lambda db: _build_room_state(db, project_id))
+
+
+def _save_room_state(project_id: int, layout_id: Optional[int], furniture_state: dict) -> Optional[int]:
+    """Persist a room's live furniture state; None if its layout is no longer current."""
+    try:
+        layout = _with_db(lambda db: LayoutService(db).save_live_state(project_id, furniture_state, layout_id))
+    except LayoutReplacedError:
+        return None
+    return layout.id
+
+
+async def _reseed_room(project_id: int) -> None:
+    """Reload a live room whose current layout was replaced outside it and resend it to the members."""
+    if project_id not in room_states:
+        return
+    try:
+        state = await _load_room_state(project_id)
+    except ProjectNotFoundError:
+        return
+    move_broadcaster.drop_room(project_id)
+    layout_writer.drop_room(project_id)
+    room_states.replace(project_id, state)
+
+    room = f"project_{project_id}"
+    await wire.emit("room_snapshot", state.snapshot(), room=room)
+    await wire.emit("collision_state", state.collision.result(), room=room)
+
+
+def notify_layout_replaced(project_id: int) -> None:
+    """
+    Reload a project's live room after a REST save or restore made another layout current.
+
+    Safe to call from any thread; does nothing if no socket has connected to this worker.
+
+    Args:
+        project_id: Project ID
+    """
+    loop = _event_loop
+    if loop is None or loop.is_closed():
+        return
+    loop.call_soon_threadsafe(_start_reseed, project_id)
+
+
+def _start_reseed(project_id: int) -> None:
+    if project_id not in room_states:
+        return
+    task = asyncio.create_task(_reseed_room(project_id))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _push_collision_state(project_id: int) -> None:
+    """Broadcast the live collision state of a project room."""
+    state = room_states.get(project_id)
+    if state is None:
+        return
+    await wire.emit("collision_state", state.collision.result(), room=f"project_{project_id}")
+
+
 def _generate_user_color(user_id: int) -> str:
     """Generate a deterministic collaboration color for the user."""
     return f"#{int(abs(math.sin(user_id) * 16777215)) & 0xFFFFFF:06x}"
 
 
+def _nickname(user: User) -> str:
+    """Return the display name shown to collaborators."""
+    return user.full_name or user.email.split("@")[0] or f"User {user.id}"
+
+
+def _seq_of(state: Optional[RoomState]) -> dict:
+    """Sequence number field for a room broadcast, if the room keeps one."""
+    return {"seq": state.version} if state is not None else {}
+
+
+def _is_vector(value) -> bool:
+    """Whether a payload value is a dict with finite numeric x, y and z."""
+    if not isinstance(value, dict):
+        return False
+    return all(
+        isinstance(value.get(axis), (int, float))
+        and not isinstance(value.get(axis), bool)
+        and math.isfinite(value[axis])
+        for axis in ("x", "y", "z")
+    )
+
+
+def _is_size(value) -> bool:
+    """Whether a payload value is a dict with finite positive width, height and depth."""
+    if not isinstance(value, dict):
+        return False
+    return all(
+        isinstance(value.get(side), (int, float))
+        and not isinstance(value.get(side), bool)
+        and math.isfinite(value[side])
+        and value[side] > 0
+        for side in ("width", "height", "depth")
+    )
+
+
+async def _publish_collisions(project_id: int, result: dict) -> None:
+    """Tell the room about collisions in a settled validation result."""
+    if not result["valid"]:
+        await wire.emit(
+            "collision_detected",
+            {"collisions": result["collisions"], "out_of_bounds": result["out_of_bounds"]},
+            room=f"project_{project_id}",
+        )
+
+
+async def _close_room(project_id: int) -> None:
+    """Save and forget a room's live state once its last member has left."""
+    move_broadcaster.drop_room(project_id)
+    presence_aggregator.drop_room(project_id)
+    await layout_writer.flush(project_id)
+    if _joining.get(project_id) or await state_store.get_members(project_id):
+        # Someone joined, or is joining, while the room was being saved
+        return
+    # Reseed from the saved layout when the room is next joined
+    layout_writer.drop_room(project_id)
+    validation_runner.drop_room(project_id)
+    room_states.drop(project_id)
+
+
 @sio.event
 async def connect(sid, environ, auth):
     """Authenticate the Socket.IO connection before accepting it."""
@@ -84,17 +374,24 @@ async def connect(sid, environ, auth):
         raise ConnectionRefusedError("Authentication required")
 
     try:
-        user = _with_db(lambda db: resolve_user_from_token(token, db))
+        user = await asyncio.to_thread(_with_db, lambda db: resolve_user_from_token(token, db))
     except Exception as exc:
         raise ConnectionRefusedError("Authentication failed") from exc
 
+    global _event_loop
+    _event_loop = asyncio.get_running_loop()
+
+    # Collaboration identity is cached for the lifetime of the socket
     socket_users[sid] = {
         "id": user.id,
         "email": user.email,
         "full_name": user.full_name,
+        "nickname": _nickname(user),
+        "color": _generate_user_color(user.id),
     }
     socket_rooms[sid] = set()
-    logger.debug(f"Authenticated client {sid} as user {user.id}")
+    wire.register(sid, negotiate(auth))
+    logger.debug(f"Authenticated client {sid} as user {user.id} ({wire.encoding(sid)})")
 
 
 @sio.event
@@ -102,29 +399,28 @@ async def disconnect(sid):
     """Handle client disconnection and clean up ephemeral collaboration state."""
     logger.debug(f"Client {sid} disconnected")
 
-    for project_id, users in active_rooms.items():
-        if sid in users:
-            del users[sid]
+    for project_id in await state_store.member_projects(sid):
+        removed, remaining = await state_store.remove_member(project_id, sid)
+        if removed:
             room = f"project_{project_id}"
-            await sio.emit("user_left", {"sid": sid}, room=room, skip_sid=sid)
+            await wire.emit("user_left", {"sid": sid}, room=room, skip_sid=sid)
+        presence_aggregator.remove(project_id, sid)
+        if not remaining:
+            await _close_room(project_id)
 
-    for project_id, locks in locked_objects.items():
-        locks_to_remove = []
-        for furniture_id, lock_info in locks.items():
-            if lock_info.get("sid") == sid:
-                locks_to_remove.append(furniture_id)
-
-        for furniture_id in locks_to_remove:
-            del locks[furniture_id]
-            room = f"project_{project_id}"
-            await sio.emit("object_unlocked", {"furniture_id": furniture_id}, room=room)
-            logger.debug(f"Auto-released lock on {furniture_id} for disconnected user {sid}")
+    for project_id, furniture_id in await state_store.release_socket_locks(sid):
+        room = f"project_{project_id}"
+        await wire.emit("object_unlocked", {"furniture_id": furniture_id}, room=room)
+        logger.debug(f"Auto-released lock on {furniture_id} for disconnected user {sid}")
 
     socket_users.pop(sid, None)
     socket_rooms.pop(sid, None)
+    rate_limiter.forget(sid)
+    wire.forget(sid)
 
 
 @sio.event
+@decoded
 async def join_project(sid, data):
     """Join a project room only after verifying project access."""
     project_id = data.get("project_id")
@@ -137,40 +433,71 @@ async def join_project(sid, data):
         await sio.disconnect(sid)
         return
 
+    # Pinned until the join is done, so a last leave cannot close the room under it
+    _joining[project_id] = _joining.get(project_id, 0) + 1
     try:
-        def _load_user(db: Session):
-            user = db.query(User).filter(User.id == socket_user["id"]).first()
-            if user is None:
-                raise ProjectAccessDeniedError("User not found")
-            ProjectService(db).get_with_access_check(project_id, user)
-            return user
-
-        user = _with_db(_load_user)
-    except (ProjectNotFoundError, ProjectAccessDeniedError):
-        await sio.emit("join_error", {"message": "Not authorized to join this project"}, to=sid)
-        return
+        try:
+            allowed = await _check_project_access(socket_user["id"], project_id)
+            room_state = None
+            if allowed and settings.collab_live_state:
+                # Concurrent first joins share one load
+                room_state = await room_states.get_or_load(project_id, lambda: _load_room_state(project_id))
+            if allowed and not catalog_mounts.loaded:
+                # Edits and validations of joined sockets then resolve mount types without a query
+                await asyncio.to_thread(catalog_mounts.mount_types)
+        except ProjectNotFoundError:
+            allowed = False
+        if not allowed:
+            await wire.emit("join_error", {"message": "Not authorized to join this project"}, to=sid)
+            return
+
+        await _admit_member(sid, socket_user, project_id, room_state, data)
+    finally:
+        _joining[project_id] -= 1
+        if not _joining[project_id]:
+            del _joining[project_id]
+            if project_id in room_states and not await state_store.get_members(project_id):
+                # A leave skipped closing the room for this join, which then failed
+                await _close_room(project_id)
 
-    user_id = user.id
-    nickname = user.full_name or user.email.split("@")[0] or f"User {user_id}"
-    color = _generate_user_color(user_id)
+
+async def _admit_member(sid, socket_user: dict, project_id: int, room_state: Optional[RoomState], data: dict) -> None:
+    """Put an authorized socket in a project room and send it the room's state."""
+    user_id = socket_user["id"]
+    nickname = socket_user["nickname"]
+    color = socket_user["color"]
 
     room = f"project_{project_id}"
-    await sio.enter_room(sid, room)
+    await wire.enter_room(sid, room)
     socket_rooms.setdefault(sid, set()).add(project_id)
 
-    if project_id not in active_rooms:
-        active_rooms[project_id] = {}
-
-    active_rooms[project_id][sid] = {
-        "user_id": user_id,
-        "nickname": nickname,
-        "color": color,
-        "sid": sid,
-    }
+    # Every edit applied before this point is in the snapshot (or the resumed ops)
+    # and every later one reaches the socket as an event, so the two never leave a gap
+    if room_state is not None:
+        missed_ops = _missed_ops(room_state, data)
+        if missed_ops is None:
+            await wire.emit("room_snapshot", room_state.snapshot(), to=sid)
+        else:
+            await wire.emit(
+                "room_resume",
+                {"project_id": project_id, "epoch": room_state.epoch, "seq": room_state.version, "ops": missed_ops},
+                to=sid,
+            )
+
+    await state_store.add_member(
+        project_id,
+        sid,
+        {
+            "user_id": user_id,
+            "nickname": nickname,
+            "color": color,
+            "sid": sid,
+        },
+    )
 
     logger.info(f"User {nickname} ({user_id}) joined project {project_id}")
 
-    await sio.emit(
+    await wire.emit(
         "user_joined",
         {
             "user_id": user_id,
@@ -182,21 +509,26 @@ async def join_project(sid, data):
         skip_sid=sid,
     )
 
-    current_users = list(active_rooms[project_id].values())
-    await sio.emit("current_users", {"users": current_users}, to=sid)
+    current_users = await state_store.get_members(project_id)
+    await wire.emit("current_users", {"users": current_users}, to=sid)
 
-    current_locks = locked_objects.get(project_id, {})
+    current_locks = await state_store.get_locks(project_id)
     if current_locks:
         locks_data = [
             {"furniture_id": furniture_id, "locked_by": lock_info.get("user_id")}
             for furniture_id, lock_info in current_locks.items()
         ]
-        await sio.emit("current_locks", {"locks": locks_data}, to=sid)
+        await wire.emit("current_locks", {"locks": locks_data}, to=sid)
+
+    if room_state is not None:
+        await wire.emit("collision_state", room_state.collision.result(), to=sid)
 
 
 @sio.event
+@decoded
+@throttled(coalesce_key=lambda data: (data.get("project_id"), data.get("furniture_id")))
 async def furniture_move(sid, data):
-    """Broadcast furniture movement to authorized collaborators."""
+    """Queue furniture movement for the room's next furniture_updates frame."""
     project_id = data.get("project_id")
     furniture_id = data.get("furniture_id")
     position = data.get("position")
@@ -204,19 +536,32 @@ async def furniture_move(sid, data):
 
     if not all([project_id, furniture_id, position]):
         return
+    # Moves are applied to the room state and saved, so malformed poses are dropped
+    if not _is_vector(position) or (rotation is not None and not _is_vector(rotation)):
+        return
     project_id = int(project_id)
     if not _socket_joined_project(sid, project_id):
         return
 
-    await sio.emit(
-        "furniture_updated",
-        {"furniture_id": furniture_id, "position": position, "rotation": rotation},
-        room=f"project_{project_id}",
-        skip_sid=sid,
-    )
+    # Apply before broadcasting so a concurrent join's snapshot cannot miss the edit
+    state = room_states.get(project_id)
+    collision_changed = state is not None and state.move(furniture_id, position, rotation)
+    if state is not None:
+        await layout_writer.mark_dirty(state)
+
+    seq = state.version if state is not None else None
+    await move_broadcaster.queue(project_id, sid, furniture_id, position, rotation, seq=seq)
+    if collision_changed:
+        await _push_collision_state(project_id)
+
+    # Dragging a locked item keeps its lease alive
+    if settings.COLLAB_LOCK_TTL:
+        await state_store.renew_lock(project_id, furniture_id, sid, settings.COLLAB_LOCK_TTL)
 
 
 @sio.event
+@decoded
+@throttled()
 async def furniture_add(sid, data):
     """Broadcast furniture creation to authorized collaborators."""
     project_id = data.get("project_id")
@@ -227,11 +572,63 @@ async def furniture_add(sid, data):
     project_id = int(project_id)
     if not _socket_joined_project(sid, project_id):
         return
+    if isinstance(furniture, dict):
+        # Catalog items collide by their catalog mount type, whatever the client sent
+        furniture = catalog_mounts.resolve(furniture)
+
+    state = room_states.get(project_id)
+    collision_changed = state is not None and isinstance(furniture, dict) and state.add(furniture)
+    if state is not None:
+        await layout_writer.mark_dirty(state)
+
+    # Queued moves go out first so sequence numbers reach clients in order
+    await move_broadcaster.flush(project_id)
+    await wire.emit(
+        "furniture_added",
+        {"furniture": furniture, **_seq_of(state)},
+        room=f"project_{project_id}",
+        skip_sid=sid,
+    )
+    if collision_changed:
+        await _push_collision_state(project_id)
 
-    await sio.emit("furniture_added", {"furniture": furniture}, room=f"project_{project_id}", skip_sid=sid)
+
+@sio.event
+@decoded
+@throttled()
+async def furniture_resize(sid, data):
+    """Broadcast a furniture item's new dimensions, e.g. once its model has loaded."""
+    project_id = data.get("project_id")
+    furniture_id = data.get("furniture_id")
+    dimensions = data.get("dimensions")
+
+    if not all([project_id, furniture_id]) or not _is_size(dimensions):
+        return
+    project_id = int(project_id)
+    if not _socket_joined_project(sid, project_id):
+        return
+    dimensions = {side: dimensions[side] for side in ("width", "height", "depth")}
+
+    state = room_states.get(project_id)
+    collision_changed = state is not None and state.resize(furniture_id, dimensions)
+    if state is not None:
+        await layout_writer.mark_dirty(state)
+
+    # Queued moves go out first so sequence numbers reach clients in order
+    await move_broadcaster.flush(project_id)
+    await wire.emit(
+        "furniture_resized",
+        {"furniture_id": furniture_id, "dimensions": dimensions, **_seq_of(state)},
+        room=f"project_{project_id}",
+        skip_sid=sid,
+    )
+    if collision_changed:
+        await _push_collision_state(project_id)
 
 
 @sio.event
+@decoded
+@throttled()
 async def furniture_delete(sid, data):
     """Broadcast furniture deletion to authorized collaborators."""
     project_id = data.get("project_id")
@@ -243,15 +640,26 @@ async def furniture_delete(sid, data):
     if not _socket_joined_project(sid, project_id):
         return
 
-    await sio.emit(
+    state = room_states.get(project_id)
+    collision_changed = state is not None and state.remove(furniture_id)
+    if state is not None:
+        await layout_writer.mark_dirty(state)
+
+    move_broadcaster.discard(project_id, furniture_id)
+    await move_broadcaster.flush(project_id)
+    await wire.emit(
         "furniture_deleted",
-        {"furniture_id": furniture_id},
+        {"furniture_id": furniture_id, **_seq_of(state)},
         room=f"project_{project_id}",
         skip_sid=sid,
     )
+    if collision_changed:
+        await _push_collision_state(project_id)
 
 
 @sio.event
+@decoded
+@throttled()
 async def validate_furniture(sid, data):
     """Validate furniture layout and send results."""
     project_id = data.get("project_id")
@@ -264,18 +672,18 @@ async def validate_furniture(sid, data):
     if not _socket_joined_project(sid, project_id):
         return
 
-    result = validate_layout(furniture_state, room_dimensions)
-    await sio.emit("validation_result", result, to=sid)
+    # Free-build floors and catalog mount types come from the server, not the client payload
+    state = room_states.get(project_id)
+    room_structure = state.room_structure if state is not None else None
+    furniture_state = catalog_mounts.resolve_state(furniture_state)
 
-    if not result["valid"]:
-        await sio.emit(
-            "collision_detected",
-            {"collisions": result["collisions"], "out_of_bounds": result["out_of_bounds"]},
-            room=f"project_{project_id}",
-        )
+    result = await validation_runner.submit(project_id, furniture_state, room_dimensions, room_structure)
+    await wire.emit("validation_result", result, to=sid)
 
 
 @sio.event
+@decoded
+@throttled()
 async def request_lock(sid, data):
     """Grant edit locks only to authenticated collaborators in the joined room."""
     project_id = data.get("project_id")
@@ -291,32 +699,28 @@ async def request_lock(sid, data):
     if not socket_user:
         return
 
-    if project_id not in locked_objects:
-        locked_objects[project_id] = {}
-
-    current_lock = locked_objects[project_id].get(furniture_id)
-    if current_lock and current_lock.get("sid") != sid:
-        await sio.emit(
+    current_lock = await state_store.acquire_lock(
+        project_id, furniture_id, sid, str(socket_user["id"]), ttl=settings.COLLAB_LOCK_TTL or None
+    )
+    if current_lock:
+        await wire.emit(
             "lock_rejected",
             {"furniture_id": furniture_id, "locked_by": current_lock.get("user_id")},
             to=sid,
         )
         return
 
-    locked_objects[project_id][furniture_id] = {
-        "sid": sid,
-        "user_id": str(socket_user["id"]),
-    }
-
-    await sio.emit(
+    await wire.emit(
         "object_locked",
-        {"furniture_id": furniture_id, "locked_by": str(socket_user["id"])},
+        {"furniture_id": furniture_id, "locked_by": str(socket_user["id"]), "sid": sid},
         room=f"project_{project_id}",
     )
     logger.info(f"Lock granted on {furniture_id} to {sid}")
 
 
 @sio.event
+@decoded
+@throttled()
 async def release_lock(sid, data):
     """Release locks only when the same socket owns them."""
     project_id = data.get("project_id")
@@ -328,16 +732,54 @@ async def release_lock(sid, data):
     if not _socket_joined_project(sid, project_id):
         return
 
-    if project_id in locked_objects and furniture_id in locked_objects[project_id]:
-        if locked_objects[project_id][furniture_id].get("sid") == sid:
-            del locked_objects[project_id][furniture_id]
-            await sio.emit("object_unlocked", {"furniture_id": furniture_id}, room=f"project_{project_id}")
-            logger.info(f"Lock released on {furniture_id} by {sid}")
+    if await state_store.release_lock(project_id, furniture_id, sid):
+        await wire.emit("object_unlocked", {"furniture_id": furniture_id}, room=f"project_{project_id}")
+        logger.info(f"Lock released on {furniture_id} by {sid}")
 
 
 @sio.event
+@decoded
+@throttled()
+async def lock_heartbeat(sid, data):
+    """Renew the lease of a lock held by the socket."""
+    project_id = data.get("project_id")
+    furniture_id = data.get("furniture_id")
+
+    if not all([project_id, furniture_id]) or not settings.COLLAB_LOCK_TTL:
+        return
+    project_id = int(project_id)
+    if not _socket_joined_project(sid, project_id):
+        return
+
+    await state_store.renew_lock(project_id, furniture_id, sid, settings.COLLAB_LOCK_TTL)
+
+
+async def expire_locks() -> None:
+    """Release locks whose lease ended, with one objects_unlocked event per room."""
+    released: Dict[int, list] = {}
+    for project_id, furniture_id in await state_store.expire_locks():
+        released.setdefault(project_id, []).append(furniture_id)
+
+    for project_id, furniture_ids in released.items():
+        await wire.emit("objects_unlocked", {"furniture_ids": furniture_ids}, room=f"project_{project_id}")
+        logger.info(f"Lock leases expired on {furniture_ids} in project {project_id}")
+
+
+async def run_lock_expiry() -> None:
+    """Expire lock leases every tick until cancelled."""
+    while True:
+        await asyncio.sleep(LOCK_EXPIRY_TICK)
+        try:
+            await expire_locks()
+        except Exception:
+            logger.exception("Failed to expire lock leases")
+
+
+@sio.event
+@decoded
+@throttled(coalesce_key=lambda data: data.get("project_id"))
 async def update_presence(sid, data):
-    """Broadcast collaborator cursor positions inside authorized rooms."""
+    """Queue a collaborator cursor for the room's next presence_snapshot."""
     project_id = data.get("project_id")
     cursor_position = data.get("cursor_position")
 
@@ -351,14 +793,5 @@ async def update_presence(sid, data):
     if not socket_user:
         return
 
-    await sio.emit(
-        "presence_updated",
-        {
-            "sid": sid,
-            "userId": str(socket_user["id"]),
-            "cursorPosition": cursor_position,
-            "color": _generate_user_color(socket_user["id"]),
-        },
-        room=f"project_{project_id}",
-        skip_sid=sid,
-    )
+    identity = {"userId": str(socket_user["id"]), "nickname": socket_user["nickname"], "color": socket_user["color"]}
+    await presence_aggregator.update(project_id, sid, identity, cursor_position)
@@ -21,6 +21,31 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8008
 
+    # Batch layout validation (POST /validate/batch)
+    VALIDATION_MAX_BATCH: int = 200
+    VALIDATION_POOL_WORKERS: int = 0  # 0 = one per CPU core
+    VALIDATION_PARALLEL_MIN_BATCH: int = 8  # Smaller batches run inline
+    VALIDATION_CACHE_SIZE: int = 256  # Memoized validation results (0 = off)
+
+    # Real-time collaboration across workers. With a message queue set, Socket.IO
+    # emits are relayed between processes; rooms and locks live in COLLAB_STATE_URL,
+    # which defaults to the message queue when that is a Redis URL.
+    SOCKETIO_MESSAGE_QUEUE: str = ""  # redis://..., rediss://... or amqp://...; empty = single process
+    COLLAB_STATE_URL: str = ""  # redis://... or memory://; empty = see above
+    COLLAB_BROADCAST_HZ: float = 25.0  # furniture_updates frames per second per room; 0 = send every move
+    COLLAB_PRESENCE_HZ: float = 10.0  # presence_snapshot events per second per room; 0 = send every cursor
+    PROJECT_ACCESS_CACHE_TTL: float = 30.0  # Seconds a join_project access decision is reused; 0 = off
+    COLLAB_LOCK_TTL: float = 30.0  # Seconds a furniture lock lives without a move or lock_heartbeat; 0 = no expiry
+    COLLAB_SAVE_INTERVAL: float = 5.0  # Seconds between live room saves to the current layout; 0 = every edit
+    COLLAB_OP_LOG_SIZE: int = 1000  # Recent room edits kept so reconnecting clients get only what they missed
+    # Per-socket event budgets in events per second (0 = unlimited); bursts of COLLAB_RATE_BURST seconds are allowed
+    COLLAB_MOVE_RATE: float = 20.0  # furniture_move; excess moves are coalesced per item
+    COLLAB_PRESENCE_RATE: float = 20.0  # update_presence; excess cursors are coalesced
+    COLLAB_VALIDATE_RATE: float = 2.0  # validate_furniture; excess requests are dropped
+    COLLAB_EDIT_RATE: float = 20.0  # furniture_add/resize/delete and lock events; excess events are dropped
+    COLLAB_RATE_BURST: float = 2.0
+    COLLAB_RATE_LIMIT_NOTICE: bool = True  # Send rate_limited to sockets whose events are dropped or coalesced
+
     # AWS S3 Settings
     AWS_ACCESS_KEY_ID: str = ""
     AWS_SECRET_ACCESS_KEY: str = ""
@@ -37,6 +62,26 @@ class Settings(BaseSettings):
         """Parse ALLOWED_ORIGINS string into list."""
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
 
+    @property
+    def collab_state_url(self) -> str:
+        """Collaboration state store URL, falling back to a Redis message queue."""
+        if self.COLLAB_STATE_URL:
+            return self.COLLAB_STATE_URL
+        if self.SOCKETIO_MESSAGE_QUEUE.startswith(("redis://", "rediss://")):
+            return self.SOCKETIO_MESSAGE_QUEUE
+        return ""
+
+    @property
+    def collab_live_state(self) -> bool:
+        """
+        Whether collaboration rooms keep and save their furniture state in process.
+
+        Room state is per worker, so with a message queue (several workers)
+        every worker would hold a diverging copy and write it back over the
+        others; clients then save the layout themselves.
+        """
+        return not self.SOCKETIO_MESSAGE_QUEUE
+
     @property
     def admin_emails_list(self) -> List[str]:
         """Parse ADMIN_EMAILS string into a normalized list."""
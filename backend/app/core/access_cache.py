@@ -0,0 +1,110 @@
+"""Short-lived cache of project access decisions for the collaboration server."""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from app.config import settings
+
+
+class ProjectAccessCache:
+    """
+    TTL map of (user_id, project_id) to whether the user may open the project.
+
+    Sharing changes and deletes invalidate a project's entries in this
+    process; the TTL bounds how long another worker can act on a stale
+    decision. Missing projects are never cached. Every entry lives for the
+    same TTL, so entries are kept in expiry order and expired ones are
+    evicted from the front on insert.
+    """
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize an empty cache.
+
+        Args:
+            ttl: Seconds a decision is reused (0 disables caching)
+            clock: Time source
+        """
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        # {(user_id, project_id): (allowed, expires_at)}, oldest first
+        self._decisions: "OrderedDict[Tuple[int, int], Tuple[bool, float]]" = OrderedDict()
+        # {project_id: {user_id}} so invalidation touches only the project's entries
+        self._project_users: Dict[int, Set[int]] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._decisions)
+
+    def get(self, user_id: int, project_id: int) -> Optional[bool]:
+        """
+        Look up a decision and count the hit or miss.
+
+        Returns:
+            True or False while the decision is fresh, otherwise None
+        """
+        with self._lock:
+            decision = self._decisions.get((user_id, project_id))
+            if decision is None or decision[1] <= self.clock():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return decision[0]
+
+    def put(self, user_id: int, project_id: int, allowed: bool) -> None:
+        """
+        Remember an access decision for ttl seconds.
+
+        Args:
+            user_id: User ID
+            project_id: Project ID
+            allowed: Whether the user may open the project
+        """
+        if self.ttl <= 0:
+            return
+        now = self.clock()
+        with self._lock:
+            self._decisions.pop((user_id, project_id), None)
+            self._decisions[(user_id, project_id)] = (allowed, now + self.ttl)
+            self._project_users.setdefault(project_id, set()).add(user_id)
+
+            while self._decisions:
+                (old_user_id, old_project_id), (_, expires_at) = next(iter(self._decisions.items()))
+                if expires_at > now:
+                    break
+                del self._decisions[(old_user_id, old_project_id)]
+                users = self._project_users[old_project_id]
+                users.discard(old_user_id)
+                if not users:
+                    del self._project_users[old_project_id]
+
+    def invalidate_project(self, project_id: int) -> None:
+        """Forget every decision about a project, e.g. after its sharing changed."""
+        with self._lock:
+            for user_id in self._project_users.pop(project_id, ()):
+                self._decisions.pop((user_id, project_id), None)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._decisions.clear()
+            self._project_users.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Cache counters for monitoring.
+
+        Returns:
+            Dict with hits, misses, size and ttl
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._decisions), "ttl": self.ttl}
+
+
+project_access_cache = ProjectAccessCache(settings.PROJECT_ACCESS_CACHE_TTL)
@@ -0,0 +1,115 @@
+"""Server-side mount types of catalog furniture."""
+
+import re
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional
+
+# Editor-placed furniture IDs are "<catalog item id>-<timestamp>"
+_PLACED_ID = re.compile(r"^(?P<catalog_id>.+)-\d+$")
+
+
+class CatalogMounts:
+    """
+    Catalog item ID to mount type, loaded once per process.
+
+    Collision checks trust a furniture item's mountType, which comes from the
+    client. Items that can be traced to a catalog item (by catalogId, or by
+    the ID the editor gives placed items) get the catalog's mount type
+    instead, so a client cannot declare a floor item "wall" to skip collisions.
+    Items without a catalog match keep their own mountType. Catalog edits
+    reload the map in this process.
+    """
+
+    def __init__(self, load: Callable[[], Dict[str, str]]):
+        """
+        Initialize an unloaded map.
+
+        Args:
+            load: Function returning {catalog item id: mount type}
+        """
+        self.load = load
+        self._mount_types: Optional[Dict[str, str]] = None
+        self._lock = Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the map is loaded, so resolving needs no database query."""
+        return self._mount_types is not None
+
+    def invalidate(self) -> None:
+        """Reload the map on next use."""
+        with self._lock:
+            self._mount_types = None
+
+    def refresh(self) -> None:
+        """Reload the map now, e.g. after a catalog item changed."""
+        mount_types = self.load()
+        with self._lock:
+            self._mount_types = mount_types
+
+    def mount_types(self) -> Dict[str, str]:
+        """Current {catalog item id: mount type} map, loading it if needed."""
+        with self._lock:
+            if self._mount_types is None:
+                self._mount_types = self.load()
+            return self._mount_types
+
+    def catalog_id(self, furniture: Dict[str, Any]) -> Optional[str]:
+        """Catalog item a furniture dict was placed from, or None."""
+        mount_types = self.mount_types()
+        catalog_id = furniture.get("catalogId")
+        if isinstance(catalog_id, str) and catalog_id in mount_types:
+            return catalog_id
+        furniture_id = furniture.get("id")
+        match = _PLACED_ID.match(furniture_id) if isinstance(furniture_id, str) else None
+        if match and match.group("catalog_id") in mount_types:
+            return match.group("catalog_id")
+        return None
+
+    def resolve(self, furniture: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply the catalog mount type to one furniture dict.
+
+        Returns:
+            The dict itself if it already agrees with the catalog, else a copy with mountType replaced
+        """
+        catalog_id = self.catalog_id(furniture)
+        if catalog_id is None:
+            return furniture
+        mount_type = self.mount_types()[catalog_id]
+        if furniture.get("mountType") == mount_type and "mount_type" not in furniture:
+            return furniture
+        resolved = {key: value for key, value in furniture.items() if key != "mount_type"}
+        resolved["mountType"] = mount_type
+        return resolved
+
+    def resolve_state(self, furniture_state: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Apply catalog mount types to every item of a furniture_state.
+
+        Returns:
+            The state itself if nothing changed, else a shallow copy with resolved items
+        """
+        if not furniture_state or not isinstance(furniture_state.get("furnitures"), list):
+            return furniture_state
+        furnitures: List = furniture_state["furnitures"]
+        resolved = [self.resolve(item) if isinstance(item, dict) else item for item in furnitures]
+        if all(new is old for new, old in zip(resolved, furnitures)):
+            return furniture_state
+        return {**furniture_state, "furnitures": resolved}
+
+
+def _load_mount_types() -> Dict[str, str]:
+    """Read every catalog item's mount type from the database."""
+    from app.database import SessionLocal
+    from app.models.catalog_item import CatalogItem
+
+    db = SessionLocal()
+    try:
+        rows = db.query(CatalogItem.id, CatalogItem.mount_type).all()
+        return {item_id: mount_type or "floor" for item_id, mount_type in rows}
+    finally:
+        db.close()
+
+
+catalog_mounts = CatalogMounts(_load_mount_types)
@@ -0,0 +1,442 @@
+"""
+Shared collaboration state and the Socket.IO client manager.
+
+Room membership and edit locks live behind CollabStateStore so several
+backend workers (or hosts) can serve the same project room. The in-memory
+store keeps the single-process behavior and backs the test suite; the Redis
+store shares state across processes. Per-connection data (the authenticated
+user of a sid and the rooms it joined) stays in the worker that owns the
+socket.
+"""
+
+import json
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import socketio
+
+from app.core.logging import get_logger
+from app.core.timer_wheel import TimerWheel
+
+logger = get_logger("collab_state")
+
+# Redis key prefix for shared collaboration state
+REDIS_KEY_PREFIX = "furniture:collab"
+
+# Channel used by the Socket.IO client manager to fan out emits between workers
+SOCKETIO_CHANNEL = "furniture_socketio"
+
+# Granularity (seconds) of lock lease expiry
+LOCK_EXPIRY_TICK = 1.0
+
+# Most lock leases expired by one Redis expiry pass; the rest go on the next tick
+REDIS_EXPIRY_BATCH = 500
+
+# Lease members ("<project_id>:<furniture_id>") double as socket lock set members.
+
+# Grant the lock when it is free or already held by the same socket; otherwise return the holder.
+# KEYS: room locks hash, socket locks set, lease sorted set.
+# ARGV: furniture_id, lock JSON, sid, lease member, lease deadline ("" = no lease)
+_ACQUIRE_LOCK_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if current then
+    if cjson.decode(current)['sid'] ~= ARGV[3] then
+        return current
+    end
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('SADD', KEYS[2], ARGV[4])
+if ARGV[5] == '' then
+    redis.call('ZREM', KEYS[3], ARGV[4])
+else
+    redis.call('ZADD', KEYS[3], ARGV[5], ARGV[4])
+end
+return false
+"""
+
+# Delete the lock only if the given socket holds it.
+# KEYS: room locks hash, socket locks set, lease sorted set. ARGV: furniture_id, sid, lease member
+_RELEASE_LOCK_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if current and cjson.decode(current)['sid'] == ARGV[2] then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+    redis.call('SREM', KEYS[2], ARGV[3])
+    redis.call('ZREM', KEYS[3], ARGV[3])
+    return 1
+end
+return 0
+"""
+
+# Move the lease deadline only if the given socket holds the lock.
+# KEYS: room locks hash, lease sorted set. ARGV: furniture_id, sid, lease member, lease deadline
+_RENEW_LOCK_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if current and cjson.decode(current)['sid'] == ARGV[2] then
+    redis.call('ZADD', KEYS[2], ARGV[4], ARGV[3])
+    return 1
+end
+return 0
+"""
+
+# Release every lock whose lease ended; returns the released lease members.
+# KEYS: lease sorted set. ARGV: now, key prefix, batch size
+_EXPIRE_LOCKS_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[3]))
+for _, member in ipairs(expired) do
+    local project_id, furniture_id = string.match(member, '^(%d+):(.*)$')
+    local locks_key = ARGV[2] .. ':room:' .. project_id .. ':locks'
+    local current = redis.call('HGET', locks_key, furniture_id)
+    if current then
+        redis.call('HDEL', locks_key, furniture_id)
+        redis.call('SREM', ARGV[2] .. ':sid:' .. cjson.decode(current)['sid'] .. ':locks', member)
+    end
+    redis.call('ZREM', KEYS[1], member)
+end
+return expired
+"""
+
+
+class CollabStateStore(ABC):
+    """Room membership and furniture locks shared by every worker."""
+
+    @abstractmethod
+    async def add_member(self, project_id: int, sid: str, member: dict) -> None:
+        """Add (or replace) a socket in a project room."""
+
+    @abstractmethod
+    async def remove_member(self, project_id: int, sid: str) -> Tuple[bool, int]:
+        """
+        Remove a socket from a project room.
+
+        Returns:
+            Tuple of (whether the socket was a member, members left in the room)
+        """
+
+    @abstractmethod
+    async def get_members(self, project_id: int) -> List[dict]:
+        """Members of a project room in join order."""
+
+    @abstractmethod
+    async def member_projects(self, sid: str) -> List[int]:
+        """Project rooms a socket is a member of."""
+
+    @abstractmethod
+    async def acquire_lock(
+        self, project_id: int, furniture_id: str, sid: str, user_id: str, ttl: Optional[float] = None
+    ) -> Optional[dict]:
+        """
+        Lock a furniture item for a socket.
+
+        A lock with a ttl is a lease: it is released by expire_locks() unless
+        renewed within ttl seconds. Re-acquiring restarts the lease.
+
+        Returns:
+            None when granted (or already held by the socket), otherwise the
+            current lock {"sid", "user_id"}
+        """
+
+    @abstractmethod
+    async def renew_lock(self, project_id: int, furniture_id: str, sid: str, ttl: float) -> bool:
+        """Extend a lease to ttl seconds from now if the socket holds the lock; True if renewed."""
+
+    @abstractmethod
+    async def expire_locks(self) -> List[Tuple[int, str]]:
+        """Release every lock whose lease ended; returns the (project_id, furniture_id) pairs."""
+
+    @abstractmethod
+    async def release_lock(self, project_id: int, furniture_id: str, sid: str) -> bool:
+        """Release a lock if the socket holds it; True if it was released."""
+
+    @abstractmethod
+    async def get_locks(self, project_id: int) -> Dict[str, dict]:
+        """Locks of a project room as {furniture_id: {"sid", "user_id"}}."""
+
+    @abstractmethod
+    async def release_socket_locks(self, sid: str) -> List[Tuple[int, str]]:
+        """Release every lock a socket holds; returns the (project_id, furniture_id) pairs."""
+
+    async def close(self) -> None:
+        """Release connections held by the store."""
+
+
+class InMemoryStateStore(CollabStateStore):
+    """
+    Process-local store; the default for a single worker and for tests.
+
+    Per-socket reverse indexes of joined rooms and held locks keep disconnect
+    cleanup proportional to what the socket owns, not to server load. Lock
+    leases live in a timer wheel, so expiry costs O(expired).
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize an empty store.
+
+        Args:
+            clock: Time source for lock leases
+        """
+        # {project_id: {sid: {user_id, nickname, color, sid}}}
+        self.rooms: Dict[int, Dict[str, dict]] = {}
+        # {project_id: {furniture_id: {sid, user_id}}}
+        self.locks: Dict[int, Dict[str, dict]] = {}
+        # {sid: {project_id}}
+        self._socket_rooms: Dict[str, Set[int]] = {}
+        # {sid: {(project_id, furniture_id)}}
+        self._socket_locks: Dict[str, Set[Tuple[int, str]]] = {}
+        self.clock = clock
+        # (project_id, furniture_id) lock leases
+        self._leases = TimerWheel(tick=LOCK_EXPIRY_TICK, start=clock())
+
+    async def add_member(self, project_id: int, sid: str, member: dict) -> None:
+        self.rooms.setdefault(project_id, {})[sid] = member
+        self._socket_rooms.setdefault(sid, set()).add(project_id)
+
+    async def remove_member(self, project_id: int, sid: str) -> Tuple[bool, int]:
+        members = self.rooms.get(project_id)
+        if members is None or sid not in members:
+            return False, len(members or ())
+        del members[sid]
+        if not members:
+            del self.rooms[project_id]
+        _discard(self._socket_rooms, sid, project_id)
+        return True, len(members)
+
+    async def get_members(self, project_id: int) -> List[dict]:
+        return list(self.rooms.get(project_id, {}).values())
+
+    async def member_projects(self, sid: str) -> List[int]:
+        return sorted(self._socket_rooms.get(sid, ()))
+
+    async def acquire_lock(
+        self, project_id: int, furniture_id: str, sid: str, user_id: str, ttl: Optional[float] = None
+    ) -> Optional[dict]:
+        locks = self.locks.setdefault(project_id, {})
+        current = locks.get(furniture_id)
+        if current and current.get("sid") != sid:
+            return dict(current)
+        locks[furniture_id] = {"sid": sid, "user_id": user_id}
+        self._socket_locks.setdefault(sid, set()).add((project_id, furniture_id))
+        # Re-acquiring restarts the lease, or drops it when there is no ttl
+        self._leases.cancel((project_id, furniture_id))
+        if ttl:
+            self._leases.schedule((project_id, furniture_id), self.clock() + ttl)
+        return None
+
+    async def renew_lock(self, project_id: int, furniture_id: str, sid: str, ttl: float) -> bool:
+        lock = self.locks.get(project_id, {}).get(furniture_id)
+        if lock is None or lock.get("sid") != sid or (project_id, furniture_id) not in self._leases:
+            return False
+        self._leases.schedule((project_id, furniture_id), self.clock() + ttl)
+        return True
+
+    async def expire_locks(self) -> List[Tuple[int, str]]:
+        expired = []
+        for project_id, furniture_id in self._leases.advance(self.clock()):
+            lock = self.locks[project_id][furniture_id]
+            if await self.release_lock(project_id, furniture_id, lock["sid"]):
+                expired.append((project_id, furniture_id))
+        return expired
+
+    async def release_lock(self, project_id: int, furniture_id: str, sid: str) -> bool:
+        locks = self.locks.get(project_id, {})
+        if furniture_id in locks and locks[furniture_id].get("sid") == sid:
+            del locks[furniture_id]
+            if not locks:
+                del self.locks[project_id]
+            _discard(self._socket_locks, sid, (project_id, furniture_id))
+            self._leases.cancel((project_id, furniture_id))
+            return True
+        return False
+
+    async def get_locks(self, project_id: int) -> Dict[str, dict]:
+        return {furniture_id: dict(lock) for furniture_id, lock in self.locks.get(project_id, {}).items()}
+
+    async def release_socket_locks(self, sid: str) -> List[Tuple[int, str]]:
+        released = []
+        for project_id, furniture_id in sorted(self._socket_locks.get(sid, ())):
+            if await self.release_lock(project_id, furniture_id, sid):
+                released.append((project_id, furniture_id))
+        self._socket_locks.pop(sid, None)
+        return released
+
+
+def _discard(index: Dict[str, set], sid: str, entry) -> None:
+    """Remove an entry from a per-socket index, dropping the socket once it is empty."""
+    entries = index.get(sid)
+    if entries is not None:
+        entries.discard(entry)
+        if not entries:
+            del index[sid]
+
+
+class RedisStateStore(CollabStateStore):
+    """
+    Redis-backed store shared by every worker and host.
+
+    Each room keeps a members hash and a locks hash; per-socket sets index the
+    rooms and locks of a sid so disconnect cleanup does not scan every room.
+    Lock grants and releases are single Lua scripts, so two workers cannot
+    both grant the same item. Lock leases are scored by deadline in one
+    sorted set; every worker runs expire_locks(), and the script hands each
+    expired lock to exactly one of them.
+    """
+
+    def __init__(self, url: str):
+        """
+        Connect to Redis.
+
+        Args:
+            url: redis:// or rediss:// URL
+
+        Raises:
+            RuntimeError: If the redis package is not installed
+        """
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as exc:
+            raise RuntimeError('Redis collaboration state requires the redis package ("pip install redis")') from exc
+
+        self.redis = aioredis.Redis.from_url(url, decode_responses=True)
+        self._acquire = self.redis.register_script(_ACQUIRE_LOCK_SCRIPT)
+        self._release = self.redis.register_script(_RELEASE_LOCK_SCRIPT)
+        self._renew = self.redis.register_script(_RENEW_LOCK_SCRIPT)
+        self._expire = self.redis.register_script(_EXPIRE_LOCKS_SCRIPT)
+
+    @staticmethod
+    def _members_key(project_id: int) -> str:
+        return f"{REDIS_KEY_PREFIX}:room:{project_id}:members"
+
+    @staticmethod
+    def _locks_key(project_id: int) -> str:
+        return f"{REDIS_KEY_PREFIX}:room:{project_id}:locks"
+
+    @staticmethod
+    def _leases_key() -> str:
+        return f"{REDIS_KEY_PREFIX}:lock_leases"
+
+    @staticmethod
+    def _socket_rooms_key(sid: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:sid:{sid}:rooms"
+
+    @staticmethod
+    def _socket_locks_key(sid: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:sid:{sid}:locks"
+
+    async def add_member(self, project_id: int, sid: str, member: dict) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._members_key(project_id), sid, json.dumps(member))
+            pipe.sadd(self._socket_rooms_key(sid), project_id)
+            await pipe.execute()
+
+    async def remove_member(self, project_id: int, sid: str) -> Tuple[bool, int]:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hdel(self._members_key(project_id), sid)
+            pipe.srem(self._socket_rooms_key(sid), project_id)
+            pipe.hlen(self._members_key(project_id))
+            removed, _, remaining = await pipe.execute()
+        return bool(removed), remaining
+
+    async def get_members(self, project_id: int) -> List[dict]:
+        members = [json.loads(value) for value in (await self.redis.hgetall(self._members_key(project_id))).values()]
+        # Redis hashes are unordered; keep the response stable
+        return sorted(members, key=lambda member: member["sid"])
+
+    async def member_projects(self, sid: str) -> List[int]:
+        return sorted(int(project_id) for project_id in await self.redis.smembers(self._socket_rooms_key(sid)))
+
+    async def acquire_lock(
+        self, project_id: int, furniture_id: str, sid: str, user_id: str, ttl: Optional[float] = None
+    ) -> Optional[dict]:
+        current = await self._acquire(
+            keys=[self._locks_key(project_id), self._socket_locks_key(sid), self._leases_key()],
+            args=[
+                furniture_id,
+                json.dumps({"sid": sid, "user_id": user_id}),
+                sid,
+                f"{project_id}:{furniture_id}",
+                time.time() + ttl if ttl else "",
+            ],
+        )
+        return json.loads(current) if current else None
+
+    async def renew_lock(self, project_id: int, furniture_id: str, sid: str, ttl: float) -> bool:
+        renewed = await self._renew(
+            keys=[self._locks_key(project_id), self._leases_key()],
+            args=[furniture_id, sid, f"{project_id}:{furniture_id}", time.time() + ttl],
+        )
+        return bool(renewed)
+
+    async def expire_locks(self) -> List[Tuple[int, str]]:
+        expired = await self._expire(
+            keys=[self._leases_key()],
+            args=[time.time(), REDIS_KEY_PREFIX, REDIS_EXPIRY_BATCH],
+        )
+        return [(int(project_id), furniture_id) for project_id, furniture_id in (member.split(":", 1) for member in expired)]
+
+    async def release_lock(self, project_id: int, furniture_id: str, sid: str) -> bool:
+        released = await self._release(
+            keys=[self._locks_key(project_id), self._socket_locks_key(sid), self._leases_key()],
+            args=[furniture_id, sid, f"{project_id}:{furniture_id}"],
+        )
+        return bool(released)
+
+    async def get_locks(self, project_id: int) -> Dict[str, dict]:
+        locks = await self.redis.hgetall(self._locks_key(project_id))
+        return {furniture_id: json.loads(lock) for furniture_id, lock in locks.items()}
+
+    async def release_socket_locks(self, sid: str) -> List[Tuple[int, str]]:
+        released = []
+        for member in await self.redis.smembers(self._socket_locks_key(sid)):
+            project_id, furniture_id = member.split(":", 1)
+            if await self.release_lock(int(project_id), furniture_id, sid):
+                released.append((int(project_id), furniture_id))
+        await self.redis.delete(self._socket_locks_key(sid))
+        return released
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+def create_state_store(url: str) -> CollabStateStore:
+    """
+    Build the collaboration state store for a URL.
+
+    Args:
+        url: Empty or memory:// for the in-process store, redis:// or rediss:// for Redis
+
+    Returns:
+        CollabStateStore
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+    """
+    if not url or url.startswith("memory://"):
+        return InMemoryStateStore()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisStateStore(url)
+    raise ValueError(f"Unsupported collaboration state URL: {url}")
+
+
+def create_client_manager(url: str) -> Optional[socketio.AsyncManager]:
+    """
+    Build the Socket.IO client manager that relays emits between workers.
+
+    Args:
+        url: Empty for a single process, redis:// or rediss:// for Redis pub/sub,
+            amqp:// for RabbitMQ
+
+    Returns:
+        Client manager, or None for python-socketio's in-process default
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+    """
+    if not url:
+        return None
+    if url.startswith(("redis://", "rediss://")):
+        return socketio.AsyncRedisManager(url, channel=SOCKETIO_CHANNEL)
+    if url.startswith("amqp://"):
+        return socketio.AsyncAioPikaManager(url, channel=SOCKETIO_CHANNEL)
+    # python-socketio's Kafka and Kombu managers are synchronous and cannot back an AsyncServer
+    raise ValueError(f"Unsupported Socket.IO message queue URL: {url}")
@@ -1,15 +1,56 @@
 """Collision detection system for furniture placement validation."""
 
-from typing import Any, Dict, List, Tuple
+import json
+import math
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
-from shapely.geometry import box as shapely_box
+import shapely
+from shapely import STRtree
+from shapely.geometry import MultiPolygon, Polygon
+
+from app.core.logging import get_logger
+
+logger = get_logger("collision")
+
+# Items spanning more grid cells than this are tested against every other item
+# instead of being rasterized into the spatial hash (e.g. a huge rug or bad data).
+MAX_CELLS_PER_ITEM = 1024
+
+# Tolerance for float32 storage and trigonometry noise (10 micrometers);
+# touching boxes still collide and flush-to-wall items stay in bounds.
+COLLISION_EPSILON = 1e-5
+
+# Catalog mount types (CatalogItem.mount_type / furniture "mountType")
+MOUNT_FLOOR = 0
+MOUNT_WALL = 1
+MOUNT_SURFACE = 2
+MOUNT_TYPES = {"floor": MOUNT_FLOOR, "wall": MOUNT_WALL, "surface": MOUNT_SURFACE}
+
+# Default free-build tile size (meters), matching the room builder
+DEFAULT_TILE_SIZE = 0.5
+
+# Free-build floors larger than this fall back to the rectangular room check
+MAX_FLOOR_GRID_CELLS = 4_000_000
+
+# Initial search radius (meters) for proximity queries; doubled until enough items are found
+PROXIMITY_SEARCH_RADIUS = 1.0
+
+# Free-space search: occupancy grid cell size (meters), the clearance cap
+# reported for a placement, and the rotations tried by default (degrees)
+FREE_SPACE_RESOLUTION = 0.05
+FREE_SPACE_MAX_CLEARANCE = 1.0
+DEFAULT_PLACEMENT_ROTATIONS = (0.0, 90.0)
+
+# Footprint of an item without a catalog hull, in unit-box coordinates
+_UNIT_SQUARE = np.array([[-0.5, -0.5], [0.5, -0.5], [0.5, 0.5], [-0.5, 0.5]])
 
 
 class BoundingBox:
     """
     Represents a 3D bounding box for furniture collision detection.
-    Simplified to 2D (XZ plane) for collision checking.
+    Simplified to an oriented rectangle on the XZ plane for collision checking.
     """
 
     def __init__(self, position: Dict, dimensions: Dict, rotation: Dict):
@@ -23,28 +64,549 @@ class BoundingBox:
         """
         self.position = np.array([position["x"], position["y"], position["z"]])
         self.dimensions = np.array([dimensions["width"], dimensions["height"], dimensions["depth"]])
-        self.rotation_y = rotation.get("y", 0)  # Only Y-axis rotation considered
+        self.rotation_y = float(rotation.get("y") or 0)  # Only Y-axis rotation considered
 
     def get_2d_box(self) -> Tuple[float, float, float, float]:
         """
-        Get 2D bounding box on XZ plane (simplified AABB).
+        Get the axis-aligned 2D bounds of the rotated footprint on the XZ plane.
 
         Returns:
             Tuple of (x_min, z_min, x_max, z_max)
         """
-        # Simplified: use AABB without rotation for now
-        # For production, implement proper OBB rotation
+        angle = math.radians(self.rotation_y)
+        cos = abs(math.cos(angle))
+        sin = abs(math.sin(angle))
         half_width = self.dimensions[0] / 2
         half_depth = self.dimensions[2] / 2
 
-        x_min = self.position[0] - half_width
-        x_max = self.position[0] + half_width
-        z_min = self.position[2] - half_depth
-        z_max = self.position[2] + half_depth
+        extent_x = half_width * cos + half_depth * sin
+        extent_z = half_width * sin + half_depth * cos
+
+        x_min = self.position[0] - extent_x
+        x_max = self.position[0] + extent_x
+        z_min = self.position[2] - extent_z
+        z_max = self.position[2] + extent_z
 
         return (x_min, z_min, x_max, z_max)
 
 
+def obb_overlaps(
+    centers: np.ndarray,
+    half_extents: np.ndarray,
+    angles: np.ndarray,
+    pairs: np.ndarray,
+) -> np.ndarray:
+    """
+    Batched separating axis test for oriented rectangles on the XZ plane.
+
+    Every pair is tested against the four edge normals of its two rectangles in
+    a single set of array operations. Rotation follows three.js: a box turned by
+    angle a about Y has its width axis along (cos a, -sin a) and its depth axis
+    along (sin a, cos a).
+
+    Args:
+        centers: (n, 2) array of (x, z) centers
+        half_extents: (n, 2) array of (width / 2, depth / 2)
+        angles: (n,) array of Y rotations in radians
+        pairs: (m, 2) array of index pairs to test
+
+    Returns:
+        (m,) boolean array, True where the pair's rectangles intersect
+    """
+    pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+    if len(pairs) == 0:
+        return np.zeros(0, dtype=bool)
+
+    cos = np.cos(angles)
+    sin = np.sin(angles)
+    # (n, 2 axes, 2 components): width axis, depth axis
+    axes = np.stack([np.stack([cos, -sin], axis=-1), np.stack([sin, cos], axis=-1)], axis=1)
+
+    a, b = pairs[:, 0], pairs[:, 1]
+    axes_a, axes_b = axes[a], axes[b]
+    test_axes = np.concatenate([axes_a, axes_b], axis=1)  # (m, 4, 2)
+
+    distance = np.abs(np.einsum("mkd,md->mk", test_axes, centers[b] - centers[a]))
+    radius_a = np.einsum("mkj,mj->mk", np.abs(np.einsum("mkd,mjd->mkj", test_axes, axes_a)), half_extents[a])
+    radius_b = np.einsum("mkj,mj->mk", np.abs(np.einsum("mkd,mjd->mkj", test_axes, axes_b)), half_extents[b])
+
+    separated = distance > radius_a + radius_b + COLLISION_EPSILON
+    return ~separated.any(axis=1)
+
+
+class FloorOccupancy:
+    """
+    Boolean tile bitmap of a free-build floor plus its summed-area table.
+
+    Mirrors the inside-room test in the editor: a world position maps to grid
+    cell floor((world + glbCenter) / tileSize). A footprint is on the floor when
+    every tile its 2D bounds cover is a floor tile, which the summed-area table
+    answers in O(1) per item regardless of how many tiles it covers.
+    """
+
+    __slots__ = ("tile_size", "min_grid_x", "min_grid_z", "offset_x", "offset_z", "grid", "_area")
+
+    def __init__(
+        self,
+        tile_size: float,
+        min_grid_x: int,
+        min_grid_z: int,
+        grid: np.ndarray,
+        offset_x: float,
+        offset_z: float,
+    ):
+        """
+        Initialize occupancy from a tile bitmap.
+
+        Args:
+            tile_size: Tile edge length in meters
+            min_grid_x: Grid X of bitmap column 0
+            min_grid_z: Grid Z of bitmap row 0
+            grid: (rows, cols) boolean array indexed by [gridZ, gridX]
+            offset_x: World-to-grid X offset (the GLB center)
+            offset_z: World-to-grid Z offset (the GLB center)
+        """
+        self.tile_size = tile_size
+        self.min_grid_x = min_grid_x
+        self.min_grid_z = min_grid_z
+        self.grid = grid
+        self.offset_x = offset_x
+        self.offset_z = offset_z
+        area = np.zeros((grid.shape[0] + 1, grid.shape[1] + 1), dtype=np.int64)
+        area[1:, 1:] = grid.cumsum(axis=0).cumsum(axis=1)
+        self._area = area
+
+    @classmethod
+    def from_room_structure(cls, room_structure: Dict) -> Optional["FloorOccupancy"]:
+        """
+        Build occupancy from a project's free-build room_structure.
+
+        Args:
+            room_structure: Dict with floorTiles (or tiles), tileSize, bounds, glbCenter
+
+        Returns:
+            FloorOccupancy, or None if the structure has no usable floor tiles
+        """
+        try:
+            tiles = room_structure.get("floorTiles")
+            if tiles is None:
+                tiles = [tile for tile in room_structure.get("tiles") or [] if tile.get("type", "floor") == "floor"]
+            coords = np.array([(int(tile["gridX"]), int(tile["gridZ"])) for tile in tiles], dtype=np.int64)
+            tile_size = float(room_structure.get("tileSize") or DEFAULT_TILE_SIZE)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            logger.warning("Ignoring malformed free-build room_structure")
+            return None
+
+        if len(coords) == 0 or tile_size <= 0:
+            return None
+
+        min_x, min_z = coords.min(axis=0).tolist()
+        max_x, max_z = coords.max(axis=0).tolist()
+        rows, cols = max_z - min_z + 1, max_x - min_x + 1
+        if rows * cols > MAX_FLOOR_GRID_CELLS:
+            logger.warning(f"Free-build floor of {rows}x{cols} tiles is too large for an occupancy grid")
+            return None
+
+        grid = np.zeros((rows, cols), dtype=bool)
+        grid[coords[:, 1] - min_z, coords[:, 0] - min_x] = True
+
+        center = room_structure.get("glbCenter")
+        try:
+            offset_x, offset_z = float(center["x"]), float(center["z"])
+        except (KeyError, TypeError, ValueError):
+            # Same fallback as the editor: center of the tile bounds
+            offset_x = (min_x + max_x + 1) / 2 * tile_size
+            offset_z = (min_z + max_z + 1) / 2 * tile_size
+
+        return cls(tile_size, min_x, min_z, grid, offset_x, offset_z)
+
+    def contains(self, bounds: np.ndarray) -> np.ndarray:
+        """
+        Check which footprints lie entirely on floor tiles.
+
+        Args:
+            bounds: (n, 4) array of (x_min, z_min, x_max, z_max) world bounds
+
+        Returns:
+            (n,) boolean array, True where every covered tile is floor
+        """
+        bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+        rows, cols = self.grid.shape
+        finite = np.isfinite(bounds).all(axis=1)
+        bounds = np.where(finite[:, None], bounds, 0.0)
+
+        # Shrink by the tolerance so flush edges do not spill into the next tile
+        with np.errstate(invalid="ignore", over="ignore"):
+            gx0 = np.floor((bounds[:, 0] + self.offset_x + COLLISION_EPSILON) / self.tile_size) - self.min_grid_x
+            gz0 = np.floor((bounds[:, 1] + self.offset_z + COLLISION_EPSILON) / self.tile_size) - self.min_grid_z
+            gx1 = np.floor((bounds[:, 2] + self.offset_x - COLLISION_EPSILON) / self.tile_size) - self.min_grid_x
+            gz1 = np.floor((bounds[:, 3] + self.offset_z - COLLISION_EPSILON) / self.tile_size) - self.min_grid_z
+        gx1 = np.maximum(gx1, gx0)
+        gz1 = np.maximum(gz1, gz0)
+
+        inside = finite & (gx0 >= 0) & (gz0 >= 0) & (gx1 < cols) & (gz1 < rows)
+
+        x0 = np.clip(gx0, 0, cols - 1).astype(np.intp)
+        z0 = np.clip(gz0, 0, rows - 1).astype(np.intp)
+        x1 = np.clip(gx1, 0, cols - 1).astype(np.intp) + 1
+        z1 = np.clip(gz1, 0, rows - 1).astype(np.intp) + 1
+
+        area = self._area
+        floor_tiles = area[z1, x1] - area[z0, x1] - area[z1, x0] + area[z0, x0]
+        return inside & (floor_tiles == (x1 - x0) * (z1 - z0))
+
+
+@lru_cache(maxsize=64)
+def _floor_occupancy_for(room_structure_key: str) -> Optional[FloorOccupancy]:
+    """Build (once per distinct room_structure) the free-build floor occupancy."""
+    return FloorOccupancy.from_room_structure(json.loads(room_structure_key))
+
+
+def get_floor_occupancy(room_structure: Optional[Dict]) -> Optional[FloorOccupancy]:
+    """
+    Return the cached floor occupancy for a free-build room_structure.
+
+    Args:
+        room_structure: Project room_structure, or None for template rooms
+
+    Returns:
+        FloorOccupancy, or None when the room has no floor tiles
+    """
+    if not isinstance(room_structure, dict) or not (
+        room_structure.get("floorTiles") or room_structure.get("tiles")
+    ):
+        return None
+
+    key = json.dumps(room_structure, sort_keys=True, separators=(",", ":"), default=str)
+    return _floor_occupancy_for(key)
+
+
+def _parse_geometry(furniture: Dict) -> Tuple[float, float, float, float, float, float, float]:
+    """
+    Read (x, y, z, width, height, depth, rotation_y) from a furniture dict.
+
+    Raises:
+        KeyError, TypeError, ValueError, AttributeError: On malformed geometry
+    """
+    position = furniture["position"]
+    dimensions = furniture["dimensions"]
+    rotation = furniture["rotation"]
+    return (
+        float(position["x"]),
+        float(position["y"]),
+        float(position["z"]),
+        float(dimensions["width"]),
+        float(dimensions["height"]),
+        float(dimensions["depth"]),
+        float(rotation.get("y") or 0),
+    )
+
+
+def _parse_mount(furniture: Dict) -> Tuple[int, Optional[str]]:
+    """Read the mount type code and supporting item ID (surface items) from a furniture dict."""
+    mount_type = furniture.get("mountType") or furniture.get("mount_type") or "floor"
+    mounted_on = furniture.get("mountedOn") or furniture.get("mounted_on")
+    return MOUNT_TYPES.get(mount_type, MOUNT_FLOOR), mounted_on if isinstance(mounted_on, str) else None
+
+
+def _parse_footprint(furniture: Dict) -> Optional[Tuple[np.ndarray, ...]]:
+    """
+    Read the catalog footprint (convex parts in unit-box coordinates) from a furniture dict.
+
+    Missing or malformed footprints return None, so the item keeps its rectangle.
+    """
+    parts = furniture.get("footprint")
+    if not parts or not isinstance(parts, list):
+        return None
+
+    try:
+        arrays = tuple(np.asarray(part, dtype=np.float64).reshape(-1, 2) for part in parts)
+    except (TypeError, ValueError):
+        return None
+    if any(len(part) < 3 or not np.isfinite(part).all() for part in arrays):
+        return None
+    return arrays
+
+
+class FurnitureSet:
+    """
+    Struct-of-arrays view of furniture_state["furnitures"].
+
+    Parsed in a single pass into contiguous float32 columns so that boundary,
+    collision and other geometry queries run as a handful of array operations
+    instead of one Python object per furniture item. Items with missing or
+    malformed geometry are skipped, matching validate_layout.
+
+    Attributes:
+        ids: Furniture IDs in row order
+        index: Mapping of furniture ID to row
+        positions: (n, 3) float32 array of x, y, z
+        dimensions: (n, 3) float32 array of width, height, depth
+        rotations_y: (n,) float32 array of Y rotations in degrees
+        mount_types: (n,) int8 array of MOUNT_* codes
+        mounted_on: Supporting item ID per row (surface items), or None
+        supports: (n,) int array with the row a surface item is mounted on, or -1
+        footprints: Catalog footprint parts per row (unit-box coordinates), or None
+    """
+
+    __slots__ = (
+        "ids",
+        "index",
+        "positions",
+        "dimensions",
+        "rotations_y",
+        "mount_types",
+        "mounted_on",
+        "supports",
+        "footprints",
+    )
+
+    def __init__(
+        self,
+        ids: List[str],
+        positions: np.ndarray,
+        dimensions: np.ndarray,
+        rotations_y: np.ndarray,
+        mount_types: Optional[np.ndarray] = None,
+        mounted_on: Optional[List[Optional[str]]] = None,
+        footprints: Optional[List[Optional[Tuple[np.ndarray, ...]]]] = None,
+    ):
+        self.ids = ids
+        self.index = {furniture_id: row for row, furniture_id in enumerate(ids)}
+        self.positions = np.ascontiguousarray(positions, dtype=np.float32).reshape(-1, 3)
+        self.dimensions = np.ascontiguousarray(dimensions, dtype=np.float32).reshape(-1, 3)
+        self.rotations_y = np.ascontiguousarray(rotations_y, dtype=np.float32).reshape(-1)
+        if mount_types is None:
+            mount_types = [MOUNT_FLOOR] * len(ids)
+        if mounted_on is None:
+            mounted_on = [None] * len(ids)
+        self.mount_types = np.array(mount_types, dtype=np.int8).reshape(-1)
+        self.mounted_on = mounted_on
+        self.supports = np.array(
+            [self.index.get(support, -1) if support else -1 for support in mounted_on], dtype=np.intp
+        ).reshape(-1)
+        self.footprints = footprints if footprints is not None else [None] * len(ids)
+
+    @classmethod
+    def from_state(cls, furniture_state: Dict) -> "FurnitureSet":
+        """
+        Parse a furniture state document.
+
+        Args:
+            furniture_state: Dict containing 'furnitures' list
+
+        Returns:
+            FurnitureSet with one row per valid furniture item
+        """
+        ids = []
+        rows = []
+        mounts = []
+        footprints = []
+        for furniture in furniture_state.get("furnitures", []):
+            try:
+                furniture_id = furniture["id"]
+                row = _parse_geometry(furniture)
+                mount = _parse_mount(furniture)
+            except (KeyError, TypeError, ValueError, AttributeError):
+                # Skip invalid furniture data
+                continue
+
+            ids.append(furniture_id)
+            rows.append(row)
+            mounts.append(mount)
+            footprints.append(_parse_footprint(furniture))
+
+        columns = np.array(rows, dtype=np.float32).reshape(-1, 7)
+        return cls(
+            ids,
+            columns[:, 0:3],
+            columns[:, 3:6],
+            columns[:, 6],
+            [mount_type for mount_type, _ in mounts],
+            [mounted_on for _, mounted_on in mounts],
+            footprints,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def centers(self) -> np.ndarray:
+        """(n, 2) float64 array of (x, z) footprint centers."""
+        return self.positions[:, [0, 2]].astype(np.float64)
+
+    @property
+    def half_extents(self) -> np.ndarray:
+        """(n, 2) float64 array of (width / 2, depth / 2)."""
+        return self.dimensions[:, [0, 2]].astype(np.float64) / 2
+
+    @property
+    def angles(self) -> np.ndarray:
+        """(n,) float64 array of Y rotations in radians."""
+        return np.radians(self.rotations_y.astype(np.float64))
+
+    def bounds(self) -> np.ndarray:
+        """
+        Axis-aligned 2D bounds of every rotated footprint.
+
+        Returns:
+            (n, 4) array of (x_min, z_min, x_max, z_max)
+        """
+        angles = self.angles
+        cos = np.abs(np.cos(angles))
+        sin = np.abs(np.sin(angles))
+        half = self.half_extents
+        extent_x = half[:, 0] * cos + half[:, 1] * sin
+        extent_z = half[:, 0] * sin + half[:, 1] * cos
+        centers = self.centers
+        return np.stack(
+            [
+                centers[:, 0] - extent_x,
+                centers[:, 1] - extent_z,
+                centers[:, 0] + extent_x,
+                centers[:, 1] + extent_z,
+            ],
+            axis=1,
+        )
+
+    def vertical_extents(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vertical (Y) interval of every item, following the editor's conventions.
+
+        Floor items stand on the floor, so they span [0, height] regardless of
+        how their model origin is placed; wall and surface items are centered
+        on position.y.
+
+        Returns:
+            Tuple of (y_min, y_max) float64 arrays
+        """
+        height = self.dimensions[:, 1].astype(np.float64)
+        y = self.positions[:, 1].astype(np.float64)
+        on_floor = self.mount_types == MOUNT_FLOOR
+        y_min = np.where(on_floor, 0.0, y - height / 2)
+        y_max = np.where(on_floor, height, y + height / 2)
+        return y_min, y_max
+
+    def vertical_overlaps(self, pairs: np.ndarray) -> np.ndarray:
+        """
+        Height and stacking filter for candidate pairs.
+
+        Two floor items always share the floor layer. Any other pair must
+        overlap in Y by more than the tolerance, so a lamp resting on a desk or
+        a TV above a sofa is not a collision. A surface item never collides with
+        the item it is mounted on.
+
+        Args:
+            pairs: (m, 2) array of row index pairs
+
+        Returns:
+            (m,) boolean array, True where the pair can collide
+        """
+        pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+        a, b = pairs[:, 0], pairs[:, 1]
+        y_min, y_max = self.vertical_extents()
+
+        both_floor = (self.mount_types[a] == MOUNT_FLOOR) & (self.mount_types[b] == MOUNT_FLOOR)
+        overlap = np.minimum(y_max[a], y_max[b]) - np.maximum(y_min[a], y_min[b]) > COLLISION_EPSILON
+        stacked = (self.supports[a] == b) | (self.supports[b] == a)
+        return (both_floor | overlap) & ~stacked
+
+    def out_of_bounds(self, room_dimensions: Dict, floor: Optional[FloorOccupancy] = None) -> np.ndarray:
+        """
+        Check every footprint against the room.
+
+        Args:
+            room_dimensions: Dict with width, height, depth of room
+            floor: Free-build floor occupancy; replaces the centered rectangle
+
+        Returns:
+            (n,) boolean array, True where the item leaves the room
+        """
+        if floor is not None:
+            return ~floor.contains(self.bounds())
+
+        # Room centered at origin
+        half_room = np.array([room_dimensions["width"] / 2, room_dimensions["depth"] / 2]) + COLLISION_EPSILON
+        bounds = self.bounds()
+        return ((bounds[:, :2] < -half_room) | (bounds[:, 2:] > half_room)).any(axis=1)
+
+    def footprint_shape(self, row: int) -> MultiPolygon:
+        """
+        World-space footprint of one row: its catalog hull parts scaled to the
+        item's width and depth, or its rectangle when it has no footprint.
+
+        Args:
+            row: Row index
+
+        Returns:
+            MultiPolygon on the XZ plane
+        """
+        width, _, depth = self.dimensions[row].astype(np.float64)
+        x, _, z = self.positions[row].astype(np.float64)
+        angle = math.radians(float(self.rotations_y[row]))
+        cos, sin = math.cos(angle), math.sin(angle)
+
+        polygons = []
+        for part in self.footprints[row] or (_UNIT_SQUARE,):
+            u = part[:, 0] * width
+            v = part[:, 1] * depth
+            polygons.append(Polygon(np.column_stack([x + u * cos + v * sin, z - u * sin + v * cos])))
+        return MultiPolygon(polygons)
+
+    def footprint_overlaps(self, pairs: np.ndarray) -> np.ndarray:
+        """
+        Exact-footprint narrow phase for pairs that passed the OBB kernel.
+
+        Only pairs where at least one item carries a catalog footprint are
+        re-tested; rectangle-only pairs keep the OBB result. Footprints closer
+        than the tolerance count as touching, like the OBB kernel.
+
+        Args:
+            pairs: (m, 2) array of row index pairs
+
+        Returns:
+            (m,) boolean array, True where the footprints intersect
+        """
+        pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+        result = np.ones(len(pairs), dtype=bool)
+        has_footprint = np.array([footprint is not None for footprint in self.footprints], dtype=bool)
+        if len(pairs) == 0 or not has_footprint.any():
+            return result
+
+        refine = np.flatnonzero(has_footprint[pairs[:, 0]] | has_footprint[pairs[:, 1]])
+        if len(refine) == 0:
+            return result
+
+        shapes = {row: self.footprint_shape(row) for row in np.unique(pairs[refine]).tolist()}
+        shapes_a = np.array([shapes[row] for row in pairs[refine, 0].tolist()], dtype=object)
+        shapes_b = np.array([shapes[row] for row in pairs[refine, 1].tolist()], dtype=object)
+        result[refine] = shapely.distance(shapes_a, shapes_b) <= COLLISION_EPSILON
+        return result
+
+    def collision_pairs(self) -> np.ndarray:
+        """
+        Find all colliding item pairs (spatial hash broad phase, height and
+        stacking filter, the OBB kernel, then the exact-footprint narrow phase).
+
+        Returns:
+            (m, 2) array of row index pairs, sorted, with i < j
+        """
+        candidate_pairs = np.array(find_candidate_pairs(self.bounds()), dtype=np.intp).reshape(-1, 2)
+        candidate_pairs = candidate_pairs[self.vertical_overlaps(candidate_pairs)]
+        hits = candidate_pairs[obb_overlaps(self.centers, self.half_extents, self.angles, candidate_pairs)]
+        return hits[self.footprint_overlaps(hits)]
+
+
+def _box_arrays(boxes: Sequence[BoundingBox]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Collect centers, half extents and radian angles for the OBB kernel."""
+    centers = np.array([(box.position[0], box.position[2]) for box in boxes], dtype=float).reshape(-1, 2)
+    half_extents = np.array(
+        [(box.dimensions[0] / 2, box.dimensions[2] / 2) for box in boxes], dtype=float
+    ).reshape(-1, 2)
+    angles = np.radians(np.array([box.rotation_y for box in boxes], dtype=float))
+    return centers, half_extents, angles
+
+
 def check_collision(box1: BoundingBox, box2: BoundingBox) -> bool:
     """
     Check if two bounding boxes collide.
@@ -56,13 +618,8 @@ def check_collision(box1: BoundingBox, box2: BoundingBox) -> bool:
     Returns:
         True if boxes intersect, False otherwise
     """
-    bounds1 = box1.get_2d_box()
-    bounds2 = box2.get_2d_box()
-
-    poly1 = shapely_box(*bounds1)
-    poly2 = shapely_box(*bounds2)
-
-    return poly1.intersects(poly2)
+    centers, half_extents, angles = _box_arrays([box1, box2])
+    return bool(obb_overlaps(centers, half_extents, angles, np.array([[0, 1]]))[0])
 
 
 def check_boundary(box: BoundingBox, room_dimensions: Dict) -> bool:
@@ -80,8 +637,8 @@ def check_boundary(box: BoundingBox, room_dimensions: Dict) -> bool:
     x_min, z_min, x_max, z_max = bounds
 
     # Room centered at origin
-    room_half_width = room_dimensions["width"] / 2
-    room_half_depth = room_dimensions["depth"] / 2
+    room_half_width = room_dimensions["width"] / 2 + COLLISION_EPSILON
+    room_half_depth = room_dimensions["depth"] / 2 + COLLISION_EPSILON
 
     # Check if furniture is within room boundaries
     if x_min < -room_half_width or x_max > room_half_width:
@@ -92,13 +649,688 @@ def check_boundary(box: BoundingBox, room_dimensions: Dict) -> bool:
     return True
 
 
-def validate_layout(furniture_state: Dict, room_dimensions: Dict) -> Dict[str, Any]:
+def _grid_cell_size(bounds: np.ndarray) -> float:
+    """Pick a spatial hash cell size from the median footprint extent."""
+    if len(bounds) == 0:
+        return 1.0
+
+    extents = np.maximum(bounds[:, 2] - bounds[:, 0], bounds[:, 3] - bounds[:, 1])
+    cell_size = float(np.median(extents))
+    return cell_size if cell_size > 0 else 1.0
+
+
+def find_candidate_pairs(
+    bounds: Sequence[Tuple[float, float, float, float]] | np.ndarray,
+    cell_size: Optional[float] = None,
+) -> List[Tuple[int, int]]:
+    """
+    Broad phase: find index pairs whose 2D bounds share a uniform grid cell.
+
+    Each footprint is hashed into every cell it covers, so only items that are
+    close to each other are handed to the exact collision test. Cell ranges are
+    inclusive, which keeps touching boxes (shared edge) as candidates.
+
+    Args:
+        bounds: (x_min, z_min, x_max, z_max) footprints, as a list or (n, 4) array
+        cell_size: Grid cell size in meters (defaults to the median extent)
+
+    Returns:
+        Sorted list of (i, j) index pairs with i < j
+    """
+    bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+    if len(bounds) < 2:
+        return []
+
+    finite = np.isfinite(bounds).all(axis=1)
+    if cell_size is None:
+        cell_size = _grid_cell_size(bounds[finite])
+
+    padding = np.array([-COLLISION_EPSILON, -COLLISION_EPSILON, COLLISION_EPSILON, COLLISION_EPSILON])
+    with np.errstate(invalid="ignore"):
+        cells = np.floor((bounds + padding) / cell_size)
+    spans = (cells[:, 2] - cells[:, 0] + 1) * (cells[:, 3] - cells[:, 1] + 1)
+    oversized = finite & (spans > MAX_CELLS_PER_ITEM)
+    hashed = finite & ~oversized
+
+    grid: Dict[Tuple[int, int], List[int]] = {}
+    for index, row in zip(np.flatnonzero(hashed).tolist(), cells[hashed].tolist()):
+        cx_min, cz_min, cx_max, cz_max = (int(value) for value in row)
+        for cx in range(cx_min, cx_max + 1):
+            for cz in range(cz_min, cz_max + 1):
+                grid.setdefault((cx, cz), []).append(index)
+
+    pairs = set()
+    for members in grid.values():
+        # Members are appended in index order, so a < b holds for every pair
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                pairs.add((members[a], members[b]))
+
+    finite_indices = np.flatnonzero(finite).tolist()
+    for index in np.flatnonzero(oversized).tolist():
+        for other in finite_indices:
+            if other != index:
+                pairs.add((min(index, other), max(index, other)))
+
+    return sorted(pairs)
+
+
+class CollisionIndex:
+    """
+    Incrementally maintained collision state for one live layout.
+
+    Items live in a fixed uniform grid. Adding, moving or deleting an item
+    re-tests only that item against the items sharing its grid cells, so a
+    drag update costs O(k) neighbours instead of a full validate_layout pass.
+    result() returns the same structure as validate_layout.
+    """
+
+    def __init__(self, room_dimensions: Dict, cell_size: float = 1.0, room_structure: Optional[Dict] = None):
+        """
+        Initialize an empty index.
+
+        Args:
+            room_dimensions: Dict with width, height, depth of room
+            cell_size: Grid cell size in meters
+            room_structure: Optional free-build room_structure with floor tiles
+        """
+        self.room_dimensions = room_dimensions
+        self.room_structure = room_structure
+        self._floor = get_floor_occupancy(room_structure)
+        self.cell_size = cell_size if cell_size > 0 else 1.0
+        # {furniture_id: (order, geometry row, grid cells or None when oversized,
+        #                 (mount type, mounted on), catalog footprint or None)}
+        self._items: Dict[str, Tuple[int, Tuple[float, ...], Optional[List[Tuple[int, int]]], Tuple[int, Optional[str]], Any]] = {}
+        self._grid: Dict[Tuple[int, int], set] = {}
+        self._oversized: set = set()
+        self._contacts: Dict[str, set] = {}
+        self._out_of_bounds: set = set()
+        self._next_order = 0
+
+    @classmethod
+    def from_state(
+        cls,
+        furniture_state: Dict,
+        room_dimensions: Dict,
+        room_structure: Optional[Dict] = None,
+    ) -> "CollisionIndex":
+        """
+        Seed an index from a full furniture state in one batched pass.
+
+        Args:
+            furniture_state: Dict containing 'furnitures' list
+            room_dimensions: Dict with width, height, depth
+            room_structure: Optional free-build room_structure with floor tiles
+
+        Returns:
+            Populated CollisionIndex
+        """
+        furniture_set = FurnitureSet.from_state(furniture_state)
+        bounds = furniture_set.bounds()
+        finite = np.isfinite(bounds).all(axis=1)
+        index = cls(room_dimensions, cell_size=_grid_cell_size(bounds[finite]), room_structure=room_structure)
+
+        rows = np.concatenate(
+            [furniture_set.positions, furniture_set.dimensions, furniture_set.rotations_y[:, None]], axis=1
+        ).tolist()
+        mounts = list(zip(furniture_set.mount_types.tolist(), furniture_set.mounted_on))
+        items = zip(furniture_set.ids, rows, mounts, furniture_set.footprints)
+        if len(furniture_set.index) != len(furniture_set):
+            # Duplicate IDs: the last occurrence wins, so fall back to per-item updates
+            for furniture_id, row, mount, footprint in items:
+                index._update(furniture_id, tuple(row), mount, footprint)
+            return index
+
+        for furniture_id, row, mount, footprint in items:
+            index._insert(furniture_id, tuple(row), mount, footprint)
+
+        for furniture_id in furniture_set.out_of_bounds(room_dimensions, index._floor).nonzero()[0].tolist():
+            index._out_of_bounds.add(furniture_set.ids[furniture_id])
+        for i, j in furniture_set.collision_pairs().tolist():
+            id1, id2 = furniture_set.ids[i], furniture_set.ids[j]
+            index._contacts.setdefault(id1, set()).add(id2)
+            index._contacts.setdefault(id2, set()).add(id1)
+
+        return index
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, furniture_id: str) -> bool:
+        return furniture_id in self._items
+
+    def add(self, furniture: Dict) -> bool:
+        """
+        Add or replace an item and re-test it against its neighbours.
+
+        Args:
+            furniture: Furniture dict with id, position, dimensions, rotation
+
+        Returns:
+            True if the collision state changed
+        """
+        try:
+            furniture_id = furniture["id"]
+            row = _parse_geometry(furniture)
+            mount = _parse_mount(furniture)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return False
+
+        return self._update(furniture_id, row, mount, _parse_footprint(furniture))
+
+    def move(self, furniture_id: str, position: Dict, rotation: Optional[Dict] = None) -> bool:
+        """
+        Move an existing item and re-test it against its neighbours.
+
+        Args:
+            furniture_id: Furniture ID
+            position: Dict with x, y, z coordinates
+            rotation: Optional dict with x, y, z rotation angles (degrees)
+
+        Returns:
+            True if the collision state changed
+        """
+        item = self._items.get(furniture_id)
+        if item is None:
+            return False
+
+        row, mount, footprint = item[1], item[3], item[4]
+        try:
+            rotation_y = float(rotation.get("y") or 0) if rotation else row[6]
+            new_row = (float(position["x"]), float(position["y"]), float(position["z"]), *row[3:6], rotation_y)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return False
+
+        return self._update(furniture_id, new_row, mount, footprint)
+
+    def remove(self, furniture_id: str) -> bool:
+        """
+        Remove an item from the index.
+
+        Args:
+            furniture_id: Furniture ID
+
+        Returns:
+            True if the collision state changed
+        """
+        if furniture_id not in self._items:
+            return False
+
+        changed = bool(self._contacts.get(furniture_id)) or furniture_id in self._out_of_bounds
+        self._unlink(furniture_id)
+        del self._items[furniture_id]
+        return changed
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Current validation result in validate_layout format.
+
+        Returns:
+            Dict with valid, collisions and out_of_bounds
+        """
+        order = {furniture_id: item[0] for furniture_id, item in self._items.items()}
+        pairs = sorted(
+            (order[id1], order[id2], id1, id2)
+            for id1, others in self._contacts.items()
+            for id2 in others
+            if order[id1] < order[id2]
+        )
+        collisions = [{"id1": id1, "id2": id2} for _, _, id1, id2 in pairs]
+        out_of_bounds = sorted(self._out_of_bounds, key=order.__getitem__)
+
+        return {
+            "valid": not collisions and not out_of_bounds,
+            "collisions": collisions,
+            "out_of_bounds": out_of_bounds,
+        }
+
+    def _update(
+        self,
+        furniture_id: str,
+        row: Tuple[float, ...],
+        mount: Tuple[int, Optional[str]],
+        footprint: Optional[Tuple[np.ndarray, ...]] = None,
+    ) -> bool:
+        """Re-place one item and recompute its contacts and boundary state."""
+        previous_contacts = set(self._contacts.get(furniture_id, ()))
+        previously_out = furniture_id in self._out_of_bounds
+
+        self._unlink(furniture_id)
+        self._insert(furniture_id, row, mount, footprint)
+
+        item_set = FurnitureSet([furniture_id], [row[0:3]], [row[3:6]], [row[6]])
+        if item_set.out_of_bounds(self.room_dimensions, self._floor)[0]:
+            self._out_of_bounds.add(furniture_id)
+
+        neighbours = [other for other in self._neighbours(furniture_id) if other != furniture_id]
+        if neighbours:
+            members = [(furniture_id, row, mount, footprint)] + [
+                (other, self._items[other][1], self._items[other][3], self._items[other][4]) for other in neighbours
+            ]
+            candidates = FurnitureSet(
+                [member[0] for member in members],
+                [member[1][0:3] for member in members],
+                [member[1][3:6] for member in members],
+                [member[1][6] for member in members],
+                [member[2][0] for member in members],
+                [member[2][1] for member in members],
+                [member[3] for member in members],
+            )
+            pairs = np.column_stack([np.zeros(len(neighbours), dtype=np.intp), np.arange(1, len(members))])
+            hits = candidates.vertical_overlaps(pairs)
+            hits[hits] = obb_overlaps(candidates.centers, candidates.half_extents, candidates.angles, pairs[hits])
+            hits[hits] = candidates.footprint_overlaps(pairs[hits])
+            for other, hit in zip(neighbours, hits.tolist()):
+                if hit:
+                    self._contacts.setdefault(furniture_id, set()).add(other)
+                    self._contacts.setdefault(other, set()).add(furniture_id)
+
+        return (
+            previous_contacts != self._contacts.get(furniture_id, set())
+            or previously_out != (furniture_id in self._out_of_bounds)
+        )
+
+    def _insert(
+        self,
+        furniture_id: str,
+        row: Tuple[float, ...],
+        mount: Tuple[int, Optional[str]],
+        footprint: Optional[Tuple[np.ndarray, ...]] = None,
+    ) -> None:
+        """Store an item and hash it into the grid without testing contacts."""
+        previous = self._items.get(furniture_id)
+        order = previous[0] if previous else self._next_order
+        if previous is None:
+            self._next_order += 1
+
+        bounds = FurnitureSet([furniture_id], [row[0:3]], [row[3:6]], [row[6]]).bounds()[0].tolist()
+        cells: Optional[List[Tuple[int, int]]] = []
+        if all(math.isfinite(value) for value in bounds):
+            x_min, z_min, x_max, z_max = bounds
+            cx_min = math.floor((x_min - COLLISION_EPSILON) / self.cell_size)
+            cx_max = math.floor((x_max + COLLISION_EPSILON) / self.cell_size)
+            cz_min = math.floor((z_min - COLLISION_EPSILON) / self.cell_size)
+            cz_max = math.floor((z_max + COLLISION_EPSILON) / self.cell_size)
+
+            if (cx_max - cx_min + 1) * (cz_max - cz_min + 1) > MAX_CELLS_PER_ITEM:
+                cells = None
+                self._oversized.add(furniture_id)
+            else:
+                cells = [(cx, cz) for cx in range(cx_min, cx_max + 1) for cz in range(cz_min, cz_max + 1)]
+                for cell in cells:
+                    self._grid.setdefault(cell, set()).add(furniture_id)
+
+        self._items[furniture_id] = (order, row, cells, mount, footprint)
+
+    def _unlink(self, furniture_id: str) -> None:
+        """Drop an item's grid cells, contacts and boundary flag (keeps its order)."""
+        item = self._items.get(furniture_id)
+        if item is None:
+            return
+
+        cells = item[2]
+        if cells is None:
+            self._oversized.discard(furniture_id)
+        else:
+            for cell in cells:
+                members = self._grid.get(cell)
+                if members is not None:
+                    members.discard(furniture_id)
+                    if not members:
+                        del self._grid[cell]
+
+        for other in self._contacts.pop(furniture_id, set()):
+            others = self._contacts.get(other)
+            if others is not None:
+                others.discard(furniture_id)
+                if not others:
+                    del self._contacts[other]
+
+        self._out_of_bounds.discard(furniture_id)
+
+    def _neighbours(self, furniture_id: str) -> List[str]:
+        """Items sharing a grid cell with the given item, plus oversized items."""
+        cells = self._items[furniture_id][2]
+        if cells is None:
+            # Oversized items are tested against every item with finite geometry
+            return [other for other, item in self._items.items() if item[2] != []]
+        if not cells:
+            return []
+
+        neighbours = set(self._oversized)
+        for cell in cells:
+            neighbours.update(self._grid.get(cell, ()))
+        return list(neighbours)
+
+
+class ProximityIndex:
+    """
+    STRtree over a layout's footprints for clearance and distance queries.
+
+    Distances are measured between 2D footprints on the XZ plane (catalog
+    footprints where present, rectangles otherwise), so two items that touch
+    or overlap are 0 m apart. Items with non-finite geometry are left out.
+    """
+
+    def __init__(self, furniture_set: FurnitureSet):
+        """
+        Build the tree.
+
+        Args:
+            furniture_set: Parsed layout
+        """
+        finite = np.isfinite(furniture_set.bounds()).all(axis=1)
+        self.rows = np.flatnonzero(finite)
+        self.ids = [furniture_set.ids[row] for row in self.rows.tolist()]
+        # Duplicate IDs: the last occurrence wins, like the collision index
+        self.index = {furniture_id: position for position, furniture_id in enumerate(self.ids)}
+        self.shapes = np.array([furniture_set.footprint_shape(row) for row in self.rows.tolist()], dtype=object)
+        self.tree = STRtree(self.shapes)
+
+    @classmethod
+    def from_state(cls, furniture_state: Dict) -> "ProximityIndex":
+        """
+        Build an index from a furniture state document.
+
+        Args:
+            furniture_state: Dict containing 'furnitures' list
+
+        Returns:
+            ProximityIndex over every item with valid geometry
+        """
+        return cls(FurnitureSet.from_state(furniture_state))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, furniture_id: str) -> bool:
+        return furniture_id in self.index
+
+    def within(self, furniture_id: str, distance: float) -> List[Dict[str, Any]]:
+        """
+        Items closer than a distance to one item.
+
+        Args:
+            furniture_id: Furniture ID to measure from
+            distance: Clearance in meters
+
+        Returns:
+            List of {"id", "distance"} dicts, nearest first
+
+        Raises:
+            KeyError: If the item is not in the index
+        """
+        position = self.index[furniture_id]
+        shape = self.shapes[position]
+        others = self.tree.query(shape, predicate="dwithin", distance=distance)
+        others = others[others != position]
+        distances = shapely.distance(shape, self.shapes[others])
+        close = distances < distance
+        return self._ranked(others[close], distances[close])
+
+    def nearest(self, furniture_id: str, k: int) -> List[Dict[str, Any]]:
+        """
+        The k items nearest to one item.
+
+        The search radius starts at PROXIMITY_SEARCH_RADIUS and doubles until
+        the tree returns at least k other items.
+
+        Args:
+            furniture_id: Furniture ID to measure from
+            k: Number of neighbours
+
+        Returns:
+            List of up to k {"id", "distance"} dicts, nearest first
+
+        Raises:
+            KeyError: If the item is not in the index
+        """
+        position = self.index[furniture_id]
+        shape = self.shapes[position]
+        k = min(k, len(self.ids) - 1)
+        if k <= 0:
+            return []
+
+        radius = PROXIMITY_SEARCH_RADIUS
+        while True:
+            others = self.tree.query(shape, predicate="dwithin", distance=radius)
+            others = others[others != position]
+            if len(others) >= k:
+                break
+            radius *= 2
+
+        distances = shapely.distance(shape, self.shapes[others])
+        order = np.argsort(distances, kind="stable")
+        # Items outside the radius are farther than every item inside it
+        return self._ranked(others[order[:k]], distances[order[:k]])
+
+    def min_distance(self) -> Optional[Dict[str, Any]]:
+        """
+        The closest pair of items in the layout.
+
+        Returns:
+            Dict with id1, id2 and distance, or None with fewer than two items
+        """
+        if len(self.ids) < 2:
+            return None
+
+        radius = PROXIMITY_SEARCH_RADIUS
+        while True:
+            first, second = self.tree.query(self.shapes, predicate="dwithin", distance=radius)
+            keep = first < second
+            if keep.any():
+                break
+            radius *= 2
+
+        first, second = first[keep], second[keep]
+        distances = shapely.distance(self.shapes[first], self.shapes[second])
+        best = int(np.lexsort((second, first, distances))[0])
+        return {
+            "id1": self.ids[first[best]],
+            "id2": self.ids[second[best]],
+            "distance": float(distances[best]),
+        }
+
+    def _ranked(self, positions: np.ndarray, distances: np.ndarray) -> List[Dict[str, Any]]:
+        """Format (position, distance) results sorted by distance, then layout order."""
+        order = np.lexsort((positions, distances))
+        return [
+            {"id": self.ids[position], "distance": float(distance)}
+            for position, distance in zip(positions[order].tolist(), distances[order].tolist())
+        ]
+
+
+def _free_space_grid(
+    room_dimensions: Dict,
+    floor: Optional[FloorOccupancy],
+) -> Tuple[float, float, float, np.ndarray]:
+    """
+    Lay out the occupancy grid for a free-space search.
+
+    Template rooms are covered by whole cells inside the centered rectangle;
+    free-build floors split every tile into an integer number of cells.
+
+    Returns:
+        Tuple of (origin_x, origin_z, cell_size, free) where free is a
+        (rows, cols) boolean array of cells inside the room
+    """
+    if floor is not None:
+        tiles = floor.grid.size
+        split = max(1, math.ceil(floor.tile_size / FREE_SPACE_RESOLUTION - COLLISION_EPSILON))
+        split = min(split, max(1, math.isqrt(MAX_FLOOR_GRID_CELLS // tiles)))
+        free = np.repeat(np.repeat(floor.grid, split, axis=0), split, axis=1)
+        origin_x = floor.min_grid_x * floor.tile_size - floor.offset_x
+        origin_z = floor.min_grid_z * floor.tile_size - floor.offset_z
+        return origin_x, origin_z, floor.tile_size / split, free
+
+    width = float(room_dimensions["width"])
+    depth = float(room_dimensions["depth"])
+    cell_size = max(FREE_SPACE_RESOLUTION, math.sqrt(max(width * depth, 0.0) / MAX_FLOOR_GRID_CELLS))
+    cols = max(0, math.floor(width / cell_size + COLLISION_EPSILON))
+    rows = max(0, math.floor(depth / cell_size + COLLISION_EPSILON))
+    return -width / 2, -depth / 2, cell_size, np.ones((rows, cols), dtype=bool)
+
+
+def find_free_placements(
+    furniture_set: FurnitureSet,
+    room_dimensions: Dict,
+    width: float,
+    height: float,
+    depth: float,
+    rotations: Sequence[float] = DEFAULT_PLACEMENT_ROTATIONS,
+    limit: int = 10,
+    floor: Optional[FloorOccupancy] = None,
+    near: Optional[Tuple[float, float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Find collision-free floor positions for a new item.
+
+    The room and every item sharing the new item's height band are rasterized
+    into one occupancy grid. A summed-area table then tests the item's window
+    at every cell in a single array pass, and growing the window measures the
+    clearance of each spot. Rasterization is conservative (a cell is blocked
+    when any part of it is covered), so every result passes validate_layout.
+
+    Args:
+        furniture_set: Current layout
+        room_dimensions: Dict with width, height, depth of room
+        width: Item width in meters
+        height: Item height in meters
+        depth: Item depth in meters
+        rotations: Y rotations to try, in degrees
+        limit: Maximum number of placements
+        floor: Free-build floor occupancy; replaces the centered rectangle
+        near: Optional (x, z) point; placements closest to it rank first
+
+    Returns:
+        List of {"position", "rotation", "clearance"} dicts, nearest to near
+        first, otherwise largest clearance first. Placements are at least
+        about one item width apart.
+    """
+    origin_x, origin_z, cell_size, free = _free_space_grid(room_dimensions, floor)
+    rows, cols = free.shape
+    if rows == 0 or cols == 0 or limit <= 0:
+        return []
+
+    # Obstacles: floor items and anything else reaching into [0, height]
+    blocked = ~free
+    bounds = furniture_set.bounds()
+    y_min, y_max = furniture_set.vertical_extents()
+    reaches = np.minimum(y_max, height) - np.maximum(y_min, 0.0) > COLLISION_EPSILON
+    obstacles = np.isfinite(bounds).all(axis=1) & ((furniture_set.mount_types == MOUNT_FLOOR) | reaches)
+
+    centers, half_extents, angles = furniture_set.centers, furniture_set.half_extents, furniture_set.angles
+    # A cell touches a box when its center is within half a cell diagonal of it
+    dilation = cell_size * math.sqrt(0.5) + COLLISION_EPSILON
+    for row in np.flatnonzero(obstacles).tolist():
+        x_min, z_min, x_max, z_max = bounds[row].tolist()
+        col0 = max(math.floor((x_min - dilation - origin_x) / cell_size), 0)
+        col1 = min(math.ceil((x_max + dilation - origin_x) / cell_size), cols)
+        row0 = max(math.floor((z_min - dilation - origin_z) / cell_size), 0)
+        row1 = min(math.ceil((z_max + dilation - origin_z) / cell_size), rows)
+        if col0 >= col1 or row0 >= row1:
+            continue
+
+        dx = (origin_x + (np.arange(col0, col1) + 0.5) * cell_size - centers[row, 0])[None, :]
+        dz = (origin_z + (np.arange(row0, row1) + 0.5) * cell_size - centers[row, 1])[:, None]
+        cos, sin = math.cos(angles[row]), math.sin(angles[row])
+        # Offsets along the box's width axis (cos, -sin) and depth axis (sin, cos)
+        along_width = np.abs(dx * cos - dz * sin)
+        along_depth = np.abs(dx * sin + dz * cos)
+        blocked[row0:row1, col0:col1] |= (along_width <= half_extents[row, 0] + dilation) & (
+            along_depth <= half_extents[row, 1] + dilation
+        )
+
+    # Window half sizes (in cells around the center cell) per rotation
+    windows = []
+    for rotation in rotations:
+        angle = math.radians(rotation)
+        cos, sin = abs(math.cos(angle)), abs(math.sin(angle))
+        extent_x = width / 2 * cos + depth / 2 * sin
+        extent_z = width / 2 * sin + depth / 2 * cos
+        windows.append(
+            (
+                max(0, math.ceil((extent_x + COLLISION_EPSILON) / cell_size - 0.5)),
+                max(0, math.ceil((extent_z + COLLISION_EPSILON) / cell_size - 0.5)),
+            )
+        )
+
+    # Pad with blocked cells so every window stays inside the table
+    max_margin = math.ceil(FREE_SPACE_MAX_CLEARANCE / cell_size)
+    pad = max(max(window) for window in windows) + max_margin
+    area = np.zeros((rows + 2 * pad + 1, cols + 2 * pad + 1), dtype=np.int64)
+    area[1:, 1:] = np.pad(blocked, pad, constant_values=True).cumsum(axis=0).cumsum(axis=1)
+
+    def window_clear(half_x: int, half_z: int) -> np.ndarray:
+        """(rows, cols) mask of cells whose surrounding window has no blocked cell."""
+        top, bottom = pad - half_z, pad + half_z + 1
+        left, right = pad - half_x, pad + half_x + 1
+        count = (
+            area[bottom : bottom + rows, right : right + cols]
+            - area[top : top + rows, right : right + cols]
+            - area[bottom : bottom + rows, left : left + cols]
+            + area[top : top + rows, left : left + cols]
+        )
+        return count == 0
+
+    xs, zs, rotation_ys, clearances = [], [], [], []
+    for rotation, (half_x, half_z) in zip(rotations, windows):
+        fits = window_clear(half_x, half_z)
+        steps = np.zeros(fits.shape, dtype=np.int64)
+        clear = fits
+        for margin in range(1, max_margin + 1):
+            clear = clear & window_clear(half_x + margin, half_z + margin)
+            if not clear.any():
+                break
+            steps += clear
+
+        grid_rows, grid_cols = np.nonzero(fits)
+        xs.append(origin_x + (grid_cols + 0.5) * cell_size)
+        zs.append(origin_z + (grid_rows + 0.5) * cell_size)
+        rotation_ys.append(np.full(len(grid_rows), float(rotation)))
+        clearances.append(np.minimum(steps[grid_rows, grid_cols] * cell_size, FREE_SPACE_MAX_CLEARANCE))
+
+    xs, zs = np.concatenate(xs), np.concatenate(zs)
+    rotation_ys, clearances = np.concatenate(rotation_ys), np.concatenate(clearances)
+    if len(xs) == 0:
+        return []
+
+    if near is not None:
+        order = np.lexsort((-clearances, np.hypot(xs - near[0], zs - near[1])))
+    else:
+        order = np.lexsort((np.hypot(xs, zs), -clearances))
+
+    # Keep the best-ranked spot per spacing bucket so results are spread out
+    spacing = max(min(width, depth), cell_size)
+    buckets = np.floor(np.column_stack([xs[order], zs[order]]) / spacing)
+    _, first = np.unique(buckets, axis=0, return_index=True)
+    picked = order[np.sort(first)[:limit]]
+
+    return [
+        {
+            "position": {"x": round(x, 6), "y": 0.0, "z": round(z, 6)},
+            "rotation": {"x": 0.0, "y": rotation_y, "z": 0.0},
+            "clearance": round(clearance, 6),
+        }
+        for x, z, rotation_y, clearance in zip(
+            xs[picked].tolist(), zs[picked].tolist(), rotation_ys[picked].tolist(), clearances[picked].tolist()
+        )
+    ]
+
+
+def validate_layout(
+    furniture_state: Dict,
+    room_dimensions: Dict,
+    room_structure: Optional[Dict] = None,
+) -> Dict[str, Any]:
     """
     Validate entire furniture layout for collisions and boundary violations.
 
     Args:
         furniture_state: Dict containing 'furnitures' list
         room_dimensions: Dict with width, height, depth
+        room_structure: Optional free-build room_structure; when it has floor
+            tiles, items must lie on floor tiles instead of inside the rectangle
 
     Returns:
         Dict with validation results:
@@ -106,33 +1338,12 @@ def validate_layout(furniture_state: Dict, room_dimensions: Dict) -> Dict[str, A
         - collisions: List of collision pairs
         - out_of_bounds: List of furniture IDs out of bounds
     """
-    furnitures = furniture_state.get("furnitures", [])
-    collisions = []
-    out_of_bounds = []
-
-    # Create bounding boxes for all furniture
-    boxes = []
-    for furniture in furnitures:
-        try:
-            box = BoundingBox(furniture["position"], furniture["dimensions"], furniture["rotation"])
-            boxes.append((furniture["id"], box))
-        except (KeyError, TypeError) as e:
-            # Skip invalid furniture data
-            continue
-
-    # Check boundary violations
-    for furniture_id, box in boxes:
-        if not check_boundary(box, room_dimensions):
-            out_of_bounds.append(furniture_id)
-
-    # Check collisions (O(n²) - acceptable for small n)
-    for i in range(len(boxes)):
-        for j in range(i + 1, len(boxes)):
-            id1, box1 = boxes[i]
-            id2, box2 = boxes[j]
+    furniture_set = FurnitureSet.from_state(furniture_state)
+    ids = furniture_set.ids
 
-            if check_collision(box1, box2):
-                collisions.append({"id1": id1, "id2": id2})
+    floor = get_floor_occupancy(room_structure)
+    out_of_bounds = [ids[row] for row in np.flatnonzero(furniture_set.out_of_bounds(room_dimensions, floor))]
+    collisions = [{"id1": ids[i], "id2": ids[j]} for i, j in furniture_set.collision_pairs().tolist()]
 
     valid = len(collisions) == 0 and len(out_of_bounds) == 0
 
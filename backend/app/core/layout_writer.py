@@ -0,0 +1,95 @@
+"""Write-behind persistence of live collaboration rooms."""
+
+import asyncio
+import copy
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.core.logging import get_logger
+from app.core.room_state import RoomState
+from app.core.room_ticker import RoomTicker
+
+logger = get_logger("layout_writer")
+
+
+class LayoutWriteBehind(RoomTicker):
+    """
+    Saves each edited room's live state at most once per interval.
+
+    The first edit after a save schedules the next one, so every
+    collaborator's edits in that window become a single write. Rooms are
+    also saved when their last member leaves and on shutdown. Saves run in
+    a worker thread, one at a time per room.
+
+    A save only lands on the layout the room was loaded from. If another
+    layout became current meanwhile (a restore or manual save over REST),
+    the room's unsaved edits are discarded and on_replaced is called so the
+    room can be reloaded.
+    """
+
+    def __init__(
+        self,
+        save: Callable[[int, Optional[int], dict], Optional[int]],
+        interval: float,
+        on_replaced: Optional[Callable[[int], Awaitable[None]]] = None,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            save: Blocking function persisting (project_id, layout_id, furniture_state) and returning
+                the saved layout's ID, or None if layout_id is no longer current
+            interval: Seconds between saves of a room; 0 or less saves every edit at once
+            on_replaced: Coroutine function called with the project ID when a save found its layout replaced
+        """
+        super().__init__(1 / interval if interval > 0 else 0)
+        self.save = save
+        self.on_replaced = on_replaced
+        # {project_id: RoomState} with edits not yet saved
+        self._dirty: Dict[int, RoomState] = {}
+        self._save_locks: Dict[int, asyncio.Lock] = {}
+        self.saves = 0
+
+    async def mark_dirty(self, state: RoomState) -> None:
+        """
+        Schedule a save of a room after an edit.
+
+        Args:
+            state: Edited room state
+        """
+        self._dirty[state.project_id] = state
+        await self.schedule(state.project_id)
+
+    def drop_room(self, project_id: int) -> None:
+        """Forget a room after its final save."""
+        self._dirty.pop(project_id, None)
+        self.cancel(project_id)
+        lock = self._save_locks.get(project_id)
+        if lock is not None and not lock.locked():
+            del self._save_locks[project_id]
+
+    async def _send(self, project_id: int) -> None:
+        lock = self._save_locks.setdefault(project_id, asyncio.Lock())
+        async with lock:
+            state = self._dirty.pop(project_id, None)
+            if state is None or state.version == state.saved_version:
+                return
+
+            version = state.version
+            furniture_state = copy.deepcopy(state.furniture_state())
+            try:
+                layout_id = await asyncio.to_thread(self.save, project_id, state.layout_id, furniture_state)
+            except Exception:
+                # Keep the room dirty; the next edit, leave or shutdown retries
+                self._dirty.setdefault(project_id, state)
+                logger.exception(f"Failed to save live state of project {project_id}")
+                return
+
+            if layout_id is None:
+                logger.info(f"Current layout of project {project_id} was replaced; discarding live edits")
+                if self.on_replaced is not None:
+                    await self.on_replaced(project_id)
+                return
+
+            state.layout_id = layout_id
+            state.saved_version = version
+            self.saves += 1
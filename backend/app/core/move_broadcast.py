@@ -0,0 +1,100 @@
+"""Tick-based coalescing of furniture move broadcasts."""
+
+from typing import Any, Dict, List, Optional
+
+from app.core.room_ticker import RoomTicker
+from app.core.wire import WireEmitter
+
+
+class MoveBroadcaster(RoomTicker):
+    """
+    Collects furniture moves per project room and sends them as frames.
+
+    Only the latest position and rotation of each furniture item is kept
+    between ticks, and each frame goes out as one furniture_updates event.
+    Senders never get their own moves echoed: the frame is emitted to the
+    room skipping every sender, and each sender separately receives the
+    other senders' updates.
+    """
+
+    def __init__(self, wire: WireEmitter, rate_hz: float):
+        """
+        Initialize the broadcaster.
+
+        Args:
+            wire: Emitter used to send frames
+            rate_hz: Frames per second per room; 0 or less sends every move at once
+        """
+        super().__init__(rate_hz)
+        self.wire = wire
+        # {project_id: {furniture_id: update}}, insertion order = first move in the frame
+        self._pending: Dict[int, Dict[str, dict]] = {}
+        self.moves_received = 0
+        self.frames_sent = 0
+
+    async def queue(
+        self,
+        project_id: int,
+        sid: str,
+        furniture_id: str,
+        position: Any,
+        rotation: Any,
+        seq: Optional[int] = None,
+    ) -> None:
+        """
+        Queue a move for the room's next frame.
+
+        Args:
+            project_id: Project ID
+            sid: Socket that sent the move
+            furniture_id: Furniture ID
+            position: Dict with x, y, z
+            rotation: Dict with x, y, z rotation angles, or None
+            seq: Room sequence number of the move, if the room keeps one
+        """
+        self.moves_received += 1
+        pending = self._pending.setdefault(project_id, {})
+        pending[furniture_id] = {
+            "furniture_id": furniture_id,
+            "position": position,
+            "rotation": rotation,
+            "sid": sid,
+            "seq": seq,
+        }
+        await self.schedule(project_id)
+
+    def discard(self, project_id: int, furniture_id: str) -> None:
+        """Drop a queued move, e.g. when the item is deleted before the frame goes out."""
+        self._pending.get(project_id, {}).pop(furniture_id, None)
+
+    def drop_room(self, project_id: int) -> None:
+        """Forget a room's queued moves once nobody is left to receive them."""
+        self._pending.pop(project_id, None)
+        self.cancel(project_id)
+
+    async def _send(self, project_id: int) -> None:
+        pending = self._pending.pop(project_id, None)
+        if not pending:
+            return
+
+        updates = list(pending.values())
+        senders = list(dict.fromkeys(update["sid"] for update in updates))
+        room = f"project_{project_id}"
+        # Every frame carries the latest sequence number it brings its receivers up to
+        seqs = [update["seq"] for update in updates if update["seq"] is not None]
+        extra = {"seq": max(seqs)} if seqs else {}
+        await self.wire.emit("furniture_updates", {"updates": _frame(updates), **extra}, room=room, skip_sid=senders)
+        self.frames_sent += 1
+
+        if len(senders) > 1:
+            for sender in senders:
+                others = [update for update in updates if update["sid"] != sender]
+                await self.wire.emit("furniture_updates", {"updates": _frame(others), **extra}, to=sender)
+
+
+def _frame(updates: List[dict]) -> List[dict]:
+    """Strip the sender from queued updates for the wire."""
+    return [
+        {"furniture_id": update["furniture_id"], "position": update["position"], "rotation": update["rotation"]}
+        for update in updates
+    ]
@@ -0,0 +1,75 @@
+"""Batched presence (collaborator cursor) snapshots."""
+
+from typing import Any, Dict
+
+from app.core.room_ticker import RoomTicker
+from app.core.wire import WireEmitter
+
+
+class PresenceAggregator(RoomTicker):
+    """
+    Collects collaborator cursors per project room into periodic snapshots.
+
+    Each tick sends one presence_snapshot with the cursors that moved since
+    the previous snapshot; a cursor reported at the position it was last
+    sent at is dropped. Traffic therefore grows with room size times tick
+    rate rather than with raw pointer events. Snapshots go to the whole
+    room, so clients ignore their own sid.
+    """
+
+    def __init__(self, wire: WireEmitter, rate_hz: float):
+        """
+        Initialize the aggregator.
+
+        Args:
+            wire: Emitter used to send snapshots
+            rate_hz: Snapshots per second per room; 0 or less sends every change at once
+        """
+        super().__init__(rate_hz)
+        self.wire = wire
+        # {project_id: {sid: cursor}} changed since the last snapshot
+        self._pending: Dict[int, Dict[str, dict]] = {}
+        # {project_id: {sid: cursor position}} as last sent
+        self._sent: Dict[int, Dict[str, Any]] = {}
+        self.updates_received = 0
+        self.snapshots_sent = 0
+
+    async def update(self, project_id: int, sid: str, identity: Dict[str, Any], cursor_position: Any) -> None:
+        """
+        Record a collaborator's cursor for the room's next snapshot.
+
+        Args:
+            project_id: Project ID
+            sid: Socket that moved its cursor
+            identity: Cached per-socket userId, nickname and color
+            cursor_position: Cursor position as sent by the client
+        """
+        self.updates_received += 1
+        if self._sent.get(project_id, {}).get(sid) == cursor_position:
+            self._pending.get(project_id, {}).pop(sid, None)
+            return
+
+        self._pending.setdefault(project_id, {})[sid] = {"sid": sid, **identity, "cursorPosition": cursor_position}
+        await self.schedule(project_id)
+
+    def remove(self, project_id: int, sid: str) -> None:
+        """Forget a socket's cursor when it leaves the room."""
+        self._pending.get(project_id, {}).pop(sid, None)
+        self._sent.get(project_id, {}).pop(sid, None)
+
+    def drop_room(self, project_id: int) -> None:
+        """Forget a room's cursors once nobody is left in it."""
+        self._pending.pop(project_id, None)
+        self._sent.pop(project_id, None)
+        self.cancel(project_id)
+
+    async def _send(self, project_id: int) -> None:
+        pending = self._pending.pop(project_id, None)
+        if not pending:
+            return
+
+        sent = self._sent.setdefault(project_id, {})
+        for sid, cursor in pending.items():
+            sent[sid] = cursor["cursorPosition"]
+        await self.wire.emit("presence_snapshot", {"cursors": list(pending.values())}, room=f"project_{project_id}")
+        self.snapshots_sent += 1
@@ -0,0 +1,181 @@
+"""Per-socket token-bucket rate limiting of Socket.IO events."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Set, Tuple
+
+from app.core.logging import get_logger
+
+logger = get_logger("rate_limit")
+
+# Seconds between rate_limited notices to one socket for one event
+NOTICE_INTERVAL = 1.0
+
+
+class EventRateLimiter:
+    """
+    Token buckets per (sid, event).
+
+    Each limited event has a rate in events per second and a burst size.
+    Events over the limit are either dropped, or, for coalesced events,
+    parked by key so that only the newest event per key is replayed once
+    the bucket has a token again. A flood of drag moves therefore costs the
+    room one move per item per token instead of one per event.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[float, float]], clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the limiter.
+
+        Args:
+            limits: {event: (events per second, burst)}; events not listed, or with a rate of 0, are not limited
+            clock: Time source
+        """
+        self.limits = {event: limit for event, limit in limits.items() if limit[0] > 0}
+        self.clock = clock
+        # {(sid, event): [tokens, last refill]}
+        self._buckets: Dict[Tuple[str, str], list] = {}
+        # {(sid, event): {key: replay}} of coalesced events waiting for a token
+        self._deferred: Dict[Tuple[str, str], Dict[Hashable, Callable[[], Awaitable[Any]]]] = {}
+        self._replays: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._noticed: Dict[Tuple[str, str], float] = {}
+        self._socket_events: Dict[str, Set[str]] = {}
+        self.dropped: Dict[str, int] = {}
+        self.coalesced: Dict[str, int] = {}
+
+    def allow(self, sid: str, event: str) -> bool:
+        """
+        Take a token for an event if one is available.
+
+        Args:
+            sid: Socket ID
+            event: Event name
+
+        Returns:
+            True if the event may be handled now
+        """
+        limit = self.limits.get(event)
+        if limit is None:
+            return True
+        return self._take(sid, event, limit)
+
+    def drop(self, sid: str, event: str) -> bool:
+        """
+        Count a dropped event.
+
+        Returns:
+            True if the socket should be told, at most once per NOTICE_INTERVAL per event
+        """
+        self.dropped[event] = self.dropped.get(event, 0) + 1
+        return self._should_notice(sid, event)
+
+    def defer(self, sid: str, event: str, key: Hashable, replay: Callable[[], Awaitable[Any]]) -> bool:
+        """
+        Park an over-limit event, replacing any parked event with the same key.
+
+        Args:
+            sid: Socket ID
+            event: Event name
+            key: Coalescing key, e.g. the moved furniture item
+            replay: Coroutine function handling the event once a token is available
+
+        Returns:
+            True if the socket should be told, at most once per NOTICE_INTERVAL per event
+        """
+        bucket_key = (sid, event)
+        deferred = self._deferred.setdefault(bucket_key, {})
+        if key in deferred:
+            self.coalesced[event] = self.coalesced.get(event, 0) + 1
+            del deferred[key]
+        deferred[key] = replay
+        self._socket_events.setdefault(sid, set()).add(event)
+        if bucket_key not in self._replays:
+            self._replays[bucket_key] = asyncio.create_task(self._replay(bucket_key))
+        return self._should_notice(sid, event)
+
+    def retry_after(self, sid: str, event: str) -> float:
+        """Seconds until the socket's bucket for an event has a token."""
+        limit = self.limits.get(event)
+        bucket = self._buckets.get((sid, event))
+        if limit is None or bucket is None:
+            return 0.0
+        self._refill(bucket, limit)
+        return max(0.0, (1 - bucket[0]) / limit[0])
+
+    def forget(self, sid: str) -> None:
+        """Drop a disconnected socket's buckets and parked events."""
+        for event in self._socket_events.pop(sid, ()):
+            bucket_key = (sid, event)
+            self._buckets.pop(bucket_key, None)
+            self._deferred.pop(bucket_key, None)
+            self._noticed.pop(bucket_key, None)
+            task = self._replays.pop(bucket_key, None)
+            if task is not None:
+                task.cancel()
+
+    def clear(self) -> None:
+        """Forget every socket and reset the counters."""
+        for sid in list(self._socket_events):
+            self.forget(sid)
+        self.dropped.clear()
+        self.coalesced.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Limiter counters for monitoring.
+
+        Returns:
+            Dict with dropped and coalesced counts per event and the number of sockets with parked events
+        """
+        return {
+            "dropped": dict(self.dropped),
+            "coalesced": dict(self.coalesced),
+            "deferred_sockets": len(self._replays),
+        }
+
+    def _take(self, sid: str, event: str, limit: Tuple[float, float]) -> bool:
+        bucket_key = (sid, event)
+        bucket = self._buckets.get(bucket_key)
+        if bucket is None:
+            bucket = self._buckets[bucket_key] = [limit[1], self.clock()]
+            self._socket_events.setdefault(sid, set()).add(event)
+        self._refill(bucket, limit)
+        if bucket[0] < 1:
+            return False
+        bucket[0] -= 1
+        return True
+
+    def _refill(self, bucket: list, limit: Tuple[float, float]) -> None:
+        now = self.clock()
+        rate, burst = limit
+        bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+
+    def _should_notice(self, sid: str, event: str) -> bool:
+        now = self.clock()
+        last = self._noticed.get((sid, event))
+        if last is not None and now - last < NOTICE_INTERVAL:
+            return False
+        self._noticed[(sid, event)] = now
+        self._socket_events.setdefault(sid, set()).add(event)
+        return True
+
+    async def _replay(self, bucket_key: Tuple[str, str]) -> None:
+        """Handle parked events, oldest key first, as tokens become available."""
+        sid, event = bucket_key
+        try:
+            while self._deferred.get(bucket_key):
+                if not self.allow(sid, event):
+                    await asyncio.sleep(self.retry_after(sid, event))
+                    continue
+                deferred = self._deferred[bucket_key]
+                replay = deferred.pop(next(iter(deferred)))
+                try:
+                    await replay()
+                except Exception:
+                    logger.exception(f"Failed to replay {event} from {sid}")
+        finally:
+            if self._replays.get(bucket_key) is asyncio.current_task():
+                del self._replays[bucket_key]
+            if not self._deferred.get(bucket_key):
+                self._deferred.pop(bucket_key, None)
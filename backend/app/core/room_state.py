@@ -0,0 +1,242 @@
+"""Authoritative live furniture state of collaboration rooms."""
+
+import asyncio
+import copy
+import secrets
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from app.core.collision import CollisionIndex
+
+
+class RoomState:
+    """
+    Live furniture state of one project room.
+
+    Seeded once from the current layout and then kept current by the room's
+    add/move/resize/delete events, so joiners get the state from memory
+    instead of the database. The collision index is maintained alongside it.
+    version counts applied edits and is the room's sequence number;
+    saved_version is the version last written back to the layout.
+
+    The most recent edits are kept as a ring buffer of operations, so a
+    client that reconnects after a short drop can be sent just the edits it
+    missed. epoch identifies this load of the room: sequence numbers restart
+    when the room is reloaded, so they are only comparable within an epoch.
+    """
+
+    def __init__(
+        self,
+        project_id: int,
+        furniture_state: Optional[Dict],
+        room_dimensions: Dict,
+        room_structure: Optional[Dict] = None,
+        layout_id: Optional[int] = None,
+        op_log_size: int = 1000,
+    ):
+        """
+        Seed the room from a saved furniture state.
+
+        Args:
+            project_id: Project ID
+            furniture_state: Dict containing 'furnitures' list, or None for an empty room
+            room_dimensions: Dict with width, height, depth of room
+            room_structure: Optional free-build room_structure with floor tiles
+            layout_id: Layout the state was loaded from
+            op_log_size: Number of recent operations kept for resuming clients
+        """
+        furniture_state = copy.deepcopy(furniture_state or {})
+        self.project_id = project_id
+        self.layout_id = layout_id
+        self.room_dimensions = room_dimensions
+        self.room_structure = room_structure
+        # {furniture_id: furniture}, in layout order
+        self.furnitures: Dict[str, dict] = {
+            item["id"]: item
+            for item in furniture_state.pop("furnitures", None) or []
+            if isinstance(item, dict) and "id" in item
+        }
+        # Other top-level keys of the saved state are carried through unchanged
+        self._extra = furniture_state
+        self.collision = CollisionIndex.from_state(self.furniture_state(), room_dimensions, room_structure)
+        self.version = 0
+        self.saved_version = 0
+        self.epoch = secrets.token_hex(8)
+        # {"seq", "event", "data"} of the latest edits, oldest first
+        self.ops: Deque[Dict[str, Any]] = deque(maxlen=op_log_size)
+
+    def add(self, furniture: Dict) -> bool:
+        """
+        Add or replace a furniture item.
+
+        Args:
+            furniture: Furniture dict with id
+
+        Returns:
+            True if the collision state changed
+        """
+        furniture_id = furniture.get("id")
+        if furniture_id is None:
+            return False
+        self.furnitures[furniture_id] = copy.deepcopy(furniture)
+        self._record("furniture_added", {"furniture": copy.deepcopy(furniture)})
+        return self.collision.add(furniture)
+
+    def move(self, furniture_id: str, position: Dict, rotation: Optional[Dict] = None) -> bool:
+        """
+        Move a furniture item; unknown items are ignored.
+
+        Args:
+            furniture_id: Furniture ID
+            position: Dict with x, y, z
+            rotation: Dict with x, y, z rotation angles, or None to keep the current rotation
+
+        Returns:
+            True if the collision state changed
+        """
+        furniture = self.furnitures.get(furniture_id)
+        if furniture is None:
+            return False
+        furniture["position"] = dict(position)
+        if rotation:
+            furniture["rotation"] = dict(rotation)
+        update = {"furniture_id": furniture_id, "position": dict(position), "rotation": furniture.get("rotation")}
+        self._record("furniture_updates", {"updates": [copy.deepcopy(update)]})
+        return self.collision.move(furniture_id, position, rotation)
+
+    def resize(self, furniture_id: str, dimensions: Dict) -> bool:
+        """
+        Change a furniture item's dimensions; unknown items are ignored.
+
+        Args:
+            furniture_id: Furniture ID
+            dimensions: Dict with width, height, depth
+
+        Returns:
+            True if the collision state changed
+        """
+        furniture = self.furnitures.get(furniture_id)
+        if furniture is None:
+            return False
+        furniture["dimensions"] = dict(dimensions)
+        self._record("furniture_resized", {"furniture_id": furniture_id, "dimensions": dict(dimensions)})
+        return self.collision.add(furniture)
+
+    def remove(self, furniture_id: str) -> bool:
+        """
+        Delete a furniture item; unknown items are ignored.
+
+        Args:
+            furniture_id: Furniture ID
+
+        Returns:
+            True if the collision state changed
+        """
+        if self.furnitures.pop(furniture_id, None) is None:
+            return False
+        self._record("furniture_deleted", {"furniture_id": furniture_id})
+        return self.collision.remove(furniture_id)
+
+    def ops_since(self, seq: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Operations applied after a sequence number, for a resuming client.
+
+        Args:
+            seq: Last sequence number the client has seen in this epoch
+
+        Returns:
+            Operations in order, or None if some have already left the ring
+            buffer or seq is not from this epoch
+        """
+        if seq < 0 or seq > self.version:
+            return None
+        if seq == self.version:
+            return []
+        if not self.ops or self.ops[0]["seq"] > seq + 1:
+            return None
+        return [copy.deepcopy(op) for op in self.ops if op["seq"] > seq]
+
+    def furniture_state(self) -> Dict[str, Any]:
+        """Current state in Layout.furniture_state format (shares the item dicts)."""
+        return {**self._extra, "furnitures": list(self.furnitures.values())}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Copy of the current state for a room_snapshot event.
+
+        Returns:
+            Dict with project_id, epoch, seq, version (same as seq) and furniture_state
+        """
+        return {
+            "project_id": self.project_id,
+            "epoch": self.epoch,
+            "seq": self.version,
+            "version": self.version,
+            "furniture_state": copy.deepcopy(self.furniture_state()),
+        }
+
+    def _record(self, event: str, data: Dict[str, Any]) -> None:
+        """Count an edit and keep it in the operation log."""
+        self.version += 1
+        self.ops.append({"seq": self.version, "event": event, "data": data})
+
+
+class RoomStateRegistry:
+    """
+    Room states of the projects with members on this worker.
+
+    get_or_load() loads a room at most once: joins that arrive while the
+    room is loading wait for the same load instead of starting another.
+    """
+
+    def __init__(self):
+        self._states: Dict[int, RoomState] = {}
+        self._loading: Dict[int, asyncio.Task] = {}
+
+    def __contains__(self, project_id: int) -> bool:
+        return project_id in self._states
+
+    def get(self, project_id: int) -> Optional[RoomState]:
+        """Loaded state of a room, if any."""
+        return self._states.get(project_id)
+
+    async def get_or_load(self, project_id: int, loader: Callable[[], Awaitable[RoomState]]) -> RoomState:
+        """
+        Return the room's state, loading it if this is the first join.
+
+        Args:
+            project_id: Project ID
+            loader: Coroutine function that builds the room state
+
+        Returns:
+            RoomState
+
+        Raises:
+            Exception: Whatever the loader raised; the next join retries
+        """
+        state = self._states.get(project_id)
+        if state is not None:
+            return state
+
+        task = self._loading.get(project_id)
+        if task is None:
+            task = asyncio.create_task(loader())
+            self._loading[project_id] = task
+            task.add_done_callback(lambda _: self._loading.pop(project_id, None))
+
+        state = await asyncio.shield(task)
+        return self._states.setdefault(project_id, state)
+
+    def replace(self, project_id: int, state: RoomState) -> None:
+        """Swap in a reloaded state for a room that is still loaded."""
+        if project_id in self._states:
+            self._states[project_id] = state
+
+    def drop(self, project_id: int) -> None:
+        """Forget a room once nobody is left in it."""
+        self._states.pop(project_id, None)
+
+    def clear(self) -> None:
+        """Forget every room."""
+        self._states.clear()
+        self._loading.clear()
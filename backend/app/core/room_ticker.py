@@ -0,0 +1,72 @@
+"""Per-room frame scheduling for coalesced Socket.IO broadcasts."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Dict
+
+from app.core.logging import get_logger
+
+logger = get_logger("room_ticker")
+
+
+class RoomTicker(ABC):
+    """
+    Base class for broadcasters that send one frame per room per tick.
+
+    A room only has a scheduled flush while it has queued data, so idle
+    rooms cost nothing. Subclasses keep the queued data and implement
+    _send(); schedule() is called whenever something is queued.
+    """
+
+    def __init__(self, rate_hz: float):
+        """
+        Initialize the ticker.
+
+        Args:
+            rate_hz: Frames per second per room; 0 or less sends every update at once
+        """
+        self.interval = 1 / rate_hz if rate_hz > 0 else 0.0
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    async def schedule(self, project_id: int) -> None:
+        """Flush now when ticking is off, otherwise make sure a flush is due within one tick."""
+        if self.interval == 0:
+            await self.flush(project_id)
+        elif project_id not in self._tasks:
+            self._tasks[project_id] = asyncio.create_task(self._flush_later(project_id))
+
+    async def flush(self, project_id: int) -> None:
+        """
+        Send the room's queued frame now.
+
+        Args:
+            project_id: Project ID
+        """
+        task = self._tasks.pop(project_id, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+        await self._send(project_id)
+
+    def cancel(self, project_id: int) -> None:
+        """Stop the room's scheduled flush without sending."""
+        task = self._tasks.pop(project_id, None)
+        if task is not None:
+            task.cancel()
+
+    async def close(self) -> None:
+        """Send every queued frame and stop scheduled flushes."""
+        project_ids = list(self._tasks)
+        for project_id in project_ids:
+            await self.flush(project_id)
+
+    @abstractmethod
+    async def _send(self, project_id: int) -> None:
+        """Emit and clear the room's queued frame, if any."""
+
+    async def _flush_later(self, project_id: int) -> None:
+        """Wait one tick, then flush the room."""
+        try:
+            await asyncio.sleep(self.interval)
+            await self.flush(project_id)
+        except Exception:
+            logger.exception(f"Failed to send frame for project {project_id}")
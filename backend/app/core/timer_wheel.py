@@ -0,0 +1,95 @@
+"""Hashed timing wheel for bulk expiry of leases."""
+
+import math
+from typing import Dict, Hashable, List, Optional, Set
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel keyed by lease.
+
+    Each key sits in the slot of its deadline tick. Renewing a lease only
+    records the later deadline; the key is moved when its old slot comes
+    due. advance() therefore touches the keys that expire plus the ones
+    that were renewed or wrapped around the wheel since, never the whole
+    lease table.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 512, start: float = 0.0):
+        """
+        Initialize an empty wheel.
+
+        Args:
+            tick: Slot width in seconds
+            slots: Number of slots; deadlines further out than one turn are revisited each turn
+            start: Current time in the caller's clock
+        """
+        self.tick = tick
+        self._slots: List[Set[Hashable]] = [set() for _ in range(slots)]
+        # {key: deadline} of live leases and {key: slot} of the entry that is not stale
+        self._deadlines: Dict[Hashable, float] = {}
+        self._slot_of: Dict[Hashable, int] = {}
+        self._current_tick = self._tick_of(start)
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        """
+        Add a lease or move its deadline.
+
+        Args:
+            key: Lease key
+            deadline: Expiry time in the caller's clock
+        """
+        previous = self._deadlines.get(key)
+        self._deadlines[key] = deadline
+        if previous is None or deadline < previous:
+            # Earlier deadlines must be slotted now; later ones are moved lazily
+            self._insert(key, deadline)
+
+    def cancel(self, key: Hashable) -> None:
+        """Remove a lease; its slot entry is skipped when the slot comes due."""
+        self._deadlines.pop(key, None)
+        self._slot_of.pop(key, None)
+
+    def advance(self, now: float) -> List[Hashable]:
+        """
+        Expire every lease whose deadline is at or before now.
+
+        Args:
+            now: Current time in the caller's clock
+
+        Returns:
+            Expired keys, which are removed from the wheel
+        """
+        expired = []
+        target = self._tick_of(now)
+        # A full turn visits every slot; jumping further ahead cannot find more
+        first = max(self._current_tick, target - len(self._slots) + 1)
+        for tick in range(first, target + 1):
+            slot = tick % len(self._slots)
+            entries, self._slots[slot] = self._slots[slot], set()
+            for key in entries:
+                if self._slot_of.get(key) != slot:
+                    continue
+                deadline = self._deadlines[key]
+                if deadline <= now:
+                    self.cancel(key)
+                    expired.append(key)
+                else:
+                    self._insert(key, deadline, min_tick=tick + 1)
+        self._current_tick = target
+        return expired
+
+    def _tick_of(self, moment: float) -> int:
+        return math.floor(moment / self.tick)
+
+    def _insert(self, key: Hashable, deadline: float, min_tick: Optional[int] = None) -> None:
+        tick = max(self._tick_of(deadline), self._current_tick if min_tick is None else min_tick)
+        slot = tick % len(self._slots)
+        self._slots[slot].add(key)
+        self._slot_of[key] = slot
@@ -0,0 +1,157 @@
+"""Content-hash LRU cache of layout validation results."""
+
+import hashlib
+import json
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+from app.core.collision import validate_layout
+
+
+def layout_fingerprint(
+    furniture_state: Dict,
+    room_dimensions: Dict,
+    room_structure: Optional[Dict] = None,
+) -> str:
+    """
+    Canonical hash of everything validate_layout reads.
+
+    Key order and whitespace do not matter, so the same scene sent by the
+    editor, a collaborator or the REST API maps to the same fingerprint.
+
+    Args:
+        furniture_state: Dict containing 'furnitures' list
+        room_dimensions: Dict with width, height, depth
+        room_structure: Optional free-build room_structure
+
+    Returns:
+        Hex digest of the canonical JSON encoding
+    """
+    document = {
+        "furnitures": furniture_state.get("furnitures", []),
+        "room_dimensions": room_dimensions,
+        "room_structure": room_structure,
+    }
+    encoded = json.dumps(document, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+
+
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a validation result so callers cannot mutate the cached entry."""
+    return {
+        "valid": result["valid"],
+        "collisions": [dict(pair) for pair in result["collisions"]],
+        "out_of_bounds": list(result["out_of_bounds"]),
+    }
+
+
+class ValidationCache:
+    """Bounded LRU map of layout fingerprint to validate_layout result, with hit/miss counters."""
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of results kept (0 disables caching)
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a result and count the hit or miss.
+
+        Args:
+            key: Layout fingerprint
+
+        Returns:
+            Copy of the cached result, or None
+        """
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._results.move_to_end(key)
+        return _copy_result(result)
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        Store a result, evicting the least recently used one when full.
+
+        Args:
+            key: Layout fingerprint
+            result: validate_layout result
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._results[key] = _copy_result(result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache counters for monitoring.
+
+        Returns:
+            Dict with hits, misses, hit_rate, size and maxsize
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._results),
+                "maxsize": self.maxsize,
+            }
+
+
+validation_cache = ValidationCache(settings.VALIDATION_CACHE_SIZE)
+
+
+def validate_layout_cached(
+    furniture_state: Dict,
+    room_dimensions: Dict,
+    room_structure: Optional[Dict] = None,
+    validate: Callable[[Dict, Dict, Optional[Dict]], Dict[str, Any]] = validate_layout,
+) -> Dict[str, Any]:
+    """
+    validate_layout behind the shared result cache.
+
+    An unchanged scene costs one canonical hash instead of a collision pass.
+
+    Args:
+        furniture_state: Dict containing 'furnitures' list
+        room_dimensions: Dict with width, height, depth
+        room_structure: Optional free-build room_structure with floor tiles
+        validate: Function run on a cache miss, validate_layout by default
+
+    Returns:
+        Same result as validate_layout
+    """
+    key = layout_fingerprint(furniture_state, room_dimensions, room_structure)
+    result = validation_cache.get(key)
+    if result is None:
+        result = validate(furniture_state, room_dimensions, room_structure)
+        validation_cache.put(key, result)
+    return result
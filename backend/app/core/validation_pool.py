@@ -0,0 +1,168 @@
+"""Process pool for validating many candidate layouts in parallel."""
+
+import asyncio
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.core.collision import validate_layout
+from app.core.logging import get_logger
+from app.core.validation_cache import layout_fingerprint, validate_layout_cached, validation_cache
+
+logger = get_logger("validation_pool")
+
+# Chunks per worker; a few chunks each keeps workers busy when layouts differ in size
+CHUNKS_PER_WORKER = 4
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = Lock()
+
+
+def _worker_count() -> int:
+    """Configured pool size, defaulting to one worker per CPU core."""
+    return settings.VALIDATION_POOL_WORKERS or os.cpu_count() or 1
+
+
+def get_validation_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared validation pool, starting it on first use.
+
+    Workers are spawned rather than forked so they never inherit the
+    server's event loop, sockets or database connections.
+
+    Returns:
+        ProcessPoolExecutor shared by all requests
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = _worker_count()
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            logger.info(f"Validation pool started with {workers} workers")
+        return _executor
+
+
+def shutdown_validation_pool() -> None:
+    """Stop the validation pool if it was started."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+
+
+def _reset_broken_pool(executor: ProcessPoolExecutor) -> None:
+    """Drop a pool whose worker died so the next batch starts a fresh one."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _validate_all(
+    furniture_states: List[Dict[str, Any]],
+    room_dimensions: Dict[str, float],
+    room_structure: Optional[Dict[str, Any]],
+    min_batch: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Run validate_layout on every state, inline or across the pool from min_batch states on."""
+    validate = partial(validate_layout, room_dimensions=room_dimensions, room_structure=room_structure)
+    workers = _worker_count()
+    if min_batch is None:
+        min_batch = max(settings.VALIDATION_PARALLEL_MIN_BATCH, 2)
+    if len(furniture_states) < min_batch or workers < 2:
+        return [validate(furniture_state) for furniture_state in furniture_states]
+
+    executor = get_validation_pool()
+    chunksize = max(1, math.ceil(len(furniture_states) / (workers * CHUNKS_PER_WORKER)))
+    try:
+        return list(executor.map(validate, furniture_states, chunksize=chunksize))
+    except BrokenProcessPool:
+        logger.warning("Validation pool broke; validating batch inline")
+        _reset_broken_pool(executor)
+        return [validate(furniture_state) for furniture_state in furniture_states]
+
+
+def validate_layouts(
+    furniture_states: List[Dict[str, Any]],
+    room_dimensions: Dict[str, float],
+    room_structure: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Validate several candidate layouts of the same room.
+
+    Candidates found in the validation cache are not re-validated, and
+    repeats within the batch are validated once. Batches with fewer misses than
+    VALIDATION_PARALLEL_MIN_BATCH, or any batch when the pool has a single
+    worker, run inline; larger batches are split into chunks across the
+    process pool. A crashed pool falls back to inline validation so the
+    request still succeeds.
+
+    Args:
+        furniture_states: Furniture state dicts, one per candidate
+        room_dimensions: Room dimensions dict with width, height, depth
+        room_structure: Optional free-build room structure with floor tiles
+
+    Returns:
+        validate_layout results in the same order as furniture_states
+    """
+    keys = [
+        layout_fingerprint(furniture_state, room_dimensions, room_structure) for furniture_state in furniture_states
+    ]
+    results: Dict[str, Dict[str, Any]] = {}
+    misses: Dict[str, Dict[str, Any]] = {}
+    for key, furniture_state in zip(keys, furniture_states):
+        if key in results or key in misses:
+            continue
+        cached = validation_cache.get(key)
+        if cached is None:
+            misses[key] = furniture_state
+        else:
+            results[key] = cached
+
+    for key, result in zip(misses, _validate_all(list(misses.values()), room_dimensions, room_structure)):
+        validation_cache.put(key, result)
+        results[key] = result
+
+    return [results[key] for key in keys]
+
+
+def _validate_in_pool(
+    furniture_state: Dict[str, Any],
+    room_dimensions: Dict[str, float],
+    room_structure: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Run one validate_layout in the pool, or inline when the pool has a single worker."""
+    return _validate_all([furniture_state], room_dimensions, room_structure, min_batch=1)[0]
+
+
+async def validate_layout_offloaded(
+    furniture_state: Dict[str, Any],
+    room_dimensions: Dict[str, float],
+    room_structure: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    validate_layout_cached without blocking the event loop.
+
+    Fingerprinting and the cache lookup run in a worker thread; a cache miss
+    is validated in the process pool, or in that thread when the pool has a
+    single worker.
+
+    Args:
+        furniture_state: Dict containing 'furnitures' list
+        room_dimensions: Room dimensions dict with width, height, depth
+        room_structure: Optional free-build room structure with floor tiles
+
+    Returns:
+        Same result as validate_layout
+    """
+    return await asyncio.to_thread(
+        validate_layout_cached, furniture_state, room_dimensions, room_structure, validate=_validate_in_pool
+    )
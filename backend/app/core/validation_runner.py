@@ -0,0 +1,132 @@
+"""Single-flight layout validation for collaboration rooms."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.logging import get_logger
+
+logger = get_logger("validation_runner")
+
+# (furniture_state, room_dimensions, room_structure)
+ValidationArgs = Tuple[Dict, Dict, Optional[Dict]]
+
+
+class ValidationRunner:
+    """
+    Runs validate_furniture requests one at a time per project.
+
+    While a project's validation runs, newer requests wait in a single slot.
+    Each request replaces the one waiting before it, so only the latest
+    state is validated next, and the requester whose state was dropped gets
+    that newer result instead. on_settled is called once per validation that
+    no newer request is waiting behind, and only when its result differs
+    from the project's previous settled result.
+    """
+
+    def __init__(
+        self,
+        validate: Callable[[Dict, Dict, Optional[Dict]], Awaitable[Dict[str, Any]]],
+        on_settled: Callable[[int, Dict[str, Any]], Awaitable[None]],
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            validate: Coroutine function validating (furniture_state, room_dimensions, room_structure)
+            on_settled: Coroutine function called with (project_id, result) for settled results
+        """
+        self.validate = validate
+        self.on_settled = on_settled
+        # {project_id: (args, futures of every request answered by that validation)}
+        self._pending: Dict[int, Tuple[ValidationArgs, List[asyncio.Future]]] = {}
+        self._running: Dict[int, asyncio.Task] = {}
+        self._settled: Dict[int, Dict[str, Any]] = {}
+        self.requests = 0
+        self.superseded = 0
+        self.runs = 0
+
+    async def submit(
+        self,
+        project_id: int,
+        furniture_state: Dict,
+        room_dimensions: Dict,
+        room_structure: Optional[Dict] = None,
+    ) -> Dict[str, Any]:
+        """
+        Queue a validation and wait for its result.
+
+        Args:
+            project_id: Project ID
+            furniture_state: Dict containing 'furnitures' list
+            room_dimensions: Dict with width, height, depth
+            room_structure: Optional free-build room_structure with floor tiles
+
+        Returns:
+            Result of this state, or of a newer state of the project that replaced it
+
+        Raises:
+            Exception: Whatever validate raised
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.requests += 1
+        pending = self._pending.get(project_id)
+        if pending is None:
+            futures = [future]
+        else:
+            self.superseded += 1
+            futures = pending[1] + [future]
+        self._pending[project_id] = ((furniture_state, room_dimensions, room_structure), futures)
+
+        if project_id not in self._running:
+            self._running[project_id] = asyncio.create_task(self._drain(project_id))
+        return await future
+
+    def drop_room(self, project_id: int) -> None:
+        """Forget a room's last settled result once nobody is left in it."""
+        self._settled.pop(project_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Runner counters for monitoring.
+
+        Returns:
+            Dict with requests, superseded, runs and running projects
+        """
+        return {
+            "requests": self.requests,
+            "superseded": self.superseded,
+            "runs": self.runs,
+            "running": len(self._running),
+        }
+
+    async def _drain(self, project_id: int) -> None:
+        """Validate the project's waiting request until none is left."""
+        try:
+            while project_id in self._pending:
+                await self._run(project_id, *self._pending.pop(project_id))
+        finally:
+            # No await since the last check, so no request can be left waiting
+            self._running.pop(project_id, None)
+
+    async def _run(self, project_id: int, args: ValidationArgs, futures: List[asyncio.Future]) -> None:
+        """Validate one state and answer every request it replaced."""
+        try:
+            result = await self.validate(*args)
+        except Exception as exc:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        self.runs += 1
+        for future in futures:
+            if not future.done():
+                future.set_result(result)
+
+        if project_id in self._pending or self._settled.get(project_id) == result:
+            return
+        self._settled[project_id] = result
+        try:
+            await self.on_settled(project_id, result)
+        except Exception:
+            logger.exception(f"Failed to publish validation result for project {project_id}")
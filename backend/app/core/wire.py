@@ -0,0 +1,176 @@
+"""
+Per-connection wire encoding for Socket.IO events.
+
+Clients choose an encoding in the connect auth payload ({"encoding":
+"msgpack"}); anything else gets plain JSON events as before. MessagePack
+clients receive every event as a single binary argument packed with float32
+floats, which is plenty for positions in meters and far smaller than JSON
+text.
+
+Room broadcasts go out once per encoding: JSON sockets join the plain room
+name and MessagePack sockets join a sibling room, so each payload is encoded
+once per broadcast rather than once per recipient.
+"""
+
+import functools
+from typing import Any, Dict, List, Optional, Set
+
+import msgpack
+import socketio
+from socketio.async_pubsub_manager import AsyncPubSubManager
+
+from app.core.logging import get_logger
+
+logger = get_logger("wire")
+
+JSON = "json"
+MSGPACK = "msgpack"
+
+
+def negotiate(auth: Any) -> str:
+    """
+    Pick the wire encoding requested in a connect auth payload.
+
+    Args:
+        auth: Socket.IO auth payload
+
+    Returns:
+        MSGPACK if requested, otherwise JSON
+    """
+    if isinstance(auth, dict) and auth.get("encoding") == MSGPACK:
+        return MSGPACK
+    return JSON
+
+
+def pack(data: Any) -> bytes:
+    """Encode an event payload as MessagePack with float32 floats."""
+    return msgpack.packb(data, use_single_float=True)
+
+
+def unpack(data: Any) -> Any:
+    """
+    Decode an incoming event payload.
+
+    Binary payloads are MessagePack; anything else is already decoded JSON
+    and is returned unchanged.
+
+    Raises:
+        ValueError: If a binary payload is not valid MessagePack
+    """
+    if not isinstance(data, (bytes, bytearray)):
+        return data
+    try:
+        return msgpack.unpackb(data)
+    except (msgpack.UnpackException, ValueError) as exc:
+        raise ValueError("Malformed MessagePack payload") from exc
+
+
+def binary_room(room: str) -> str:
+    """Name of the room holding the MessagePack members of a room."""
+    return f"{room}:{MSGPACK}"
+
+
+def decoded(handler):
+    """
+    Decorate a Socket.IO event handler so it always receives a dict.
+
+    MessagePack payloads are unpacked; malformed or non-dict payloads are
+    dropped with a warning.
+    """
+
+    @functools.wraps(handler)
+    async def wrapper(sid, data=None):
+        try:
+            data = unpack(data)
+        except ValueError:
+            logger.warning(f"Dropping malformed {handler.__name__} payload from {sid}")
+            return None
+        if not isinstance(data, dict):
+            return None
+        return await handler(sid, data)
+
+    return wrapper
+
+
+class WireEmitter:
+    """
+    Emits events in each recipient's negotiated encoding.
+
+    Only sockets owned by this worker are registered. With a message queue
+    the MessagePack room may have members on other workers, so room
+    broadcasts are always sent in both encodings; in a single process the
+    binary broadcast is skipped while the room has no MessagePack members.
+    """
+
+    def __init__(self, sio: socketio.AsyncServer):
+        """
+        Initialize the emitter.
+
+        Args:
+            sio: Socket.IO server
+        """
+        self.sio = sio
+        # {sid: encoding} for sockets that did not choose JSON
+        self.encodings: Dict[str, str] = {}
+        # {room: MessagePack member sids} for local sockets, and the reverse index
+        self._binary_members: Dict[str, Set[str]] = {}
+        self._binary_rooms: Dict[str, Set[str]] = {}
+
+    def register(self, sid: str, encoding: str) -> None:
+        """Remember the encoding a socket negotiated at connect."""
+        if encoding != JSON:
+            self.encodings[sid] = encoding
+
+    def encoding(self, sid: str) -> str:
+        """Encoding negotiated by a socket."""
+        return self.encodings.get(sid, JSON)
+
+    async def enter_room(self, sid: str, room: str) -> None:
+        """Add a socket to the room for its encoding."""
+        if self.encoding(sid) == MSGPACK:
+            await self.sio.enter_room(sid, binary_room(room))
+            self._binary_members.setdefault(room, set()).add(sid)
+            self._binary_rooms.setdefault(sid, set()).add(room)
+        else:
+            await self.sio.enter_room(sid, room)
+
+    def forget(self, sid: str) -> None:
+        """Drop a disconnected socket; Socket.IO removes it from its rooms itself."""
+        if self.encodings.pop(sid, None) is None:
+            return
+        for room in self._binary_rooms.pop(sid, ()):
+            self._binary_members[room].discard(sid)
+            if not self._binary_members[room]:
+                del self._binary_members[room]
+
+    async def emit(
+        self,
+        event: str,
+        data: Any,
+        room: Optional[str] = None,
+        to: Optional[str] = None,
+        skip_sid: Optional[str | List[str]] = None,
+    ) -> None:
+        """
+        Emit an event to one socket or to every member of a room.
+
+        Args:
+            event: Event name
+            data: JSON-serializable payload
+            room: Room to broadcast to
+            to: Single recipient sid
+            skip_sid: Sid or sids to leave out of a room broadcast
+        """
+        if to is not None:
+            payload = pack(data) if self.encoding(to) == MSGPACK else data
+            await self.sio.emit(event, payload, to=to)
+            return
+
+        await self.sio.emit(event, data, room=room, skip_sid=skip_sid)
+        if self._has_binary_members(room):
+            await self.sio.emit(event, pack(data), room=binary_room(room), skip_sid=skip_sid)
+
+    def _has_binary_members(self, room: str) -> bool:
+        if isinstance(self.sio.manager, AsyncPubSubManager):
+            return True
+        return bool(self._binary_members.get(room))
@@ -1,5 +1,6 @@
 """Main FastAPI application with Socket.IO integration."""
 
+import asyncio
 import socketio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
@@ -10,6 +11,9 @@ from app.api.v1.catalog import sync_catalog_from_s3
 from app.config import settings
 from app.core.exceptions import register_exception_handlers
 from app.core.logging import get_logger
+from app.core.access_cache import project_access_cache
+from app.core.validation_cache import validation_cache
+from app.core.validation_pool import shutdown_validation_pool
 from app.database import engine, Base
 
 logger = get_logger("main")
@@ -34,12 +38,21 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("Catalog sync on startup disabled by configuration")
 
+    lock_expiry = asyncio.create_task(websocket.run_lock_expiry()) if settings.COLLAB_LOCK_TTL else None
+
     yield
 
     # Shutdown
     logger.info("Server shutting down...")
     logs.finalize_log_file()
     logger.info("Log file finalized")
+    shutdown_validation_pool()
+    if lock_expiry is not None:
+        lock_expiry.cancel()
+    await websocket.move_broadcaster.close()
+    await websocket.presence_aggregator.close()
+    await websocket.layout_writer.close()
+    await websocket.state_store.close()
 
 
 # Create FastAPI app with lifespan
@@ -96,7 +109,11 @@ async def health_check():
     return {
         "status": "ok" if db_status == "connected" else "degraded",
         "database": db_info,
-        "db_connection": db_status
+        "db_connection": db_status,
+        "validation_cache": validation_cache.stats(),
+        "project_access_cache": project_access_cache.stats(),
+        "validation_runner": websocket.validation_runner.stats(),
+        "rate_limiter": websocket.rate_limiter.stats(),
     }
 
 
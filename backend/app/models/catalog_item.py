@@ -32,6 +32,10 @@ class CatalogItem(Base):
     # Mount type: floor, wall, surface
     mount_type = Column(String, nullable=True, default="floor")
 
+    # 2D footprint as convex parts in unit-box coordinates, computed from the GLB
+    # on catalog sync/upload (see app.utils.glb_utils.compute_footprint)
+    footprint = Column(JSON, nullable=True)
+
     # S3 reference
     glb_key = Column(String, nullable=True)  # S3 key path
 
@@ -56,6 +60,7 @@ class CatalogItem(Base):
             "price": self.price,
             "tags": self.tags or [],
             "mountType": self.mount_type,
+            "footprint": self.footprint,
             "glbKey": self.glb_key,
             "glbUrl": glb_url,
         }
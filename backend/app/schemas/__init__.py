@@ -1,6 +1,15 @@
 """Schemas package for request/response validation."""
 
-from app.schemas.layout import LayoutCreate, LayoutResponse, ValidationResult
+from app.schemas.layout import (
+    BatchValidationResult,
+    LayoutCreate,
+    LayoutResponse,
+    PlacementQuery,
+    PlacementResult,
+    ProximityQuery,
+    ProximityResult,
+    ValidationResult,
+)
 from app.schemas.project import (
     ProjectBase,
     ProjectCreate,
@@ -24,4 +33,9 @@ __all__ = [
     "LayoutCreate",
     "LayoutResponse",
     "ValidationResult",
+    "BatchValidationResult",
+    "ProximityQuery",
+    "ProximityResult",
+    "PlacementQuery",
+    "PlacementResult",
 ]
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class LayoutCreate(BaseModel):
@@ -33,3 +33,78 @@ class ValidationResult(BaseModel):
     valid: bool
     collisions: List[Dict[str, Any]]
     out_of_bounds: List[str]
+
+
+class BatchValidationResult(BaseModel):
+    """Schema for batch validation results, one per candidate layout."""
+
+    results: List[ValidationResult]
+
+
+class ProximityQuery(BaseModel):
+    """Schema for a layout proximity query; any combination of checks can be requested."""
+
+    furniture_id: Optional[str] = None  # Item to measure from (required for k and within)
+    k: Optional[int] = Field(None, ge=1)  # k nearest neighbours of furniture_id
+    within: Optional[float] = Field(None, gt=0)  # Items closer than this many meters to furniture_id
+    min_distance: bool = False  # Closest pair in the whole layout
+
+    @model_validator(mode="after")
+    def require_furniture_id(self) -> "ProximityQuery":
+        """k and within are measured from an item."""
+        if (self.k is not None or self.within is not None) and not self.furniture_id:
+            raise ValueError("furniture_id is required for k and within queries")
+        return self
+
+
+class ProximityNeighbor(BaseModel):
+    """Schema for one item returned by a proximity query."""
+
+    id: str
+    distance: float
+
+
+class ProximityPair(BaseModel):
+    """Schema for the closest pair of items."""
+
+    id1: str
+    id2: str
+    distance: float
+
+
+class ProximityResult(BaseModel):
+    """Schema for proximity query results; only requested checks are filled in."""
+
+    nearest: Optional[List[ProximityNeighbor]] = None
+    within: Optional[List[ProximityNeighbor]] = None
+    min_distance: Optional[ProximityPair] = None
+
+
+class PlacementQuery(BaseModel):
+    """Schema for a free-space search for a catalog item in the current layout."""
+
+    catalog_item_id: str
+    rotations: Optional[List[float]] = Field(None, min_length=1, max_length=8)  # Y rotations in degrees
+    limit: int = Field(10, ge=1, le=100)
+    near: Optional[Dict[str, float]] = None  # {"x", "z"}; rank placements by distance to this point
+
+    @model_validator(mode="after")
+    def require_near_coordinates(self) -> "PlacementQuery":
+        """near needs both floor coordinates."""
+        if self.near is not None and not {"x", "z"} <= self.near.keys():
+            raise ValueError("near must have x and z")
+        return self
+
+
+class Placement(BaseModel):
+    """Schema for one collision-free placement."""
+
+    position: Dict[str, float]
+    rotation: Dict[str, float]
+    clearance: float  # Free margin around the footprint in meters, capped at 1 m
+
+
+class PlacementResult(BaseModel):
+    """Schema for free-space search results, best first."""
+
+    placements: List[Placement]
@@ -1,15 +1,36 @@
 """Layout service for layout management."""
 
+from collections import OrderedDict
+from threading import Lock
 from typing import Any, Dict, List, Optional
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.core.collision import validate_layout
+from app.core.catalog_mounts import catalog_mounts
+from app.core.collision import (
+    DEFAULT_PLACEMENT_ROTATIONS,
+    FurnitureSet,
+    ProximityIndex,
+    find_free_placements,
+    get_floor_occupancy,
+)
+from app.core.validation_cache import layout_fingerprint, validate_layout_cached
+from app.core.validation_pool import validate_layouts
+from app.models.catalog_item import CatalogItem
 from app.models.layout import Layout
 from app.models.project import Project
 from app.models.user import User
 
 
+# Proximity indexes are cached per layout content: live collaboration saves
+# rewrite the current version in place, so the row ID alone is not enough
+PROXIMITY_CACHE_SIZE = 32
+_proximity_indexes: "OrderedDict[tuple, ProximityIndex]" = OrderedDict()
+# Sync endpoints run in the threadpool, so concurrent requests share the LRU
+_proximity_lock = Lock()
+
+
 class LayoutServiceError(Exception):
     """Base exception for layout service errors."""
     pass
@@ -30,6 +51,26 @@ class ProjectAccessDeniedError(LayoutServiceError):
     pass
 
 
+class FurnitureNotFoundError(LayoutServiceError):
+    """Raised when a furniture item is not in the layout."""
+    pass
+
+
+class CatalogItemNotFoundError(LayoutServiceError):
+    """Raised when a catalog item does not exist."""
+    pass
+
+
+class PlacementNotSupportedError(LayoutServiceError):
+    """Raised when free-space search is asked to place a non-floor item."""
+    pass
+
+
+class LayoutReplacedError(LayoutServiceError):
+    """Raised when a live save targets a layout that is no longer current."""
+    pass
+
+
 class LayoutService:
     """Service class for layout-related operations."""
 
@@ -134,6 +175,7 @@ class LayoutService:
             Created layout
         """
         self.verify_project_access(project_id, user)
+        furniture_state = catalog_mounts.resolve_state(furniture_state)
 
         # Set all existing layouts to not current
         self.db.query(Layout).filter(Layout.project_id == project_id).update(
@@ -158,6 +200,58 @@ class LayoutService:
 
         return new_layout
 
+    def save_live_state(
+        self, project_id: int, furniture_state: Dict[str, Any], layout_id: Optional[int] = None
+    ) -> Layout:
+        """
+        Write a collaboration room's live furniture state to the current layout.
+
+        The latest version is updated in place (its tile state is kept), so a
+        live session adds no versions. Older versions are history and are
+        never rewritten: when a restored older version is current, the live
+        state is saved as a new version. A project without layouts gets
+        version 1. Access is not checked here: the collaboration server only
+        saves rooms whose members were checked on join.
+
+        Args:
+            project_id: Project ID
+            furniture_state: Furniture state dict
+            layout_id: Layout the room was loaded from or last saved to, None if the project had none
+
+        Returns:
+            Saved layout
+
+        Raises:
+            LayoutReplacedError: If another layout became current since, e.g. by a restore or manual save
+        """
+        current = (
+            self.db.query(Layout)
+            .filter(Layout.project_id == project_id, Layout.is_current == True)
+            .first()
+        )
+        if (current.id if current else None) != layout_id:
+            raise LayoutReplacedError(f"Layout {layout_id} is no longer current in project {project_id}")
+
+        latest_version = self.db.query(func.max(Layout.version)).filter(Layout.project_id == project_id).scalar() or 0
+        if current is not None and current.version >= latest_version:
+            layout = current
+        else:
+            if current is not None:
+                current.is_current = False
+            layout = Layout(
+                project_id=project_id,
+                version=latest_version + 1,
+                tile_state=current.tile_state if current else None,
+                is_current=True,
+            )
+            self.db.add(layout)
+
+        layout.furniture_state = furniture_state
+        self.db.commit()
+        self.db.refresh(layout)
+
+        return layout
+
     def restore(self, project_id: int, layout_id: int, user: User) -> Layout:
         """
         Restore a previous layout version as current.
@@ -200,16 +294,155 @@ class LayoutService:
     @staticmethod
     def validate(
         furniture_state: Dict[str, Any],
-        room_dimensions: Dict[str, float]
+        room_dimensions: Dict[str, float],
+        room_structure: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Validate furniture layout for collisions and boundary violations.
+        Catalog items are checked with their catalog mount type. Results are
+        memoized by scene content.
 
         Args:
             furniture_state: Furniture state dict with 'furnitures' list
             room_dimensions: Room dimensions dict with width, height, depth
+            room_structure: Optional free-build room structure with floor tiles
 
         Returns:
             Validation result dict
         """
-        return validate_layout(furniture_state, room_dimensions)
+        return validate_layout_cached(catalog_mounts.resolve_state(furniture_state), room_dimensions, room_structure)
+
+    @staticmethod
+    def validate_batch(
+        furniture_states: List[Dict[str, Any]],
+        room_dimensions: Dict[str, float],
+        room_structure: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate several candidate layouts of one room.
+
+        Args:
+            furniture_states: Furniture state dicts, one per candidate
+            room_dimensions: Room dimensions dict with width, height, depth
+            room_structure: Optional free-build room structure with floor tiles
+
+        Returns:
+            Validation result dicts in candidate order
+        """
+        resolved = [catalog_mounts.resolve_state(furniture_state) for furniture_state in furniture_states]
+        return validate_layouts(resolved, room_dimensions, room_structure)
+
+    def proximity(
+        self,
+        project_id: int,
+        user: User,
+        furniture_id: Optional[str] = None,
+        k: Optional[int] = None,
+        within: Optional[float] = None,
+        min_distance: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Run distance and clearance queries against the current layout.
+
+        Args:
+            project_id: Project ID
+            user: Current user
+            furniture_id: Item that k and within are measured from
+            k: Number of nearest neighbours to return
+            within: Return items closer than this many meters
+            min_distance: Return the closest pair in the layout
+
+        Returns:
+            Dict with nearest, within and min_distance (None when not requested)
+
+        Raises:
+            LayoutNotFoundError: If no current layout exists
+            FurnitureNotFoundError: If furniture_id is not in the layout
+        """
+        layout = self.get_current(project_id, user)
+        index = self._proximity_index(layout)
+
+        if furniture_id is not None and (k is not None or within is not None) and furniture_id not in index:
+            raise FurnitureNotFoundError(f"Furniture {furniture_id} not found in layout {layout.id}")
+
+        return {
+            "nearest": index.nearest(furniture_id, k) if k is not None else None,
+            "within": index.within(furniture_id, within) if within is not None else None,
+            "min_distance": index.min_distance() if min_distance else None,
+        }
+
+    def find_placements(
+        self,
+        project_id: int,
+        user: User,
+        catalog_item_id: str,
+        rotations: Optional[List[float]] = None,
+        limit: int = 10,
+        near: Optional[Dict[str, float]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find collision-free positions for a catalog item in the current layout.
+
+        Projects without a saved layout are searched as an empty room.
+
+        Args:
+            project_id: Project ID
+            user: Current user
+            catalog_item_id: Catalog item to place
+            rotations: Y rotations to try, in degrees
+            limit: Maximum number of placements
+            near: Optional {"x", "z"} point; placements closest to it rank first
+
+        Returns:
+            Placement dicts with position, rotation and clearance, best first
+
+        Raises:
+            CatalogItemNotFoundError: If the catalog item doesn't exist
+            PlacementNotSupportedError: If the item is not a floor item
+        """
+        project = self.verify_project_access(project_id, user)
+
+        item = self.db.query(CatalogItem).filter(CatalogItem.id == catalog_item_id).first()
+        if not item:
+            raise CatalogItemNotFoundError(f"Catalog item {catalog_item_id} not found")
+        if (item.mount_type or "floor") != "floor":
+            raise PlacementNotSupportedError(f"Catalog item {catalog_item_id} is not a floor item")
+
+        layout = (
+            self.db.query(Layout)
+            .filter(Layout.project_id == project_id, Layout.is_current == True)
+            .first()
+        )
+        furniture_state = catalog_mounts.resolve_state(layout.furniture_state if layout else None)
+        furniture_set = FurnitureSet.from_state(furniture_state or {})
+        room_dimensions = {"width": project.room_width, "height": project.room_height, "depth": project.room_depth}
+
+        return find_free_placements(
+            furniture_set,
+            room_dimensions,
+            item.width,
+            item.height,
+            item.depth,
+            rotations=rotations or DEFAULT_PLACEMENT_ROTATIONS,
+            limit=limit,
+            floor=get_floor_occupancy(project.room_structure),
+            near=(near["x"], near["z"]) if near else None,
+        )
+
+    @staticmethod
+    def _proximity_index(layout: Layout) -> ProximityIndex:
+        """Get or build the proximity index for a layout's current furniture state."""
+        key = (layout.id, layout_fingerprint(layout.furniture_state or {}, {}))
+        with _proximity_lock:
+            index = _proximity_indexes.get(key)
+            if index is not None:
+                _proximity_indexes.move_to_end(key)
+                return index
+
+        index = ProximityIndex.from_state(layout.furniture_state or {})
+        with _proximity_lock:
+            _proximity_indexes[key] = index
+            _proximity_indexes.move_to_end(key)
+            while len(_proximity_indexes) > PROXIMITY_CACHE_SIZE:
+                _proximity_indexes.popitem(last=False)
+        return index
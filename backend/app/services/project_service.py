@@ -6,6 +6,7 @@ from typing import List, Optional, Dict, Any
 
 from sqlalchemy.orm import Session
 
+from app.core.access_cache import project_access_cache
 from app.core.logging import get_logger
 from app.models.layout import Layout
 from app.models.project import Project
@@ -203,6 +204,7 @@ class ProjectService:
         project.is_shared = share
         self.db.commit()
         self.db.refresh(project)
+        project_access_cache.invalidate_project(project.id)
 
         return project
 
@@ -239,6 +241,7 @@ class ProjectService:
         project_id = project.id
         self.db.delete(project)
         self.db.commit()
+        project_access_cache.invalidate_project(project_id)
 
         # Summary log
         if files_deleted:
@@ -6,11 +6,21 @@ from pathlib import Path
 import struct
 import json
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import numpy as np
+from shapely.geometry import MultiPoint, box
 
 logger = logging.getLogger(__name__)
 
+# Footprints are split into at most this many convex parts along their long axis
+MAX_FOOTPRINT_PARTS = 4
+
+# Parts are kept only if they cover noticeably less area than the single hull
+FOOTPRINT_PARTS_AREA_RATIO = 0.9
+
+# Simplification tolerance in unit-box coordinates (0.5% of the item's extent)
+FOOTPRINT_TOLERANCE = 0.005
+
 
 def extract_glb_dimensions(file_path: Path) -> Dict[str, float]:
     """
@@ -76,6 +86,107 @@ def extract_glb_dimensions(file_path: Path) -> Dict[str, float]:
         }
 
 
+def extract_glb_footprint(file_path: Path) -> Optional[List[List[List[float]]]]:
+    """
+    Compute the simplified 2D footprint of a GLB model on the XZ plane.
+
+    Meant to run once per GLB (catalog sync or upload), never per request.
+
+    Args:
+        file_path: Path to the GLB file
+
+    Returns:
+        Convex parts in unit-box coordinates (see compute_footprint), or None
+        if the model could not be loaded
+    """
+    try:
+        import trimesh
+        mesh = trimesh.load(str(file_path), force='mesh')
+        return compute_footprint(np.asarray(mesh.vertices), np.asarray(mesh.faces))
+    except ImportError:
+        logger.warning("trimesh not installed, skipping footprint calculation")
+    except Exception as e:
+        logger.warning(f"Failed to compute GLB footprint: {e}")
+    return None
+
+
+def compute_footprint(vertices: np.ndarray, faces: np.ndarray) -> Optional[List[List[List[float]]]]:
+    """
+    Project a mesh onto the XZ plane and reduce it to a few convex parts.
+
+    Coordinates are normalized to the model's XZ bounding box: the box center
+    is (0, 0) and its width and depth map to 1, matching how the editor centers
+    GLB models. Collision code scales the parts by the item's dimensions, so
+    the footprint stays valid if an admin edits width or depth later.
+
+    A single convex hull is used unless splitting the projected mesh into
+    strips along its long axis hugs the shape clearly better (L-shaped sofas,
+    desks with a return). Each strip's part is the hull of the vertices inside
+    it plus the points where mesh edges cross its borders, which is exactly the
+    hull of the clipped triangles without a polygon union. Parts are
+    simplified conservatively: they may grow by the tolerance but never shrink.
+
+    Args:
+        vertices: (n, 3) array of mesh vertices
+        faces: (m, 3) array of triangle vertex indices
+
+    Returns:
+        List of convex parts, each a list of [x, z] points, or None for
+        degenerate meshes
+    """
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+    if len(vertices) < 3:
+        return None
+
+    xz = vertices[:, [0, 2]]
+    lower, upper = xz.min(axis=0), xz.max(axis=0)
+    size = upper - lower
+    if not np.isfinite(size).all() or (size <= 0).any():
+        return None
+    points = (xz - (lower + upper) / 2) / size
+
+    hull = MultiPoint(points).convex_hull
+    parts = [hull]
+
+    faces = np.asarray(faces, dtype=np.intp).reshape(-1, 3)
+    if len(faces):
+        axis = 0 if size[0] >= size[1] else 1
+        edges = points[faces[:, [0, 1, 1, 2, 2, 0]]].reshape(-1, 2, 2)
+        borders = np.linspace(-0.5, 0.5, MAX_FOOTPRINT_PARTS + 1)
+        crossings = [_edge_crossings(edges, axis, border) for border in borders]
+
+        strips = []
+        for i in range(MAX_FOOTPRINT_PARTS):
+            coord = points[:, axis]
+            inside = points[(coord >= borders[i]) & (coord <= borders[i + 1])]
+            piece = MultiPoint(np.concatenate([inside, crossings[i], crossings[i + 1]])).convex_hull
+            if piece.area > 0:
+                strips.append(piece)
+        if strips and sum(part.area for part in strips) < hull.area * FOOTPRINT_PARTS_AREA_RATIO:
+            parts = strips
+
+    unit_box = box(-0.5, -0.5, 0.5, 0.5)
+    result = []
+    for part in parts:
+        part = part.simplify(FOOTPRINT_TOLERANCE).buffer(FOOTPRINT_TOLERANCE, join_style='mitre')
+        part = part.convex_hull.intersection(unit_box)
+        if part.is_empty or part.geom_type != 'Polygon':
+            continue
+        result.append([[round(x, 4), round(z, 4)] for x, z in list(part.exterior.coords)[:-1]])
+
+    return result or None
+
+
+def _edge_crossings(edges: np.ndarray, axis: int, value: float) -> np.ndarray:
+    """Points where mesh edges cross the line coordinate[axis] == value."""
+    start, end = edges[:, 0], edges[:, 1]
+    offset_start = start[:, axis] - value
+    offset_end = end[:, axis] - value
+    crossing = offset_start * offset_end < 0
+    t = offset_start[crossing] / (offset_start[crossing] - offset_end[crossing])
+    return start[crossing] + t[:, None] * (end[crossing] - start[crossing])
+
+
 def parse_glb_manually(file_path: Path) -> Dict[str, float]:
     """
     Manually parse GLB file to extract dimensions.
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Collision validation benchmark
+
+Usage:
+    python scripts/benchmark_collision.py [--scenarios grid clustered rotated free_build]
+        [--sizes 10 100 1000 10000] [--repeat 3] [--output results.json]
+        [--baseline previous.json --tolerance 0.25]
+
+Generates seeded layouts with constant furniture density (the room grows with
+the item count) and measures validate_layout time, throughput and peak memory.
+With the spatial hash broad phase the time per item should stay roughly flat as
+the item count grows.
+
+Scenarios:
+    grid        Dense grid of near-touching items; neighbours often touch or overlap
+    clustered   Items packed around a few hot spots, the worst case for the hash grid
+    rotated     Uniformly scattered items at arbitrary angles with mixed mount types
+    free_build  Ring-shaped free-build floor; items are checked against floor tiles
+
+--output writes the results as JSON. With --baseline, any scenario/size whose
+best time is more than --tolerance slower than the baseline is reported and the
+script exits with status 1, so it can gate a deploy.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.core.collision import validate_layout
+
+ITEMS_PER_SQUARE_METER = 0.25
+TILE_SIZE = 0.5
+
+
+def _item(furniture_id, x, z, width, depth, rotation_y=0.0, height=1.0, y=0.0, mount_type="floor"):
+    return {
+        "id": furniture_id,
+        "position": {"x": x, "y": y, "z": z},
+        "dimensions": {"width": width, "height": height, "depth": depth},
+        "rotation": {"x": 0, "y": rotation_y, "z": 0},
+        "mountType": mount_type,
+    }
+
+
+def _room_side(count: int) -> float:
+    """Room edge length (meters) for constant furniture density."""
+    return math.sqrt(count / ITEMS_PER_SQUARE_METER)
+
+
+def generate_grid(count: int, seed: int = 0):
+    """Items on a regular grid, sized so neighbours sit within a few centimeters."""
+    rng = random.Random(seed)
+    side = _room_side(count)
+    per_row = math.ceil(math.sqrt(count))
+    pitch = side / per_row
+
+    furnitures = [
+        _item(
+            f"item-{i}",
+            -side / 2 + (i % per_row + 0.5) * pitch,
+            -side / 2 + (i // per_row + 0.5) * pitch,
+            pitch * rng.uniform(0.9, 1.02),
+            pitch * rng.uniform(0.9, 1.02),
+        )
+        for i in range(count)
+    ]
+    return {"furnitures": furnitures}, {"width": side, "height": 3.0, "depth": side}, None
+
+
+def generate_clustered(count: int, seed: int = 0):
+    """Items gathered around a few cluster centers (sofa corners, desk islands)."""
+    rng = random.Random(seed)
+    side = _room_side(count)
+    half = side / 2
+    centers = [(rng.uniform(-half, half), rng.uniform(-half, half)) for _ in range(max(1, count // 50))]
+    spread = max(1.0, side / 20)
+
+    furnitures = []
+    for i in range(count):
+        cx, cz = rng.choice(centers)
+        furnitures.append(
+            _item(
+                f"item-{i}",
+                min(max(rng.gauss(cx, spread), -half), half),
+                min(max(rng.gauss(cz, spread), -half), half),
+                rng.uniform(0.3, 1.2),
+                rng.uniform(0.3, 1.2),
+                rotation_y=rng.choice([0, 90, 180, 270]),
+            )
+        )
+    return {"furnitures": furnitures}, {"width": side, "height": 3.0, "depth": side}, None
+
+
+def generate_rotated(count: int, seed: int = 0):
+    """Uniformly scattered items at arbitrary angles, including wall and surface items."""
+    rng = random.Random(seed)
+    side = _room_side(count)
+    half = side / 2
+
+    furnitures = []
+    for i in range(count):
+        mount_type = rng.choice(["floor", "floor", "floor", "wall", "surface"])
+        height = rng.uniform(0.2, 2.0)
+        furnitures.append(
+            _item(
+                f"item-{i}",
+                rng.uniform(-half, half),
+                rng.uniform(-half, half),
+                rng.uniform(0.4, 2.0),
+                rng.uniform(0.4, 2.0),
+                rotation_y=rng.uniform(-180, 180),
+                height=height,
+                y=0.0 if mount_type == "floor" else rng.uniform(0.5, 2.5),
+                mount_type=mount_type,
+            )
+        )
+    return {"furnitures": furnitures}, {"width": side, "height": 3.0, "depth": side}, None
+
+
+def generate_free_build(count: int, seed: int = 0):
+    """A ring-shaped free-build floor (square room with a courtyard) and items scattered over it."""
+    rng = random.Random(seed)
+    # The courtyard takes a quarter of the area, so grow the outer square to keep density
+    side = _room_side(count) * math.sqrt(4 / 3)
+    tiles_per_side = max(4, math.ceil(side / TILE_SIZE))
+    hole = range(tiles_per_side // 4, tiles_per_side - tiles_per_side // 4)
+    floor_tiles = [
+        {"gridX": x, "gridZ": z}
+        for x in range(tiles_per_side)
+        for z in range(tiles_per_side)
+        if not (x in hole and z in hole)
+    ]
+    extent = tiles_per_side * TILE_SIZE
+    room_structure = {
+        "mode": "free_build",
+        "tileSize": TILE_SIZE,
+        "floorTiles": floor_tiles,
+        "glbCenter": {"x": extent / 2, "y": 0, "z": extent / 2},
+    }
+
+    furnitures = []
+    for i in range(count):
+        tile = rng.choice(floor_tiles)
+        furnitures.append(
+            _item(
+                f"item-{i}",
+                (tile["gridX"] + rng.random()) * TILE_SIZE - extent / 2,
+                (tile["gridZ"] + rng.random()) * TILE_SIZE - extent / 2,
+                rng.uniform(0.3, 1.5),
+                rng.uniform(0.3, 1.5),
+                rotation_y=rng.uniform(-180, 180),
+            )
+        )
+    return {"furnitures": furnitures}, {"width": extent, "height": 3.0, "depth": extent}, room_structure
+
+
+GENERATORS = {
+    "grid": generate_grid,
+    "clustered": generate_clustered,
+    "rotated": generate_rotated,
+    "free_build": generate_free_build,
+}
+
+
+def measure(scenario: str, count: int, repeat: int, seed: int = 0) -> dict:
+    """
+    Benchmark validate_layout on one generated layout.
+
+    Timings come from untraced runs; peak memory from one extra run under tracemalloc.
+    """
+    furniture_state, room_dimensions, room_structure = GENERATORS[scenario](count, seed)
+
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = validate_layout(furniture_state, room_dimensions, room_structure)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    validate_layout(furniture_state, room_dimensions, room_structure)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        "scenario": scenario,
+        "items": count,
+        "seed": seed,
+        "repeat": repeat,
+        "best_ms": best * 1000,
+        "mean_ms": sum(timings) / len(timings) * 1000,
+        "items_per_second": count / best if best > 0 else None,
+        "peak_memory_kb": peak / 1024,
+        "collisions": len(result["collisions"]),
+        "out_of_bounds": len(result["out_of_bounds"]),
+    }
+
+
+def run(scenarios, sizes, repeat, seed=0):
+    """Benchmark every scenario at every size and print a table."""
+    print(
+        f"{'scenario':>11} {'items':>8} {'best (ms)':>12} {'per item (us)':>14} "
+        f"{'peak (KB)':>11} {'collisions':>11} {'out':>6}"
+    )
+    results = []
+    for scenario in scenarios:
+        for count in sizes:
+            row = measure(scenario, count, repeat, seed)
+            results.append(row)
+            print(
+                f"{scenario:>11} {count:>8} {row['best_ms']:>12.2f} {row['best_ms'] * 1000 / count:>14.1f} "
+                f"{row['peak_memory_kb']:>11.0f} {row['collisions']:>11} {row['out_of_bounds']:>6}"
+            )
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Find scenario/size pairs that got slower than the baseline.
+
+    Returns:
+        List of human-readable regression messages
+    """
+    previous = {(row["scenario"], row["items"]): row for row in baseline.get("results", [])}
+    regressions = []
+    for row in results:
+        before = previous.get((row["scenario"], row["items"]))
+        if before is None or before["best_ms"] <= 0:
+            continue
+        change = row["best_ms"] / before["best_ms"] - 1
+        if change > tolerance:
+            regressions.append(
+                f"{row['scenario']} x{row['items']}: {before['best_ms']:.2f} ms -> {row['best_ms']:.2f} ms "
+                f"(+{change:.0%})"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark validate_layout scaling")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(GENERATORS), default=list(GENERATORS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs. baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.scenarios, args.sizes, args.repeat, args.seed)
+
+    if args.output:
+        report = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
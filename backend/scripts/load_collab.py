@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Collaboration load generator
+
+Usage:
+    python scripts/load_collab.py [--url http://localhost:8000 | --serve [--port 8765]]
+        [--rooms 10] [--clients 5] [--users 10] [--duration 30]
+        [--move-hz 5] [--presence-hz 10] [--encoding json|msgpack]
+        [--output results.json] [--keep]
+
+Registers --users accounts and logs them in over REST, so every socket
+authenticates with a real JWT. Then it creates --rooms shared projects with one
+furniture item per client, and connects --rooms x --clients Socket.IO clients
+(python-socketio's async client). Each client drags its own item the way the
+editor does: it takes the lock, sends moves at --move-hz (the editor throttles
+to 5 Hz), sends lock heartbeats, releases the lock and pauses. Meanwhile it
+streams its cursor at --presence-hz.
+
+Reported, for capacity planning:
+    throughput      Events sent and received per second
+    move latency    p50/p95/p99/max from a furniture_move send to its receipt in
+                    a furniture_updates frame by each other client of the room
+    loop lag        How late a 50 ms timer fires on the load generator's event
+                    loop, and with --serve on the server's event loop
+
+--serve runs the ASGI socket_app with uvicorn in a thread of this process
+against the DATABASE_URL configured for the backend, so the server's
+event-loop lag can be sampled directly. Otherwise --url points at a running
+server and only the generator's own loop lag is reported; if that is high the
+generator, not the server, is the bottleneck.
+
+Created projects are deleted at the end unless --keep is given. The accounts
+(loadtest-<i>@example.com) are reused across runs.
+
+Requires aiohttp for the Socket.IO client, and uvicorn for --serve.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import socketio
+
+from app.core.wire import unpack
+
+PASSWORD = "loadtest-password"
+LAG_PROBE_INTERVAL = 0.05
+ITEM_SPACING = 2.0
+# Sent positions are kept this long for matching against received frames
+SENT_RETENTION = 10.0
+
+
+class Metrics:
+    """Counters and latency samples shared by every simulated client."""
+
+    def __init__(self):
+        self.sent: Dict[str, int] = {}
+        self.received: Dict[str, int] = {}
+        self.latencies: List[float] = []
+        self.errors: Dict[str, int] = {}
+        # {(project_id, furniture_id, x): send time}
+        self._moves: Dict[Tuple[int, str, float], float] = {}
+
+    def count_sent(self, event: str) -> None:
+        self.sent[event] = self.sent.get(event, 0) + 1
+
+    def count_received(self, event: str) -> None:
+        self.received[event] = self.received.get(event, 0) + 1
+
+    def count_error(self, kind: str) -> None:
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def move_sent(self, project_id: int, furniture_id: str, x: float) -> None:
+        self._moves[(project_id, furniture_id, round(x, 4))] = time.perf_counter()
+
+    def move_received(self, project_id: int, furniture_id: str, x: float) -> None:
+        sent_at = self._moves.get((project_id, furniture_id, round(x, 4)))
+        if sent_at is not None:
+            self.latencies.append(time.perf_counter() - sent_at)
+
+    def prune(self) -> None:
+        """Forget sent moves too old to still be delivered."""
+        cutoff = time.perf_counter() - SENT_RETENTION
+        self._moves = {key: sent_at for key, sent_at in self._moves.items() if sent_at >= cutoff}
+
+
+class LagProbe:
+    """Samples how late a periodic timer fires on an event loop."""
+
+    def __init__(self, interval: float = LAG_PROBE_INTERVAL):
+        self.interval = interval
+        self.samples: List[float] = []
+
+    async def run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - started - self.interval))
+
+
+def percentiles(samples: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p95/p99/max of samples in milliseconds."""
+    if not samples:
+        return {"count": 0, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    ordered = sorted(samples)
+
+    def at(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 2)
+
+    return {
+        "count": len(ordered),
+        "p50_ms": at(0.50),
+        "p95_ms": at(0.95),
+        "p99_ms": at(0.99),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+async def login_users(http: httpx.AsyncClient, count: int) -> List[str]:
+    """Register (if needed) and log in the load-test accounts, returning their access tokens."""
+    tokens = []
+    for i in range(count):
+        email = f"loadtest-{i}@example.com"
+        response = await http.post(
+            "/api/v1/auth/register",
+            json={"email": email, "password": PASSWORD, "full_name": f"Load Test {i}"},
+        )
+        if response.status_code not in (201, 400):
+            response.raise_for_status()
+        response = await http.post("/api/v1/auth/login", data={"username": email, "password": PASSWORD})
+        response.raise_for_status()
+        tokens.append(response.json()["access_token"])
+    return tokens
+
+
+async def create_room(http: httpx.AsyncClient, token: str, index: int, clients: int) -> int:
+    """Create a shared project whose current layout has one item per client."""
+    headers = {"Authorization": f"Bearer {token}"}
+    side = max(10.0, ITEM_SPACING * (clients + 1))
+    response = await http.post(
+        "/api/v1/projects",
+        json={"name": f"Load test room {index}", "room_width": side, "room_height": 3.0, "room_depth": side},
+        headers=headers,
+    )
+    response.raise_for_status()
+    project_id = response.json()["id"]
+
+    furnitures = [
+        {
+            "id": f"item-{j}",
+            "position": {"x": _home_x(j, side), "y": 0, "z": 0},
+            "dimensions": {"width": 1, "height": 1, "depth": 1},
+            "rotation": {"x": 0, "y": 0, "z": 0},
+        }
+        for j in range(clients)
+    ]
+    response = await http.post(
+        f"/api/v1/projects/{project_id}/layouts",
+        json={"furniture_state": {"furnitures": furnitures}},
+        headers=headers,
+    )
+    response.raise_for_status()
+    response = await http.post(f"/api/v1/projects/{project_id}/share", params={"share": "true"}, headers=headers)
+    response.raise_for_status()
+    return project_id
+
+
+def _home_x(item: int, side: float) -> float:
+    return -side / 2 + ITEM_SPACING * (item + 1)
+
+
+async def run_client(
+    url: str,
+    token: str,
+    project_id: int,
+    item: int,
+    args: argparse.Namespace,
+    metrics: Metrics,
+    deadline: float,
+) -> None:
+    """Connect one collaborator and drag its item until the deadline."""
+    client = socketio.AsyncClient(reconnection=False)
+    furniture_id = f"item-{item}"
+    side = max(10.0, ITEM_SPACING * (args.clients + 1))
+    joined = asyncio.Event()
+
+    @client.on("*")
+    async def on_any(event, data=None):
+        metrics.count_received(event)
+
+    @client.on("furniture_updates")
+    async def on_updates(data):
+        metrics.count_received("furniture_updates")
+        for update in unpack(data).get("updates", []):
+            metrics.move_received(project_id, update["furniture_id"], update["position"]["x"])
+
+    @client.on("room_snapshot")
+    async def on_snapshot(data):
+        metrics.count_received("room_snapshot")
+        joined.set()
+
+    @client.on("join_error")
+    async def on_join_error(data):
+        metrics.count_error("join_error")
+        joined.set()
+
+    async def emit(event: str, data: dict) -> None:
+        await client.emit(event, data)
+        metrics.count_sent(event)
+
+    try:
+        await client.connect(
+            url,
+            auth={"token": token, "encoding": args.encoding},
+            transports=["websocket"],
+            socketio_path="socket.io",
+        )
+    except socketio.exceptions.ConnectionError:
+        metrics.count_error("connect")
+        return
+
+    try:
+        await emit("join_project", {"project_id": project_id})
+        await asyncio.wait_for(joined.wait(), timeout=30)
+        presence = asyncio.create_task(_stream_presence(emit, project_id, side, args.presence_hz, deadline))
+        rng = random.Random(f"{project_id}-{item}")
+        move_interval = 1 / args.move_hz
+        x = _home_x(item, side)
+        counter = 0
+
+        while time.perf_counter() < deadline:
+            await emit("request_lock", {"project_id": project_id, "furniture_id": furniture_id})
+            drag_until = min(deadline, time.perf_counter() + rng.uniform(1.0, 3.0))
+            last_heartbeat = time.perf_counter()
+            while time.perf_counter() < drag_until:
+                # A unique x per move within the retention window lets receivers match it to its send time
+                counter = (counter + 1) % 1000
+                sent_x = round(x + rng.uniform(-0.4, 0.4), 1) + counter * 0.0001
+                metrics.move_sent(project_id, furniture_id, sent_x)
+                await emit(
+                    "furniture_move",
+                    {
+                        "project_id": project_id,
+                        "furniture_id": furniture_id,
+                        "position": {"x": sent_x, "y": 0, "z": rng.uniform(-0.4, 0.4)},
+                        "rotation": {"x": 0, "y": 0, "z": 0},
+                    },
+                )
+                if time.perf_counter() - last_heartbeat >= 10:
+                    await emit("lock_heartbeat", {"project_id": project_id, "furniture_id": furniture_id})
+                    last_heartbeat = time.perf_counter()
+                await asyncio.sleep(move_interval)
+            await emit("release_lock", {"project_id": project_id, "furniture_id": furniture_id})
+            await asyncio.sleep(rng.uniform(0.5, 2.0))
+
+        presence.cancel()
+    except asyncio.TimeoutError:
+        metrics.count_error("join_timeout")
+    finally:
+        await client.disconnect()
+
+
+async def _stream_presence(emit, project_id: int, side: float, rate_hz: float, deadline: float) -> None:
+    if rate_hz <= 0:
+        return
+    rng = random.Random(project_id)
+    while time.perf_counter() < deadline:
+        cursor = [rng.uniform(-side / 2, side / 2), 0, rng.uniform(-side / 2, side / 2)]
+        await emit("update_presence", {"project_id": project_id, "cursor_position": cursor})
+        await asyncio.sleep(1 / rate_hz)
+
+
+class EmbeddedServer:
+    """Runs the backend's ASGI socket_app with uvicorn in a background thread."""
+
+    def __init__(self, port: int):
+        import uvicorn
+
+        from app.main import socket_app
+
+        self.url = f"http://127.0.0.1:{port}"
+        self.server = uvicorn.Server(
+            uvicorn.Config(socket_app, host="127.0.0.1", port=port, log_level="warning")
+        )
+        self.lag = LagProbe()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        async def serve():
+            probe = asyncio.create_task(self.lag.run())
+            try:
+                await self.server.serve()
+            finally:
+                probe.cancel()
+
+        asyncio.run(serve())
+
+    async def start(self) -> None:
+        self._thread.start()
+        while not self.server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("Embedded server failed to start")
+            await asyncio.sleep(0.05)
+
+    async def stop(self) -> None:
+        self.server.should_exit = True
+        await asyncio.to_thread(self._thread.join, 10)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    server = EmbeddedServer(args.port) if args.serve else None
+    if server is not None:
+        await server.start()
+    url = server.url if server is not None else args.url.rstrip("/")
+
+    metrics = Metrics()
+    client_lag = LagProbe()
+    project_ids: List[int] = []
+    tokens: List[str] = []
+    async with httpx.AsyncClient(base_url=url, timeout=30) as http:
+        try:
+            print(f"Logging in {args.users} users and creating {args.rooms} rooms...", file=sys.stderr)
+            tokens = await login_users(http, args.users)
+            for index in range(args.rooms):
+                project_ids.append(await create_room(http, tokens[index % len(tokens)], index, args.clients))
+
+            print(
+                f"Running {args.rooms} rooms x {args.clients} clients for {args.duration}s against {url}...",
+                file=sys.stderr,
+            )
+            probe = asyncio.create_task(client_lag.run())
+            started = time.perf_counter()
+            deadline = started + args.duration
+            clients = [
+                run_client(
+                    url,
+                    tokens[(room * args.clients + item) % len(tokens)],
+                    project_id,
+                    item,
+                    args,
+                    metrics,
+                    deadline,
+                )
+                for room, project_id in enumerate(project_ids)
+                for item in range(args.clients)
+            ]
+            pruning = asyncio.create_task(_prune_periodically(metrics))
+            await asyncio.gather(*clients)
+            elapsed = time.perf_counter() - started
+            pruning.cancel()
+            probe.cancel()
+        finally:
+            if not args.keep:
+                for index, project_id in enumerate(project_ids):
+                    owner = tokens[index % len(tokens)]
+                    await http.delete(f"/api/v1/projects/{project_id}", headers={"Authorization": f"Bearer {owner}"})
+            if server is not None:
+                await server.stop()
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "platform": {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "config": {
+            "url": url,
+            "embedded_server": args.serve,
+            "rooms": args.rooms,
+            "clients_per_room": args.clients,
+            "users": args.users,
+            "duration_s": args.duration,
+            "move_hz": args.move_hz,
+            "presence_hz": args.presence_hz,
+            "encoding": args.encoding,
+        },
+        "elapsed_s": round(elapsed, 2),
+        "sent": metrics.sent,
+        "received": metrics.received,
+        "sent_per_s": round(sum(metrics.sent.values()) / elapsed, 1),
+        "received_per_s": round(sum(metrics.received.values()) / elapsed, 1),
+        "errors": metrics.errors,
+        "move_latency": percentiles(metrics.latencies),
+        "client_loop_lag": percentiles(client_lag.samples),
+        "server_loop_lag": percentiles(server.lag.samples) if server is not None else None,
+    }
+
+
+async def _prune_periodically(metrics: Metrics) -> None:
+    while True:
+        await asyncio.sleep(SENT_RETENTION)
+        metrics.prune()
+
+
+def print_report(results: dict) -> None:
+    config = results["config"]
+    print(
+        f"\n{config['rooms']} rooms x {config['clients_per_room']} clients, "
+        f"{results['elapsed_s']}s, {config['encoding']} against {config['url']}"
+    )
+    print(f"  sent       {results['sent_per_s']:>10.1f} events/s  {results['sent']}")
+    print(f"  received   {results['received_per_s']:>10.1f} events/s")
+    if results["errors"]:
+        print(f"  errors     {results['errors']}")
+
+    print(f"\n  {'':<18}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for label, key in (
+        ("move latency", "move_latency"),
+        ("client loop lag", "client_loop_lag"),
+        ("server loop lag", "server_loop_lag"),
+    ):
+        stats = results[key]
+        if stats is None:
+            continue
+        cells = [
+            f"{stats[name]:>10}" if stats[name] is not None else f"{'-':>10}"
+            for name in ("p50_ms", "p95_ms", "p99_ms", "max_ms")
+        ]
+        print(f"  {label:<18}{stats['count']:>8}{''.join(cells)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collaboration load generator")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default="http://localhost:8000", help="Running backend to load")
+    target.add_argument("--serve", action="store_true", help="Run the backend in this process and sample its loop lag")
+    parser.add_argument("--port", type=int, default=8765, help="Port for --serve")
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--clients", type=int, default=5, help="Clients per room")
+    parser.add_argument("--users", type=int, default=10, help="Accounts shared by the clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--move-hz", type=float, default=5.0, help="furniture_move rate while dragging")
+    parser.add_argument("--presence-hz", type=float, default=10.0, help="update_presence rate (0 = off)")
+    parser.add_argument("--encoding", choices=["json", "msgpack"], default="json")
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--keep", action="store_true", help="Keep the created projects")
+    args = parser.parse_args()
+    args.users = max(1, args.users)
+
+    results = asyncio.run(run(args))
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
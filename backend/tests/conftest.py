@@ -7,7 +7,9 @@ os.environ.setdefault("ENABLE_CATALOG_SYNC_ON_STARTUP", "false")
 import pytest
 import app.main as main_module
 from app.config import settings
+from app.core.catalog_mounts import catalog_mounts
 from app.database import Base, get_db
+from app.models.catalog_item import CatalogItem
 from app.main import app
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
@@ -35,6 +37,23 @@ def override_get_db():
         db.close()
 
 
+@pytest.fixture(autouse=True)
+def catalog_mounts_from_test_db(monkeypatch):
+    """Resolve catalog mount types from the testing database, reloaded per test."""
+
+    def load():
+        db = TestingSessionLocal()
+        try:
+            return {item.id: item.mount_type or "floor" for item in db.query(CatalogItem).all()}
+        finally:
+            db.close()
+
+    monkeypatch.setattr(catalog_mounts, "load", load)
+    catalog_mounts.invalidate()
+    yield
+    catalog_mounts.invalidate()
+
+
 @pytest.fixture
 def client():
     """Create test client with in-memory database."""
@@ -1,7 +1,12 @@
 """Tests for catalog admin authorization."""
 
+import asyncio
+
+import trimesh
+
 from app.api.v1 import catalog as catalog_api
 from app.models.catalog_item import CatalogItem
+from tests.conftest import TestingSessionLocal
 
 
 def seed_catalog_item(db_session):
@@ -76,3 +81,99 @@ def test_catalog_list_glb_requires_admin(client, auth_headers):
     """Raw S3 key listing should be restricted to admins."""
     response = client.get("/api/v1/catalog/list-glb", headers=auth_headers)
     assert response.status_code == 403
+
+
+def test_catalog_glb_upload_stores_footprint(client, admin_headers, db_session, monkeypatch):
+    """Uploading a GLB computes its footprint once and stores it on the item."""
+    seed_catalog_item(db_session)
+    uploaded = {}
+
+    class FakeS3:
+        def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None):
+            uploaded[key] = fileobj.read()
+
+    monkeypatch.setattr(catalog_api, "get_s3_client", lambda: FakeS3())
+    monkeypatch.setattr(catalog_api, "generate_presigned_url", lambda _client, key: f"https://example.com/{key}")
+
+    glb_bytes = trimesh.creation.box(extents=(2.0, 1.0, 1.0)).export(file_type="glb")
+    response = client.post(
+        "/api/v1/catalog/glb/test-chair",
+        files={"file": ("test-chair.glb", glb_bytes, "model/gltf-binary")},
+        headers=admin_headers,
+    )
+
+    assert response.status_code == 200
+    # The whole file still reaches S3 after the footprint pass
+    assert uploaded["catalog/models/test-chair.glb"] == glb_bytes
+
+    db_session.expire_all()
+    footprint = db_session.query(CatalogItem).filter(CatalogItem.id == "test-chair").one().footprint
+    assert len(footprint) == 1
+    assert min(x for x, _ in footprint[0]) == -0.5
+    assert max(z for _, z in footprint[0]) == 0.5
+
+
+def test_catalog_glb_upload_computes_footprint_off_the_event_loop(client, admin_headers, db_session, monkeypatch):
+    """The footprint pass runs in a worker thread, not on the loop serving requests."""
+    from app.utils import glb_utils
+
+    seed_catalog_item(db_session)
+    on_loop = []
+
+    def fake_footprint(_path):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return None
+
+    class FakeS3:
+        def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None):
+            pass
+
+    monkeypatch.setattr(glb_utils, "extract_glb_footprint", fake_footprint)
+    monkeypatch.setattr(catalog_api, "get_s3_client", lambda: FakeS3())
+    monkeypatch.setattr(catalog_api, "generate_presigned_url", lambda _client, key: None)
+
+    response = client.post(
+        "/api/v1/catalog/glb/test-chair",
+        files={"file": ("test-chair.glb", b"glb", "model/gltf-binary")},
+        headers=admin_headers,
+    )
+
+    assert response.status_code == 200
+    assert on_loop == [False]
+    db_session.expire_all()
+    assert db_session.query(CatalogItem).filter(CatalogItem.id == "test-chair").one().footprint == []
+
+
+def test_sync_backfills_only_the_footprint_once(client, db_session, monkeypatch):
+    """Sync adds a missing footprint without touching edited dimensions, and records failures."""
+    item = seed_catalog_item(db_session)
+    item.width, item.height, item.depth = 2.0, 0.8, 0.6
+    db_session.commit()
+    downloads = []
+
+    class FakeS3:
+        def get_paginator(self, _name):
+            return self
+
+        def paginate(self, Bucket, Prefix):
+            return [{"Contents": [{"Key": "catalog/models/test-chair.glb"}]}]
+
+        def download_fileobj(self, bucket, key, fileobj):
+            downloads.append(key)
+            fileobj.write(b"not a glb")
+
+    monkeypatch.setattr(catalog_api, "get_s3_client", lambda: FakeS3())
+    monkeypatch.setattr(catalog_api, "SessionLocal", TestingSessionLocal)
+
+    assert catalog_api.sync_catalog_from_s3()["updated"] == 1
+    assert catalog_api.sync_catalog_from_s3()["updated"] == 0
+    assert downloads == ["catalog/models/test-chair.glb"]
+
+    db_session.expire_all()
+    synced = db_session.query(CatalogItem).filter(CatalogItem.id == "test-chair").one()
+    assert (synced.width, synced.height, synced.depth) == (2.0, 0.8, 0.6)
+    assert synced.footprint == []
@@ -1,12 +1,38 @@
 """Tests for collision detection system."""
 
+import copy
+import importlib.util
+import json
+import math
+import random
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
 import pytest
+from shapely.geometry import Polygon
+from shapely.ops import unary_union
+
 from app.core.collision import (
     BoundingBox,
+    CollisionIndex,
+    FurnitureSet,
+    ProximityIndex,
     check_boundary,
     check_collision,
+    find_candidate_pairs,
+    find_free_placements,
+    get_floor_occupancy,
     validate_layout,
 )
+from app.config import settings
+from app.core import validation_pool
+from app.core.catalog_mounts import CatalogMounts
+from app.core.validation_cache import ValidationCache, layout_fingerprint, validation_cache
+from app.models.catalog_item import CatalogItem
+from app.services import layout_service
+from app.utils.glb_utils import compute_footprint
 
 
 def test_bounding_box_creation():
@@ -139,3 +165,725 @@ def test_validate_layout_out_of_bounds():
     assert result["valid"] is False
     assert len(result["out_of_bounds"]) == 1
     assert result["out_of_bounds"][0] == "furniture1"
+
+
+def test_candidate_pairs_keep_touching_boxes():
+    """Broad phase keeps boxes that only share an edge."""
+    bounds = [(0.0, 0.0, 1.0, 1.0), (1.0, 0.0, 2.0, 1.0), (5.0, 5.0, 6.0, 6.0)]
+
+    assert find_candidate_pairs(bounds) == [(0, 1)]
+
+
+def _footprint_polygon(furniture):
+    """Build the exact rotated footprint with shapely as an independent reference."""
+    angle = math.radians(furniture["rotation"]["y"])
+    half_width = furniture["dimensions"]["width"] / 2
+    half_depth = furniture["dimensions"]["depth"] / 2
+    cx, cz = furniture["position"]["x"], furniture["position"]["z"]
+    corners = []
+    for sx, sz in ((-1, -1), (1, -1), (1, 1), (-1, 1)):
+        lx, lz = sx * half_width, sz * half_depth
+        corners.append((cx + lx * math.cos(angle) + lz * math.sin(angle), cz - lx * math.sin(angle) + lz * math.cos(angle)))
+    return Polygon(corners)
+
+
+def test_validate_layout_matches_brute_force():
+    """Broad phase plus OBB kernel reports the same collisions as an all-pairs shapely scan."""
+    rng = random.Random(42)
+    furnitures = [
+        {
+            "id": f"furniture{i}",
+            "position": {"x": rng.uniform(-8, 8), "y": 0, "z": rng.uniform(-8, 8)},
+            "dimensions": {"width": rng.uniform(0.2, 2.5), "height": 1, "depth": rng.uniform(0.2, 2.5)},
+            "rotation": {"x": 0, "y": rng.choice([0, 90, rng.uniform(-180, 180)]), "z": 0},
+        }
+        for i in range(120)
+    ]
+    # One oversized item exercises the fallback path
+    furnitures.append({
+        "id": "rug",
+        "position": {"x": 0, "y": 0, "z": 0},
+        "dimensions": {"width": 60, "height": 0.01, "depth": 60},
+        "rotation": {"x": 0, "y": 0, "z": 0},
+    })
+
+    polygons = [_footprint_polygon(f) for f in furnitures]
+    expected = [
+        {"id1": furnitures[i]["id"], "id2": furnitures[j]["id"]}
+        for i in range(len(furnitures))
+        for j in range(i + 1, len(furnitures))
+        if polygons[i].intersects(polygons[j])
+    ]
+
+    result = validate_layout({"furnitures": furnitures}, {"width": 20, "height": 3, "depth": 20})
+
+    assert result["collisions"] == expected
+    assert result["out_of_bounds"] == ["rug"]
+
+
+def test_rotated_boxes_without_overlap():
+    """Parallel diagonal sofas whose axis-aligned bounds overlap do not collide."""
+    dimensions = {"width": 4, "height": 1, "depth": 0.5}
+    rotation = {"x": 0, "y": 45, "z": 0}
+    box1 = BoundingBox({"x": 0, "y": 0, "z": 0}, dimensions, rotation)
+    box2 = BoundingBox({"x": 0.8, "y": 0, "z": 0.8}, dimensions, rotation)
+
+    assert check_collision(box1, box2) is False
+
+
+def test_rotated_box_collision():
+    """A box rotated into its neighbour collides even though the unrotated boxes would not."""
+    box1 = BoundingBox({"x": 0, "y": 0, "z": 0}, {"width": 4, "height": 1, "depth": 0.5}, {"x": 0, "y": 90, "z": 0})
+    box2 = BoundingBox({"x": 0, "y": 0, "z": 1.5}, {"width": 1, "height": 1, "depth": 1}, {"x": 0, "y": 0, "z": 0})
+
+    assert check_collision(box1, box2) is True
+
+
+def test_boundary_check_rotated():
+    """Rotated footprint corners are checked against the room walls."""
+    square = BoundingBox({"x": 0, "y": 0, "z": 0}, {"width": 2, "height": 1, "depth": 2}, {"x": 0, "y": 45, "z": 0})
+    sofa = BoundingBox({"x": 0, "y": 0, "z": 0}, {"width": 4, "height": 1, "depth": 0.5}, {"x": 0, "y": 90, "z": 0})
+
+    assert check_boundary(square, {"width": 2.5, "height": 3, "depth": 2.5}) is False
+    assert check_boundary(sofa, {"width": 1, "height": 3, "depth": 5}) is True
+
+
+def test_furniture_set_from_state():
+    """FurnitureSet parses valid items into float32 columns and skips malformed ones."""
+    furniture_state = {
+        "furnitures": [
+            {
+                "id": "sofa",
+                "position": {"x": 1, "y": 0, "z": -2},
+                "dimensions": {"width": 2, "height": 0.8, "depth": 0.9},
+                "rotation": {"x": 0, "y": 90, "z": 0},
+            },
+            {"id": "broken", "position": {"x": 0, "y": 0}},
+            {
+                "position": {"x": 0, "y": 0, "z": 0},
+                "dimensions": {"width": 1, "height": 1, "depth": 1},
+                "rotation": {"x": 0, "y": 0, "z": 0},
+            },
+            {
+                "id": "lamp",
+                "position": {"x": 3, "y": 0, "z": 3},
+                "dimensions": {"width": 0.3, "height": 1.5, "depth": 0.3},
+                "rotation": {},
+            },
+        ]
+    }
+
+    furniture_set = FurnitureSet.from_state(furniture_state)
+
+    assert len(furniture_set) == 2
+    assert furniture_set.ids == ["sofa", "lamp"]
+    assert furniture_set.index == {"sofa": 0, "lamp": 1}
+    assert furniture_set.positions.dtype == np.float32
+    assert furniture_set.positions.flags["C_CONTIGUOUS"]
+    assert furniture_set.rotations_y.tolist() == [90, 0]
+    # 90 degree rotation swaps width and depth in the 2D bounds
+    assert furniture_set.bounds()[0] == pytest.approx([0.55, -3.0, 1.45, -1.0])
+
+
+def test_furniture_set_empty_state():
+    """An empty layout produces empty columns and a valid result."""
+    furniture_set = FurnitureSet.from_state({})
+
+    assert len(furniture_set) == 0
+    assert furniture_set.collision_pairs().shape == (0, 2)
+    assert validate_layout({}, {"width": 5, "height": 3, "depth": 5})["valid"] is True
+
+
+def _random_furniture(rng, furniture_id):
+    return {
+        "id": furniture_id,
+        "position": {"x": rng.uniform(-6, 6), "y": rng.uniform(0, 2), "z": rng.uniform(-6, 6)},
+        "dimensions": {"width": rng.uniform(0.3, 2.0), "height": rng.uniform(0.2, 1.5), "depth": rng.uniform(0.3, 2.0)},
+        "rotation": {"x": 0, "y": rng.uniform(-180, 180), "z": 0},
+        "mountType": rng.choice(["floor", "floor", "wall", "surface"]),
+    }
+
+
+def test_collision_index_matches_validate_layout():
+    """Incremental add/move/remove keeps the same result as a full validation."""
+    rng = random.Random(7)
+    room_dimensions = {"width": 12, "height": 3, "depth": 12}
+    furnitures = [_random_furniture(rng, f"item{i}") for i in range(40)]
+
+    index = CollisionIndex.from_state({"furnitures": furnitures}, room_dimensions)
+    assert index.result() == validate_layout({"furnitures": furnitures}, room_dimensions)
+
+    for step in range(200):
+        action = rng.random()
+        if action < 0.7:
+            target = rng.choice(furnitures)
+            moved = _random_furniture(rng, target["id"])
+            target["position"] = moved["position"]
+            target["rotation"] = moved["rotation"]
+            index.move(target["id"], target["position"], target["rotation"])
+        elif action < 0.85:
+            furniture = _random_furniture(rng, f"new{step}")
+            furnitures.append(furniture)
+            index.add(furniture)
+        else:
+            removed = furnitures.pop(rng.randrange(len(furnitures)))
+            index.remove(removed["id"])
+
+        assert index.result() == validate_layout({"furnitures": furnitures}, room_dimensions)
+
+
+def test_collision_index_reports_changes():
+    """move/remove return True only when the collision state changes."""
+    room_dimensions = {"width": 10, "height": 3, "depth": 10}
+    furnitures = [
+        {
+            "id": "desk",
+            "position": {"x": 0, "y": 0, "z": 0},
+            "dimensions": {"width": 2, "height": 1, "depth": 1},
+            "rotation": {"x": 0, "y": 0, "z": 0},
+        },
+        {
+            "id": "chair",
+            "position": {"x": 3, "y": 0, "z": 0},
+            "dimensions": {"width": 0.5, "height": 1, "depth": 0.5},
+            "rotation": {"x": 0, "y": 0, "z": 0},
+        },
+    ]
+    index = CollisionIndex.from_state({"furnitures": furnitures}, room_dimensions)
+
+    assert index.move("chair", {"x": 3.5, "y": 0, "z": 0}) is False
+    assert index.move("chair", {"x": 0.5, "y": 0, "z": 0}) is True
+    assert index.result()["collisions"] == [{"id1": "desk", "id2": "chair"}]
+    assert index.move("missing", {"x": 0, "y": 0, "z": 0}) is False
+    assert index.remove("desk") is True
+    assert index.result()["valid"] is True
+
+
+# L-shaped free-build floor: 4x4 tiles of 0.5m with the (+x, +z) 2x2 corner missing
+L_SHAPED_ROOM = {
+    "mode": "free_build",
+    "tileSize": 0.5,
+    "floorTiles": [
+        {"gridX": x, "gridZ": z}
+        for x in range(4)
+        for z in range(4)
+        if not (x >= 2 and z >= 2)
+    ],
+    "bounds": {"minX": 0, "maxX": 3, "minZ": 0, "maxZ": 3},
+}
+
+
+def _square(furniture_id, x, z, size):
+    return {
+        "id": furniture_id,
+        "position": {"x": x, "y": 0, "z": z},
+        "dimensions": {"width": size, "height": 1, "depth": size},
+        "rotation": {"x": 0, "y": 0, "z": 0},
+    }
+
+
+def test_validate_layout_free_build_floor():
+    """Free-build rooms reject furniture over missing floor tiles."""
+    furniture_state = {
+        "furnitures": [
+            _square("on_floor", -0.5, -0.5, 0.8),
+            _square("flush_corner", -0.75, 0.75, 0.5),
+            _square("over_notch", 0.5, 0.5, 0.5),
+            _square("off_grid", 2.0, 0.0, 0.5),
+        ]
+    }
+    room_dimensions = {"width": 2, "height": 3, "depth": 2}
+
+    result = validate_layout(furniture_state, room_dimensions, L_SHAPED_ROOM)
+
+    assert result["out_of_bounds"] == ["over_notch", "off_grid"]
+    # Without the room structure the notch item is inside the bounding rectangle
+    assert validate_layout(furniture_state, room_dimensions)["out_of_bounds"] == ["off_grid"]
+
+
+def test_floor_occupancy_is_cached():
+    """The occupancy bitmap is built once per distinct room_structure."""
+    occupancy = get_floor_occupancy(L_SHAPED_ROOM)
+
+    assert occupancy is get_floor_occupancy(copy.deepcopy(L_SHAPED_ROOM))
+    assert int(occupancy.grid.sum()) == 12
+    assert get_floor_occupancy(None) is None
+    assert get_floor_occupancy({"mode": "free_build", "floorTiles": []}) is None
+
+
+def test_validate_endpoint_with_room_structure(client):
+    """POST /validate accepts a free-build room_structure."""
+    response = client.post(
+        "/api/v1/validate",
+        json={
+            "furniture_state": {"furnitures": [_square("over_notch", 0.5, 0.5, 0.5)]},
+            "room_dimensions": {"width": 2, "height": 3, "depth": 2},
+            "room_structure": L_SHAPED_ROOM,
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["out_of_bounds"] == ["over_notch"]
+
+
+def _stacked(furniture_id, y, height, mount_type, width=1.0, depth=1.0, **extra):
+    furniture = {
+        "id": furniture_id,
+        "position": {"x": 0, "y": y, "z": 0},
+        "dimensions": {"width": width, "height": height, "depth": depth},
+        "rotation": {"x": 0, "y": 0, "z": 0},
+        "mountType": mount_type,
+    }
+    furniture.update(extra)
+    return furniture
+
+
+def test_surface_item_on_desk_is_not_collision():
+    """A lamp resting on a desk only touches it vertically."""
+    desk = _stacked("desk", 0, 0.75, "floor", width=1.2, depth=0.6)
+    lamp = _stacked("lamp", 0.95, 0.4, "surface", width=0.2, depth=0.2)
+    mounted_lamp = _stacked("mounted_lamp", 0.7, 0.4, "surface", width=0.2, depth=0.2, mountedOn="desk")
+    room_dimensions = {"width": 5, "height": 3, "depth": 5}
+
+    assert validate_layout({"furnitures": [desk, lamp]}, room_dimensions)["valid"] is True
+    assert validate_layout({"furnitures": [desk, mounted_lamp]}, room_dimensions)["valid"] is True
+
+
+def test_wall_item_height_rules():
+    """Wall items collide only with furniture they overlap vertically."""
+    sofa = _stacked("sofa", 0.4, 0.8, "floor", width=2.0)
+    wardrobe = _stacked("wardrobe", 0, 2.0, "floor")
+    tv = _stacked("tv", 1.5, 0.6, "wall", width=1.2, depth=0.1)
+    room_dimensions = {"width": 5, "height": 3, "depth": 5}
+
+    assert validate_layout({"furnitures": [sofa, tv]}, room_dimensions)["valid"] is True
+    result = validate_layout({"furnitures": [wardrobe, tv]}, room_dimensions)
+    assert result["collisions"] == [{"id1": "wardrobe", "id2": "tv"}]
+
+
+def test_floor_items_ignore_position_y():
+    """Floor items share the floor layer whatever their model origin height."""
+    glb_chair = _stacked("glb_chair", 0, 1.0, "floor")
+    procedural_chair = _stacked("procedural_chair", 0.5, 1.0, "floor")
+    plain = _stacked("plain", 3.0, 0.5, None)
+
+    result = validate_layout({"furnitures": [glb_chair, procedural_chair, plain]}, {"width": 5, "height": 3, "depth": 5})
+
+    assert result["collisions"] == [
+        {"id1": "glb_chair", "id2": "procedural_chair"},
+        {"id1": "glb_chair", "id2": "plain"},
+        {"id1": "procedural_chair", "id2": "plain"},
+    ]
+
+
+# Triangles of a box whose corners are enumerated as x-major, then y, then z
+_BOX_FACES = np.array([
+    [0, 1, 3], [0, 3, 2], [4, 6, 7], [4, 7, 5], [0, 4, 5], [0, 5, 1],
+    [2, 3, 7], [2, 7, 6], [0, 2, 6], [0, 6, 4], [1, 5, 7], [1, 7, 3],
+])
+
+
+def _box_vertices(x_min, x_max, z_min, z_max, height=0.8):
+    """Corners of an axis-aligned box standing on the floor."""
+    return np.array([[x, y, z] for x in (x_min, x_max) for y in (0.0, height) for z in (z_min, z_max)])
+
+
+def _l_shaped_footprint():
+    """Footprint of an L-shaped sofa: a 2 x 0.8 back with a 0.8 x 2 chaise on the right."""
+    vertices = np.vstack([_box_vertices(-1.0, 1.0, -1.0, -0.2), _box_vertices(0.2, 1.0, -1.0, 1.0)])
+    return compute_footprint(vertices, np.vstack([_BOX_FACES, _BOX_FACES + 8]))
+
+
+def test_compute_footprint_splits_concave_shapes():
+    """Concave footprints become several convex parts; boxes stay one part."""
+    footprint = _l_shaped_footprint()
+    assert 1 < len(footprint) <= 4
+
+    parts = [Polygon(part) for part in footprint]
+    assert sum(part.area for part in parts) < 0.75
+    # Conservative: the real L-shape is covered
+    covered = unary_union(parts)
+    assert covered.buffer(1e-9).contains(Polygon([(-0.5, -0.5), (0.5, -0.5), (0.5, -0.1), (-0.5, -0.1)]))
+
+    assert len(compute_footprint(_box_vertices(0.0, 2.0, 0.0, 1.0), _BOX_FACES)) == 1
+    assert compute_footprint(np.zeros((2, 3)), np.zeros((0, 3))) is None
+
+
+def test_validate_layout_uses_footprints():
+    """Items in the empty corner of an L-shaped sofa do not collide with it."""
+    sofa = {
+        "id": "sofa",
+        "position": {"x": 0, "y": 0, "z": 0},
+        "dimensions": {"width": 2, "height": 0.8, "depth": 2},
+        "rotation": {"x": 0, "y": 0, "z": 0},
+        "footprint": _l_shaped_footprint(),
+    }
+    corner_chair = {
+        "id": "chair",
+        "position": {"x": -0.5, "y": 0, "z": 0.5},
+        "dimensions": {"width": 0.6, "height": 0.8, "depth": 0.6},
+        "rotation": {"x": 0, "y": 0, "z": 0},
+    }
+    room_dimensions = {"width": 5, "height": 3, "depth": 5}
+
+    assert validate_layout({"furnitures": [sofa, corner_chair]}, room_dimensions)["valid"] is True
+    # Without the footprint the bounding boxes overlap
+    plain_sofa = {key: value for key, value in sofa.items() if key != "footprint"}
+    assert validate_layout({"furnitures": [plain_sofa, corner_chair]}, room_dimensions)["valid"] is False
+
+    # Rotating the sofa 180 degrees swings the chaise into the chair
+    turned = dict(sofa, rotation={"x": 0, "y": 180, "z": 0})
+    result = validate_layout({"furnitures": [turned, corner_chair]}, room_dimensions)
+    assert result["collisions"] == [{"id1": "sofa", "id2": "chair"}]
+
+    # Malformed footprints fall back to the rectangle
+    broken = dict(sofa, footprint=[[0, 1]])
+    assert validate_layout({"furnitures": [broken, corner_chair]}, room_dimensions)["valid"] is False
+
+    index = CollisionIndex.from_state({"furnitures": [sofa, corner_chair]}, room_dimensions)
+    assert index.result()["valid"] is True
+    assert index.move("chair", {"x": 0.5, "y": 0, "z": 0.5}) is True
+    assert index.result()["collisions"] == [{"id1": "sofa", "id2": "chair"}]
+
+
+def _row_layout():
+    """Four unit squares: a at 0, d at 1.5, b at 3 along X and c far away on Z."""
+    return {
+        "furnitures": [
+            _square("a", 0, 0, 1),
+            _square("b", 3, 0, 1),
+            _square("c", 0, 10, 1),
+            _square("d", 1.5, 0, 1),
+        ]
+    }
+
+
+def test_proximity_index_queries():
+    """k-nearest, within-distance and closest pair match brute-force distances."""
+    index = ProximityIndex.from_state(_row_layout())
+
+    assert index.nearest("a", 2) == [{"id": "d", "distance": 0.5}, {"id": "b", "distance": 2.0}]
+    # The search radius grows until far items are reached
+    assert [item["id"] for item in index.nearest("a", 10)] == ["d", "b", "c"]
+    assert index.within("a", 2.0) == [{"id": "d", "distance": 0.5}]
+    assert index.within("d", 0.6) == [{"id": "a", "distance": 0.5}, {"id": "b", "distance": 0.5}]
+    assert index.min_distance() == {"id1": "a", "id2": "d", "distance": 0.5}
+
+    assert ProximityIndex.from_state({"furnitures": [_square("solo", 0, 0, 1)]}).min_distance() is None
+    with pytest.raises(KeyError):
+        index.nearest("missing", 1)
+
+
+def test_proximity_endpoint(client, auth_headers, monkeypatch):
+    """POST /layouts/current/proximity answers several checks in one call."""
+    monkeypatch.setattr(layout_service, "_proximity_indexes", layout_service.OrderedDict())
+    project_data = {"name": "Showroom", "room_width": 20.0, "room_height": 3.0, "room_depth": 20.0}
+    project_id = client.post("/api/v1/projects", json=project_data, headers=auth_headers).json()["id"]
+    layout_id = client.post(
+        f"/api/v1/projects/{project_id}/layouts",
+        json={"furniture_state": _row_layout()},
+        headers=auth_headers,
+    ).json()["id"]
+    url = f"/api/v1/projects/{project_id}/layouts/current/proximity"
+
+    response = client.post(
+        url, json={"furniture_id": "b", "k": 1, "within": 2.0, "min_distance": True}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "nearest": [{"id": "d", "distance": 0.5}],
+        "within": [{"id": "d", "distance": 0.5}],
+        "min_distance": {"id1": "a", "id2": "d", "distance": 0.5},
+    }
+
+    response = client.post(url, json={"min_distance": True}, headers=auth_headers)
+    assert response.json()["nearest"] is None
+
+    response = client.post(url, json={"furniture_id": "missing", "k": 1}, headers=auth_headers)
+    assert response.status_code == 404
+    response = client.post(url, json={"k": 1}, headers=auth_headers)
+    assert response.status_code == 422
+
+
+def test_proximity_follows_live_saves(client, auth_headers, db_session, monkeypatch):
+    """A live collaboration save that rewrites the current layout is not answered from a stale index."""
+    monkeypatch.setattr(layout_service, "_proximity_indexes", layout_service.OrderedDict())
+    project_data = {"name": "Showroom", "room_width": 20.0, "room_height": 3.0, "room_depth": 20.0}
+    project_id = client.post("/api/v1/projects", json=project_data, headers=auth_headers).json()["id"]
+    layout_id = client.post(
+        f"/api/v1/projects/{project_id}/layouts",
+        json={"furniture_state": _row_layout()},
+        headers=auth_headers,
+    ).json()["id"]
+    url = f"/api/v1/projects/{project_id}/layouts/current/proximity"
+    query = {"furniture_id": "b", "k": 1}
+    assert client.post(url, json=query, headers=auth_headers).json()["nearest"] == [{"id": "d", "distance": 0.5}]
+
+    moved = _row_layout()
+    moved["furnitures"] = [item for item in moved["furnitures"] if item["id"] != "d"]
+    layout_service.LayoutService(db_session).save_live_state(project_id, moved, layout_id)
+
+    nearest = client.post(url, json=query, headers=auth_headers).json()["nearest"]
+    assert nearest[0]["id"] != "d"
+
+
+def test_proximity_cache_is_thread_safe(monkeypatch):
+    """Concurrent threadpool requests share the proximity LRU without corrupting it."""
+    monkeypatch.setattr(layout_service, "_proximity_indexes", layout_service.OrderedDict())
+    monkeypatch.setattr(layout_service, "PROXIMITY_CACHE_SIZE", 4)
+    layouts = [
+        SimpleNamespace(
+            id=i % 8,
+            furniture_state={"furnitures": [_square("a", 0, 0, 1), _square("b", 2 + i % 8, 0, 1)]},
+        )
+        for i in range(400)
+    ]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        indexes = list(pool.map(layout_service.LayoutService._proximity_index, layouts))
+
+    assert [index.min_distance()["distance"] for index in indexes] == [1.0 + i % 8 for i in range(400)]
+    assert len(layout_service._proximity_indexes) <= 4
+
+
+def _candidate_layouts(count):
+    """Distinct candidate layouts alternating between a clean and a colliding arrangement."""
+    return [
+        {"furnitures": [_square("a", 0, 0, 1), _square("b", (1.5 if i % 2 else 0.5) + i / 1000, 0, 1)]}
+        for i in range(count)
+    ]
+
+
+def test_validate_batch_endpoint(client):
+    """POST /validate/batch returns one result per candidate, in order."""
+    response = client.post(
+        "/api/v1/validate/batch",
+        json={"furniture_states": _candidate_layouts(3), "room_dimensions": {"width": 5, "height": 3, "depth": 5}},
+    )
+
+    assert response.status_code == 200
+    assert [result["valid"] for result in response.json()["results"]] == [False, True, False]
+
+    response = client.post(
+        "/api/v1/validate/batch",
+        json={"furniture_states": [], "room_dimensions": {"width": 5, "height": 3, "depth": 5}},
+    )
+    assert response.status_code == 422
+
+
+def test_validate_layouts_process_pool(monkeypatch):
+    """Batches above the threshold run in the process pool with identical results."""
+    monkeypatch.setattr(settings, "VALIDATION_POOL_WORKERS", 2)
+    monkeypatch.setattr(settings, "VALIDATION_PARALLEL_MIN_BATCH", 4)
+    room_dimensions = {"width": 5, "height": 3, "depth": 5}
+    candidates = _candidate_layouts(12)
+    validation_cache.clear()
+
+    try:
+        results = validation_pool.validate_layouts(candidates, room_dimensions)
+        assert validation_pool._executor is not None
+    finally:
+        validation_pool.shutdown_validation_pool()
+
+    assert results == [validate_layout(candidate, room_dimensions) for candidate in candidates]
+
+
+def test_layout_fingerprint_is_canonical():
+    """Key order does not change the fingerprint; geometry and room changes do."""
+    furniture_state = _row_layout()
+    reordered = {"furnitures": [dict(reversed(list(item.items()))) for item in furniture_state["furnitures"]]}
+    room_dimensions = {"width": 20, "height": 3, "depth": 20}
+    fingerprint = layout_fingerprint(furniture_state, room_dimensions)
+
+    assert layout_fingerprint(reordered, {"depth": 20, "height": 3, "width": 20}) == fingerprint
+    moved = copy.deepcopy(furniture_state)
+    moved["furnitures"][0]["position"]["x"] = 0.01
+    assert layout_fingerprint(moved, room_dimensions) != fingerprint
+    assert layout_fingerprint(furniture_state, {"width": 10, "height": 3, "depth": 20}) != fingerprint
+    assert layout_fingerprint(furniture_state, room_dimensions, L_SHAPED_ROOM) != fingerprint
+
+
+def test_validation_cache_lru_and_counters():
+    """The cache evicts least recently used results and hands out copies."""
+    cache = ValidationCache(maxsize=2)
+    result = {"valid": False, "collisions": [{"id1": "a", "id2": "b"}], "out_of_bounds": []}
+
+    assert cache.get("one") is None
+    cache.put("one", result)
+    cache.put("two", result)
+    cached = cache.get("one")
+    cached["collisions"].clear()
+    cache.put("three", result)
+
+    assert cache.get("one") == result
+    assert cache.get("two") is None
+    assert cache.stats() == {"hits": 2, "misses": 2, "hit_rate": 0.5, "size": 2, "maxsize": 2}
+
+
+def test_validate_endpoint_uses_cache(client):
+    """Validating an unchanged scene again is a cache hit, across the REST and batch endpoints."""
+    validation_cache.clear()
+    payload = {"furniture_state": _row_layout(), "room_dimensions": {"width": 20, "height": 3, "depth": 20}}
+
+    first = client.post("/api/v1/validate", json=payload).json()
+    second = client.post("/api/v1/validate", json=payload).json()
+    batch = client.post(
+        "/api/v1/validate/batch",
+        json={"furniture_states": [_row_layout(), _row_layout()], "room_dimensions": payload["room_dimensions"]},
+    ).json()
+
+    assert first == second == batch["results"][0] == batch["results"][1]
+    assert validation_cache.stats()["misses"] == 1
+    assert validation_cache.stats()["hits"] == 2
+    assert client.get("/health").json()["validation_cache"]["size"] == 1
+
+
+def test_find_free_placements_are_valid():
+    """Every placement passes validate_layout, on template and free-build floors."""
+    rng = random.Random(11)
+    furniture_state = {"furnitures": [_random_furniture(rng, f"item-{i}") for i in range(25)]}
+    furniture_set = FurnitureSet.from_state(furniture_state)
+
+    for room_dimensions, room_structure in (
+        ({"width": 12, "height": 3, "depth": 12}, None),
+        ({"width": 2, "height": 3, "depth": 2}, L_SHAPED_ROOM),
+    ):
+        placements = find_free_placements(
+            furniture_set,
+            room_dimensions,
+            0.6,
+            0.8,
+            0.4,
+            rotations=(0, 45, 90),
+            limit=20,
+            floor=get_floor_occupancy(room_structure),
+        )
+        assert placements
+
+        clearances = [placement["clearance"] for placement in placements]
+        assert clearances == sorted(clearances, reverse=True)
+        for placement in placements:
+            new_item = {"id": "new", "dimensions": {"width": 0.6, "height": 0.8, "depth": 0.4}, **placement}
+            state = {"furnitures": furniture_state["furnitures"] + [new_item]}
+            result = validate_layout(state, room_dimensions, room_structure)
+            assert "new" not in result["out_of_bounds"]
+            assert not [pair for pair in result["collisions"] if "new" in pair.values()]
+
+
+def test_find_free_placements_near_and_full_room():
+    """near ranks by distance to the point; an item that cannot fit gets no placements."""
+    furniture_set = FurnitureSet.from_state({"furnitures": [_square("table", 0, 0, 2)]})
+    room_dimensions = {"width": 4, "height": 3, "depth": 4}
+
+    placements = find_free_placements(furniture_set, room_dimensions, 0.5, 1, 0.5, limit=3, near=(1.5, 0))
+    assert math.isclose(placements[0]["position"]["x"], 1.5, abs_tol=0.05)
+    assert math.isclose(placements[0]["position"]["z"], 0, abs_tol=0.05)
+
+    assert find_free_placements(furniture_set, room_dimensions, 1.5, 1, 1.5) == []
+
+
+def test_placements_endpoint(client, auth_headers, db_session):
+    """POST /layouts/current/placements searches the current layout for a catalog item."""
+    db_session.add_all(
+        [
+            CatalogItem(id="stool", name="Stool", type="chair", category="living", width=0.5, height=0.5, depth=0.5),
+            CatalogItem(
+                id="shelf", name="Shelf", type="shelf", category="living", width=1, height=0.3, depth=0.3,
+                mount_type="wall",
+            ),
+        ]
+    )
+    db_session.commit()
+    project_data = {"name": "Studio", "room_width": 4.0, "room_height": 3.0, "room_depth": 4.0}
+    project_id = client.post("/api/v1/projects", json=project_data, headers=auth_headers).json()["id"]
+    url = f"/api/v1/projects/{project_id}/layouts/current/placements"
+
+    # No saved layout yet: the whole room is free
+    response = client.post(url, json={"catalog_item_id": "stool", "limit": 2}, headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()["placements"]) == 2
+
+    client.post(
+        f"/api/v1/projects/{project_id}/layouts",
+        json={"furniture_state": {"furnitures": [_square("table", 0, 0, 2)]}},
+        headers=auth_headers,
+    )
+    response = client.post(
+        url,
+        json={"catalog_item_id": "stool", "rotations": [0], "near": {"x": 0, "z": 0}},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    best = response.json()["placements"][0]
+    assert max(abs(best["position"]["x"]), abs(best["position"]["z"])) >= 1.25
+
+    assert client.post(url, json={"catalog_item_id": "missing"}, headers=auth_headers).status_code == 404
+    assert client.post(url, json={"catalog_item_id": "shelf"}, headers=auth_headers).status_code == 400
+    response = client.post(url, json={"catalog_item_id": "stool", "near": {"x": 1}}, headers=auth_headers)
+    assert response.status_code == 422
+
+
+def _load_benchmark():
+    path = Path(__file__).resolve().parent.parent / "scripts" / "benchmark_collision.py"
+    spec = importlib.util.spec_from_file_location("benchmark_collision", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_benchmark_generators_and_report(tmp_path):
+    """Benchmark layouts are seeded, and a slower run than the baseline fails the gate."""
+    benchmark = _load_benchmark()
+    for generate in benchmark.GENERATORS.values():
+        assert generate(100, seed=3) == generate(100, seed=3)
+        assert len(generate(100, seed=3)[0]["furnitures"]) == 100
+
+    output = tmp_path / "results.json"
+    assert benchmark.main(["--sizes", "10", "--repeat", "1", "--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert {row["scenario"] for row in report["results"]} == set(benchmark.GENERATORS)
+
+    for row in report["results"]:
+        row["best_ms"] /= 100
+    output.write_text(json.dumps(report))
+    assert benchmark.main(["--sizes", "10", "--repeat", "1", "--baseline", str(output)]) == 1
+
+
+def test_catalog_mounts_override_client_mount_types():
+    """Items traced to a catalog item get its mount type; unknown items keep their own."""
+    mounts = CatalogMounts(lambda: {"cabinet": "floor", "wall-tv": "wall"})
+    cabinet = {"id": "cabinet-1700000000000", "mountType": "wall"}
+    pasted = {"id": "wardrobe-1700000000000-0.5", "catalogId": "cabinet", "mount_type": "surface"}
+    custom = {"id": "rug", "mountType": "surface"}
+    state = {"furnitures": [cabinet, pasted, custom, {"id": "wall-tv-1", "mountType": "wall"}]}
+
+    resolved = mounts.resolve_state(state)
+
+    assert [item.get("mountType") for item in resolved["furnitures"]] == ["floor", "floor", "surface", "wall"]
+    assert "mount_type" not in resolved["furnitures"][1]
+    assert resolved["furnitures"][2] is custom and resolved["furnitures"][3] is state["furnitures"][3]
+    assert cabinet["mountType"] == "wall"
+    assert mounts.resolve_state({"furnitures": [custom]})["furnitures"][0] is custom
+
+
+def test_layouts_and_validation_use_catalog_mount_types(client, auth_headers, db_session):
+    """A floor catalog item declared "wall" by the client still collides, and is saved as floor."""
+    db_session.add(CatalogItem(id="cabinet", name="Cabinet", type="wardrobe", category="bedroom", mount_type="floor"))
+    db_session.commit()
+    desk = _square("desk", 0, 0, 1)
+    cabinet = {**_square("cabinet-1700000000000", 0, 0, 1), "mountType": "wall"}
+    cabinet["position"]["y"] = 2.0
+    furniture_state = {"furnitures": [desk, cabinet]}
+    room = {"width": 10, "height": 3, "depth": 10}
+
+    result = client.post("/api/v1/validate", json={"furniture_state": furniture_state, "room_dimensions": room}).json()
+    assert result["collisions"] == [{"id1": "desk", "id2": "cabinet-1700000000000"}]
+
+    project_data = {"name": "Bedroom", "room_width": 10.0, "room_height": 3.0, "room_depth": 10.0}
+    project_id = client.post("/api/v1/projects", json=project_data, headers=auth_headers).json()["id"]
+    saved = client.post(
+        f"/api/v1/projects/{project_id}/layouts",
+        json={"furniture_state": furniture_state},
+        headers=auth_headers,
+    ).json()
+    assert [item.get("mountType") for item in saved["furniture_state"]["furnitures"]] == [None, "floor"]
@@ -0,0 +1,1081 @@
+"""Tests for real-time collaboration Socket.IO handlers."""
+
+import asyncio
+import copy
+
+import pytest
+
+from app.api.v1 import websocket
+from app.core.access_cache import ProjectAccessCache, project_access_cache
+from app.core.catalog_mounts import catalog_mounts
+from app.core.collab_state import InMemoryStateStore, create_client_manager, create_state_store
+from app.core.layout_writer import LayoutWriteBehind
+from app.core.move_broadcast import MoveBroadcaster
+from app.core.presence import PresenceAggregator
+from app.core.rate_limit import EventRateLimiter
+from app.core.room_state import RoomState
+from app.core.timer_wheel import TimerWheel
+from app.core.validation_runner import ValidationRunner
+from app.core.wire import WireEmitter, pack, unpack
+from app.config import settings
+from app.models.catalog_item import CatalogItem
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def emitted(client, monkeypatch):
+    """Capture Socket.IO emits and point handlers at the testing database."""
+    calls = []
+
+    async def fake_emit(event, data=None, room=None, to=None, skip_sid=None, **kwargs):
+        calls.append({"event": event, "data": data, "room": room, "to": to, "skip_sid": skip_sid})
+
+    async def fake_room_call(sid, room, namespace=None):
+        return None
+
+    monkeypatch.setattr(websocket.sio, "emit", fake_emit)
+    monkeypatch.setattr(websocket.sio, "enter_room", fake_room_call)
+    monkeypatch.setattr(websocket.sio, "leave_room", fake_room_call)
+    monkeypatch.setattr(websocket, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(websocket, "state_store", InMemoryStateStore())
+    monkeypatch.setattr(websocket, "wire", WireEmitter(websocket.sio))
+    monkeypatch.setattr(websocket, "move_broadcaster", MoveBroadcaster(websocket.wire, rate_hz=0))
+    monkeypatch.setattr(websocket, "presence_aggregator", PresenceAggregator(websocket.wire, rate_hz=0))
+    monkeypatch.setattr(
+        websocket,
+        "layout_writer",
+        LayoutWriteBehind(websocket._save_room_state, interval=0, on_replaced=websocket._reseed_room),
+    )
+    monkeypatch.setattr(
+        websocket,
+        "validation_runner",
+        ValidationRunner(websocket.validate_layout_offloaded, websocket._publish_collisions),
+    )
+    monkeypatch.setattr(settings, "VALIDATION_POOL_WORKERS", 1)
+    monkeypatch.setattr(websocket, "rate_limiter", EventRateLimiter({}))
+
+    for state in (
+        websocket.socket_users,
+        websocket.socket_rooms,
+        websocket.room_states,
+        project_access_cache,
+    ):
+        state.clear()
+
+    yield calls
+
+    for state in (
+        websocket.socket_users,
+        websocket.socket_rooms,
+        websocket.room_states,
+        project_access_cache,
+    ):
+        state.clear()
+
+
+def events(calls, name):
+    """Return emitted payloads for one event name."""
+    return [call for call in calls if call["event"] == name]
+
+
+def furniture(furniture_id, x, z, width=1.0, depth=1.0):
+    """Build a furniture dict for layout payloads."""
+    return {
+        "id": furniture_id,
+        "position": {"x": x, "y": 0, "z": z},
+        "dimensions": {"width": width, "height": 1, "depth": depth},
+        "rotation": {"x": 0, "y": 0, "z": 0},
+    }
+
+
+@pytest.fixture
+def project_with_layout(client, auth_headers):
+    """Create a project whose current layout has two separated items."""
+    project_data = {"name": "Socket Room", "room_width": 10.0, "room_height": 3.0, "room_depth": 10.0}
+    project_id = client.post("/api/v1/projects", json=project_data, headers=auth_headers).json()["id"]
+
+    furniture_state = {"furnitures": [furniture("desk", 0, 0, width=2), furniture("chair", 3, 0)]}
+    response = client.post(
+        f"/api/v1/projects/{project_id}/layouts",
+        json={"furniture_state": furniture_state},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    return project_id
+
+
+async def join(sid, auth_headers, project_id):
+    """Connect a socket with the test user's token and join the project room."""
+    token = auth_headers["Authorization"].removeprefix("Bearer ")
+    await websocket.connect(sid, {}, {"token": token})
+    await websocket.join_project(sid, {"project_id": project_id})
+
+
+@pytest.mark.asyncio
+async def test_join_seeds_collision_index(emitted, auth_headers, project_with_layout):
+    """The first join seeds the collision index from the current layout."""
+    await join("sid-1", auth_headers, project_with_layout)
+
+    index = websocket.room_states.get(project_with_layout).collision
+    assert len(index) == 2
+    state = events(emitted, "collision_state")
+    assert state[-1]["to"] == "sid-1"
+    assert state[-1]["data"]["valid"] is True
+
+
+@pytest.mark.asyncio
+async def test_move_pushes_collision_state(emitted, auth_headers, project_with_layout):
+    """Moving an item into a neighbour pushes the new collision state to the room."""
+    await join("sid-1", auth_headers, project_with_layout)
+    emitted.clear()
+
+    await websocket.furniture_move(
+        "sid-1",
+        {"project_id": project_with_layout, "furniture_id": "chair", "position": {"x": 0.5, "y": 0, "z": 0}},
+    )
+
+    state = events(emitted, "collision_state")
+    assert len(state) == 1
+    assert state[0]["room"] == f"project_{project_with_layout}"
+    assert state[0]["data"]["collisions"] == [{"id1": "desk", "id2": "chair"}]
+
+    # A move that keeps the same collision state is not re-broadcast
+    emitted.clear()
+    await websocket.furniture_move(
+        "sid-1",
+        {"project_id": project_with_layout, "furniture_id": "chair", "position": {"x": 0.6, "y": 0, "z": 0}},
+    )
+    assert events(emitted, "collision_state") == []
+
+
+@pytest.mark.asyncio
+async def test_malformed_moves_are_dropped(emitted, auth_headers, project_with_layout):
+    """Moves without a numeric x/y/z position or rotation never reach the room state."""
+    await join("sid-1", auth_headers, project_with_layout)
+    state = websocket.room_states.get(project_with_layout)
+    version = state.version
+    chair = copy.deepcopy(state.furnitures["chair"])
+    emitted.clear()
+
+    for pose in (
+        {"position": [0.5, 0, 0]},
+        {"position": "0.5,0,0"},
+        {"position": {"x": "0.5", "y": 0, "z": 0}},
+        {"position": {"x": 0.5, "y": 0}},
+        {"position": {"x": float("nan"), "y": 0, "z": 0}},
+        {"position": {"x": 0.5, "y": 0, "z": 0}, "rotation": [0, 90, 0]},
+        {"position": {"x": 0.5, "y": 0, "z": 0}, "rotation": {"x": 0, "y": None, "z": 0}},
+    ):
+        await websocket.furniture_move("sid-1", {"project_id": project_with_layout, "furniture_id": "chair", **pose})
+
+    await websocket.move_broadcaster.flush(project_with_layout)
+    assert state.version == version
+    assert state.furnitures["chair"] == chair
+    assert emitted == []
+
+
+@pytest.mark.asyncio
+async def test_add_and_delete_update_collision_index(emitted, auth_headers, project_with_layout):
+    """furniture_add and furniture_delete keep the live index in sync."""
+    await join("sid-1", auth_headers, project_with_layout)
+    emitted.clear()
+
+    await websocket.furniture_add(
+        "sid-1", {"project_id": project_with_layout, "furniture": furniture("lamp", 0.2, 0.2, 0.3, 0.3)}
+    )
+    assert events(emitted, "collision_state")[-1]["data"]["collisions"] == [{"id1": "desk", "id2": "lamp"}]
+
+    await websocket.furniture_delete("sid-1", {"project_id": project_with_layout, "furniture_id": "lamp"})
+    assert events(emitted, "collision_state")[-1]["data"]["valid"] is True
+    assert "lamp" not in websocket.room_states.get(project_with_layout).collision
+
+
+@pytest.mark.asyncio
+async def test_added_catalog_items_use_catalog_mount_type(emitted, auth_headers, project_with_layout, db_session):
+    """The live index and collaborators see the catalog's mount type, not the one the client sent."""
+    db_session.add(CatalogItem(id="cabinet", name="Cabinet", type="wardrobe", category="bedroom", mount_type="floor"))
+    db_session.commit()
+    # As the catalog endpoints do after an edit
+    catalog_mounts.refresh()
+    await join("sid-1", auth_headers, project_with_layout)
+    emitted.clear()
+
+    cabinet = {**furniture("cabinet-1700000000000", 0.2, 0.2), "mountType": "wall"}
+    cabinet["position"]["y"] = 2.0
+    await websocket.furniture_add("sid-1", {"project_id": project_with_layout, "furniture": cabinet})
+
+    collisions = events(emitted, "collision_state")[-1]["data"]["collisions"]
+    assert collisions == [{"id1": "desk", "id2": "cabinet-1700000000000"}]
+    assert events(emitted, "furniture_added")[0]["data"]["furniture"]["mountType"] == "floor"
+
+
+@pytest.mark.asyncio
+async def test_last_disconnect_drops_collision_index(emitted, auth_headers, project_with_layout):
+    """The live index is discarded once the room is empty."""
+    await join("sid-1", auth_headers, project_with_layout)
+    await websocket.disconnect("sid-1")
+
+    assert project_with_layout not in websocket.room_states
+
+
+@pytest.mark.asyncio
+async def test_locks_and_members_go_through_state_store(emitted, auth_headers, project_with_layout):
+    """Locks and room membership live in the shared store and are cleaned up on disconnect."""
+    await join("sid-1", auth_headers, project_with_layout)
+    await join("sid-2", auth_headers, project_with_layout)
+    store = websocket.state_store
+
+    assert [member["sid"] for member in await store.get_members(project_with_layout)] == ["sid-1", "sid-2"]
+
+    await websocket.request_lock("sid-1", {"project_id": project_with_layout, "furniture_id": "desk"})
+    await websocket.request_lock("sid-2", {"project_id": project_with_layout, "furniture_id": "desk"})
+    assert [event["data"]["sid"] for event in events(emitted, "object_locked")] == ["sid-1"]
+    assert events(emitted, "lock_rejected")[0]["to"] == "sid-2"
+
+    # Only the holder can release
+    await websocket.release_lock("sid-2", {"project_id": project_with_layout, "furniture_id": "desk"})
+    assert (await store.get_locks(project_with_layout))["desk"]["sid"] == "sid-1"
+
+    await websocket.disconnect("sid-1")
+    assert await store.get_locks(project_with_layout) == {}
+    assert events(emitted, "object_unlocked")[-1]["data"] == {"furniture_id": "desk"}
+    assert await store.member_projects("sid-1") == []
+    assert [member["sid"] for member in await store.get_members(project_with_layout)] == ["sid-2"]
+
+
+def test_state_store_and_client_manager_factories():
+    """Without a message queue the server runs single-process with in-memory state."""
+    assert isinstance(create_state_store(""), InMemoryStateStore)
+    assert isinstance(create_state_store("memory://"), InMemoryStateStore)
+    assert create_client_manager("") is None
+
+    with pytest.raises(ValueError):
+        create_state_store("kafka://localhost:9092")
+    with pytest.raises(ValueError):
+        create_client_manager("kafka://localhost:9092")
+
+
+def _move(project_id, furniture_id, x):
+    return {"project_id": project_id, "furniture_id": furniture_id, "position": {"x": x, "y": 0, "z": 0}}
+
+
+@pytest.mark.asyncio
+async def test_moves_are_coalesced_into_frames(emitted, auth_headers, project_with_layout):
+    """Moves within a tick go out as one frame with the latest pose per item, never echoed to the sender."""
+    await join("sid-1", auth_headers, project_with_layout)
+    await join("sid-2", auth_headers, project_with_layout)
+    # A slow tick so frames only go out when flushed
+    websocket.move_broadcaster = MoveBroadcaster(websocket.wire, rate_hz=1)
+    emitted.clear()
+
+    for x in (4.0, 4.5, 5.0):
+        await websocket.furniture_move("sid-1", _move(project_with_layout, "chair", x))
+    assert events(emitted, "furniture_updates") == []
+
+    await websocket.move_broadcaster.flush(project_with_layout)
+    frames = events(emitted, "furniture_updates")
+    assert len(frames) == 1
+    assert frames[0]["room"] == f"project_{project_with_layout}"
+    assert frames[0]["skip_sid"] == ["sid-1"]
+    assert frames[0]["data"]["updates"] == [
+        {"furniture_id": "chair", "position": {"x": 5.0, "y": 0, "z": 0}, "rotation": None}
+    ]
+
+    # Two senders: the room frame skips both, and each gets the other's moves
+    emitted.clear()
+    await websocket.furniture_move("sid-1", _move(project_with_layout, "chair", 4.0))
+    await websocket.furniture_move("sid-2", _move(project_with_layout, "desk", -2.0))
+    await websocket.move_broadcaster.flush(project_with_layout)
+    frames = events(emitted, "furniture_updates")
+    assert frames[0]["skip_sid"] == ["sid-1", "sid-2"]
+    assert {frame["to"]: [update["furniture_id"] for update in frame["data"]["updates"]] for frame in frames[1:]} == {
+        "sid-1": ["desk"],
+        "sid-2": ["chair"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_move_frames_flush_on_tick_and_skip_deleted_items(emitted, auth_headers, project_with_layout):
+    """A queued frame is sent after one tick; moves of deleted items are dropped."""
+    await join("sid-1", auth_headers, project_with_layout)
+    websocket.move_broadcaster = MoveBroadcaster(websocket.wire, rate_hz=100)
+    emitted.clear()
+
+    await websocket.furniture_move("sid-1", _move(project_with_layout, "chair", 4.0))
+    await websocket.furniture_move("sid-1", _move(project_with_layout, "desk", -2.0))
+    await websocket.furniture_delete("sid-1", {"project_id": project_with_layout, "furniture_id": "desk"})
+    await asyncio.sleep(0.05)
+
+    frames = events(emitted, "furniture_updates")
+    assert [[update["furniture_id"] for update in frame["data"]["updates"]] for frame in frames] == [["chair"]]
+    assert websocket.move_broadcaster.moves_received == 2
+    assert websocket.move_broadcaster.frames_sent == 1
+
+
+def _cursor(project_id, x):
+    return {"project_id": project_id, "cursor_position": [x, 0, 0]}
+
+
+@pytest.mark.asyncio
+async def test_presence_is_batched_into_snapshots(emitted, auth_headers, project_with_layout):
+    """Cursors within a tick go out as one snapshot; unchanged cursors are dropped."""
+    await join("sid-1", auth_headers, project_with_layout)
+    await join("sid-2", auth_headers, project_with_layout)
+    websocket.presence_aggregator = PresenceAggregator(websocket.wire, rate_hz=1)
+    emitted.clear()
+
+    await websocket.update_presence("sid-1", _cursor(project_with_layout, 1.0))
+    await websocket.update_presence("sid-1", _cursor(project_with_layout, 2.0))
+    await websocket.update_presence("sid-2", _cursor(project_with_layout, 3.0))
+    assert events(emitted, "presence_snapshot") == []
+
+    await websocket.presence_aggregator.flush(project_with_layout)
+    snapshots = events(emitted, "presence_snapshot")
+    assert len(snapshots) == 1
+    assert snapshots[0]["room"] == f"project_{project_with_layout}"
+    cursors = snapshots[0]["data"]["cursors"]
+    assert [(cursor["sid"], cursor["cursorPosition"]) for cursor in cursors] == [
+        ("sid-1", [2.0, 0, 0]),
+        ("sid-2", [3.0, 0, 0]),
+    ]
+    assert cursors[0]["color"] == websocket.socket_users["sid-1"]["color"]
+    assert cursors[0]["nickname"] == websocket.socket_users["sid-1"]["nickname"]
+
+    # sid-2 did not move, so only sid-1 is in the next snapshot
+    emitted.clear()
+    await websocket.update_presence("sid-1", _cursor(project_with_layout, 4.0))
+    await websocket.update_presence("sid-2", _cursor(project_with_layout, 3.0))
+    await websocket.presence_aggregator.flush(project_with_layout)
+    snapshots = events(emitted, "presence_snapshot")
+    assert [cursor["sid"] for cursor in snapshots[0]["data"]["cursors"]] == ["sid-1"]
+
+    # Nothing changed at all: no snapshot
+    emitted.clear()
+    await websocket.update_presence("sid-1", _cursor(project_with_layout, 4.0))
+    await websocket.presence_aggregator.flush(project_with_layout)
+    assert events(emitted, "presence_snapshot") == []
+    assert websocket.presence_aggregator.updates_received == 6
+    assert websocket.presence_aggregator.snapshots_sent == 2
+
+
+@pytest.mark.asyncio
+async def test_presence_forgets_disconnected_cursors(emitted, auth_headers, project_with_layout):
+    """A disconnected socket's cursor is not sent, and a reconnect is treated as new."""
+    await join("sid-1", auth_headers, project_with_layout)
+    await join("sid-2", auth_headers, project_with_layout)
+    websocket.presence_aggregator = PresenceAggregator(websocket.wire, rate_hz=1)
+
+    await websocket.update_presence("sid-2", _cursor(project_with_layout, 1.0))
+    await websocket.disconnect("sid-2")
+    await websocket.presence_aggregator.flush(project_with_layout)
+    assert events(emitted, "presence_snapshot") == []
+
+    await websocket.disconnect("sid-1")
+    assert websocket.presence_aggregator._tasks == {}
+
+
+@pytest.mark.asyncio
+async def test_msgpack_clients_get_binary_events(emitted, auth_headers, project_with_layout):
+    """MessagePack sockets get packed float32 payloads while JSON sockets are unchanged."""
+    token = auth_headers["Authorization"].removeprefix("Bearer ")
+    await join("sid-json", auth_headers, project_with_layout)
+    await websocket.connect("sid-bin", {}, {"token": token, "encoding": "msgpack"})
+    await websocket.join_project("sid-bin", pack({"project_id": project_with_layout}))
+
+    current_users = [call for call in events(emitted, "current_users") if call["to"] == "sid-bin"]
+    assert isinstance(current_users[0]["data"], bytes)
+    assert [user["sid"] for user in unpack(current_users[0]["data"])["users"]] == ["sid-json", "sid-bin"]
+
+    emitted.clear()
+    await websocket.furniture_move("sid-json", _move(project_with_layout, "chair", 4.1))
+    frames = events(emitted, "furniture_updates")
+    room = f"project_{project_with_layout}"
+    assert [frame["room"] for frame in frames] == [room, f"{room}:msgpack"]
+    assert frames[0]["data"]["updates"][0]["position"]["x"] == 4.1
+    x = unpack(frames[1]["data"])["updates"][0]["position"]["x"]
+    assert x != 4.1 and x == pytest.approx(4.1, abs=1e-6)
+
+    # Binary clients may send packed events; malformed ones are dropped
+    emitted.clear()
+    await websocket.furniture_move("sid-bin", pack(_move(project_with_layout, "desk", -2.0)))
+    await websocket.furniture_move("sid-bin", b"\xc1")
+    assert [update["furniture_id"] for update in events(emitted, "furniture_updates")[0]["data"]["updates"]] == ["desk"]
+
+    # Once the last binary socket leaves, broadcasts go out in JSON only
+    await websocket.disconnect("sid-bin")
+    emitted.clear()
+    await websocket.furniture_move("sid-json", _move(project_with_layout, "chair", 4.2))
+    assert [frame["room"] for frame in events(emitted, "furniture_updates")] == [room]
+
+
+class _LookupOnly(dict):
+    """Store index that records the keys looked up in it and fails if it is scanned."""
+
+    def __init__(self, entries):
+        super().__init__(entries)
+        self.looked_up = set()
+
+    def _scan(self, *args):
+        raise AssertionError("disconnect scanned a whole store index")
+
+    __iter__ = keys = values = items = _scan
+
+    def __contains__(self, key):
+        self.looked_up.add(key)
+        return super().__contains__(key)
+
+    def __getitem__(self, key):
+        self.looked_up.add(key)
+        return super().__getitem__(key)
+
+    def __delitem__(self, key):
+        self.looked_up.add(key)
+        super().__delitem__(key)
+
+    def get(self, key, default=None):
+        self.looked_up.add(key)
+        return super().get(key, default)
+
+    def pop(self, key, *default):
+        self.looked_up.add(key)
+        return super().pop(key, *default)
+
+    def setdefault(self, key, default=None):
+        self.looked_up.add(key)
+        return super().setdefault(key, default)
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cleanup_touches_only_the_sockets_entries(emitted):
+    """With thousands of busy rooms, a disconnect only looks at the rooms and locks the socket owned."""
+    store = websocket.state_store
+    for project_id in range(1, 3001):
+        for sid in (f"other-{project_id}-a", f"other-{project_id}-b"):
+            await store.add_member(project_id, sid, {"sid": sid})
+        await store.acquire_lock(project_id, "sofa", f"other-{project_id}-a", "2")
+
+    for project_id in (10, 1500, 2999):
+        await store.add_member(project_id, "sid-1", {"sid": "sid-1"})
+        await store.acquire_lock(project_id, "lamp", "sid-1", "1")
+    await store.release_lock(1500, "lamp", "sid-1")
+    websocket.socket_rooms["sid-1"] = {10, 1500, 2999}
+    store.rooms, store.locks = _LookupOnly(store.rooms), _LookupOnly(store.locks)
+    store._socket_rooms, store._socket_locks = _LookupOnly(store._socket_rooms), _LookupOnly(store._socket_locks)
+
+    await websocket.disconnect("sid-1")
+
+    # Only the socket's own rooms were looked up, none of the other 2997
+    assert store.rooms.looked_up == {10, 1500, 2999}
+    assert store.locks.looked_up == {10, 2999}
+    assert store._socket_rooms.looked_up == store._socket_locks.looked_up == {"sid-1"}
+    assert sorted(call["room"] for call in events(emitted, "user_left")) == ["project_10", "project_1500", "project_2999"]
+    assert sorted(call["room"] for call in events(emitted, "object_unlocked")) == ["project_10", "project_2999"]
+    assert await store.member_projects("sid-1") == []
+    assert await store.release_socket_locks("sid-1") == []
+    assert len(await store.get_members(10)) == 2
+    assert list(await store.get_locks(10)) == ["sofa"]
+
+
+@pytest.mark.asyncio
+async def test_last_leave_does_not_close_room_under_a_join(emitted, auth_headers, project_with_layout, monkeypatch):
+    """A join that already holds the room state keeps it open while the last member leaves."""
+    await join("sid-1", auth_headers, project_with_layout)
+    await websocket.furniture_move("sid-1", _move(project_with_layout, "chair", 5.0))
+    entering = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_enter_room(sid, room, namespace=None):
+        entering.set()
+        await release.wait()
+
+    monkeypatch.setattr(websocket.sio, "enter_room", slow_enter_room)
+    token = auth_headers["Authorization"].removeprefix("Bearer ")
+    await websocket.connect("sid-2", {}, {"token": token})
+    joining = asyncio.create_task(websocket.join_project("sid-2", {"project_id": project_with_layout}))
+    await entering.wait()
+
+    await websocket.disconnect("sid-1")
+    assert project_with_layout in websocket.room_states
+
+    release.set()
+    await joining
+    state = websocket.room_states.get(project_with_layout)
+    assert state.furnitures["chair"]["position"]["x"] == 5.0
+    await websocket.furniture_move("sid-2", _move(project_with_layout, "chair", 7.0))
+    assert websocket.room_states.get(project_with_layout) is state
+    assert state.furnitures["chair"]["position"]["x"] == 7.0
+
+
+@pytest.mark.asyncio
+async def test_failed_join_closes_the_room_it_kept_open(emitted, auth_headers, project_with_layout, monkeypatch):
+    """If the pinning join never becomes a member, it closes the room the leave skipped."""
+    await join("sid-1", auth_headers, project_with_layout)
+    entering = asyncio.Event()
+    release = asyncio.Event()
+
+    async def failing_enter_room(sid, room, namespace=None):
+        entering.set()
+        await release.wait()
+        raise ConnectionError("socket went away")
+
+    monkeypatch.setattr(websocket.sio, "enter_room", failing_enter_room)
+    token = auth_headers["Authorization"].removeprefix("Bearer ")
+    await websocket.connect("sid-2", {}, {"token": token})
+    joining = asyncio.create_task(websocket.join_project("sid-2", {"project_id": project_with_layout}))
+    await entering.wait()
+    await websocket.disconnect("sid-1")
+
+    release.set()
+    with pytest.raises(ConnectionError):
+        await joining
+    assert project_with_layout not in websocket.room_states
+    assert websocket._joining == {}
+
+
+@pytest.mark.asyncio
+async def test_join_sends_live_room_snapshot(emitted, auth_headers, project_with_layout):
+    """Late joiners get the live state, including edits not yet saved, in one room_snapshot."""
+    await join("sid-1", auth_headers, project_with_layout)
+    first = events(emitted, "room_snapshot")[0]
+    assert first["to"] == "sid-1"
+    assert [item["id"] for item in first["data"]["furniture_state"]["furnitures"]] == ["desk", "chair"]
+
+    await websocket.furniture_add("sid-1", {"project_id": project_with_layout, "furniture": furniture("lamp", 8, 8)})
+    await websocket.furniture_move("sid-1", _move(project_with_layout, "chair", 5.0))
+    await websocket.furniture_delete("sid-1", {"project_id": project_with_layout, "furniture_id": "desk"})
+    emitted.clear()
+
+    await join("sid-2", auth_headers, project_with_layout)
+    snapshot = events(emitted, "room_snapshot")[0]["data"]
+    assert snapshot["version"] == 3
+    furnitures = {item["id"]: item for item in snapshot["furniture_state"]["furnitures"]}
+    assert list(furnitures) == ["chair", "lamp"]
+    assert furnitures["chair"]["position"] == {"x": 5.0, "y": 0, "z": 0}
+
+    # The snapshot is a copy; later edits do not change what was sent
+    await websocket.furniture_move("sid-1", _move(project_with_layout, "chair", 6.0))
+    assert furnitures["chair"]["position"]["x"] == 5.0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_joins_load_room_once(emitted, auth_headers, project_with_layout, monkeypatch):
+    """Joins racing on an unloaded room share one database load."""
+    loads = []
+    build_room_state = websocket._build_room_state
+
+    def counting_build(db, project_id):
+        loads.append(project_id)
+        return build_room_state(db, project_id)
+
+    monkeypatch.setattr(websocket, "_build_room_state", counting_build)
+    await asyncio.gather(*(join(f"sid-{i}", auth_headers, project_with_layout) for i in range(5)))
+
+    assert loads == [project_with_layout]
+    assert len(events(emitted, "room_snapshot")) == 5
+
+
+def _second_user_headers(client):
+    user_data = {"email": "guest@example.com", "password": "guestpassword123", "full_name": "Guest User"}
+    assert client.post("/api/v1/auth/register", json=user_data).status_code == 201
+    response = client.post("/api/v1/auth/login", data={"username": user_data["email"], "password": user_data["password"]})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_repeat_joins_reuse_cached_access_check(emitted, auth_headers, project_with_layout, monkeypatch):
+    """Rejoining within the TTL skips the database access check."""
+    checks = []
+    has_project_access = websocket._has_project_access
+
+    def counting_check(db, user_id, project_id):
+        checks.append((user_id, project_id))
+        return has_project_access(db, user_id, project_id)
+
+    monkeypatch.setattr(websocket, "_has_project_access", counting_check)
+    for i in range(3):
+        await join(f"sid-{i}", auth_headers, project_with_layout)
+
+    assert len(checks) == 1
+    assert project_access_cache.hits == 2
+    assert len(events(emitted, "room_snapshot")) == 3
+
+
+@pytest.mark.asyncio
+async def test_sharing_change_invalidates_cached_denial(emitted, client, auth_headers, project_with_layout):
+    """A cached denial is dropped as soon as the owner shares the project."""
+    guest_headers = _second_user_headers(client)
+
+    await join("guest", guest_headers, project_with_layout)
+    assert events(emitted, "join_error")[-1]["to"] == "guest"
+    assert len(project_access_cache) == 1
+
+    response = client.post(f"/api/v1/projects/{project_with_layout}/share?share=true", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(project_access_cache) == 0
+
+    emitted.clear()
+    await websocket.join_project("guest", {"project_id": project_with_layout})
+    assert events(emitted, "join_error") == []
+    assert events(emitted, "room_snapshot")[0]["to"] == "guest"
+
+
+@pytest.mark.asyncio
+async def test_missing_project_is_not_cached(emitted, auth_headers):
+    """Joining a project that does not exist is refused without caching a decision."""
+    await join("sid-1", auth_headers, 9999)
+
+    assert events(emitted, "join_error")[0]["to"] == "sid-1"
+    assert len(project_access_cache) == 0
+
+
+def test_access_cache_expires_and_evicts():
+    """Decisions expire after the TTL and expired entries are evicted on insert."""
+    now = [0.0]
+    cache = ProjectAccessCache(ttl=10, clock=lambda: now[0])
+    cache.put(1, 1, True)
+    now[0] = 5
+    cache.put(2, 1, False)
+    assert cache.get(1, 1) is True
+    assert cache.get(2, 1) is False
+
+    now[0] = 12
+    assert cache.get(1, 1) is None
+    cache.put(3, 2, True)
+    assert len(cache) == 2
+
+    cache.invalidate_project(1)
+    assert cache.get(2, 1) is None
+    assert cache.get(3, 2) is True
+
+
+def _saved_layouts(client, auth_headers, project_id):
+    return client.get(f"/api/v1/projects/{project_id}/layouts", headers=auth_headers).json()
+
+
+@pytest.mark.asyncio
+async def test_live_edits_are_saved_as_one_write(emitted, client, auth_headers, project_with_layout):
+    """Edits from every collaborator within an interval become one in-place save of the current layout."""
+    versions = len(_saved_layouts(client, auth_headers, project_with_layout))
+    await join("sid-1", auth_headers, project_with_layout)
+    await join("sid-2", auth_headers, project_with_layout)
+    websocket.layout_writer = LayoutWriteBehind(websocket._save_room_state, interval=60)
+
+    await websocket.furniture_move("sid-1", _move(project_with_layout, "chair", 5.0))
+    await websocket.furniture_add("sid-2", {"project_id": project_with_layout, "furniture": furniture("lamp", 8, 8)})
+    await websocket.furniture_delete("sid-2", {"project_id": project_with_layout, "furniture_id": "desk"})
+    assert websocket.layout_writer.saves == 0
+
+    await websocket.layout_writer.flush(project_with_layout)
+    await websocket.layout_writer.flush(project_with_layout)
+    assert websocket.layout_writer.saves == 1
+
+    layouts = _saved_layouts(client, auth_headers, project_with_layout)
+    assert len(layouts) == versions
+    current = next(layout for layout in layouts if layout["is_current"])
+    saved = {item["id"]: item for item in current["furniture_state"]["furnitures"]}
+    assert list(saved) == ["chair", "lamp"]
+    assert saved["chair"]["position"]["x"] == 5.0
+
+
+@pytest.mark.asyncio
+async def test_resize_is_shared_checked_and_saved(emitted, client, auth_headers, project_with_layout):
+    """furniture_resize reaches collaborators, the collision index, the op log and the saved layout."""
+    await join("sid-1", auth_headers, project_with_layout)
+    websocket.layout_writer = LayoutWriteBehind(websocket._save_room_state, interval=60)
+    state = websocket.room_states.get(project_with_layout)
+    seq = state.version
+    emitted.clear()
+
+    for dimensions in ({"width": 0, "height": 1, "depth": 1}, {"width": "5", "height": 1, "depth": 1}, [5, 1, 1]):
+        await websocket.furniture_resize(
+            "sid-1", {"project_id": project_with_layout, "furniture_id": "chair", "dimensions": dimensions}
+        )
+    assert emitted == [] and state.version == seq
+
+    dimensions = {"width": 5.0, "height": 1.0, "depth": 1.0}
+    await websocket.furniture_resize(
+        "sid-1", {"project_id": project_with_layout, "furniture_id": "chair", "dimensions": dimensions}
+    )
+
+    resized = events(emitted, "furniture_resized")
+    assert resized[0]["data"] == {"furniture_id": "chair", "dimensions": dimensions, "seq": seq + 1}
+    assert resized[0]["skip_sid"] == "sid-1"
+    assert events(emitted, "collision_state")[-1]["data"]["collisions"] == [{"id1": "desk", "id2": "chair"}]
+    assert state.ops_since(seq) == [
+        {"seq": seq + 1, "event": "furniture_resized", "data": {"furniture_id": "chair", "dimensions": dimensions}}
+    ]
+
+    await websocket.layout_writer.flush(project_with_layout)
+    layouts = _saved_layouts(client, auth_headers, project_with_layout)
+    current = next(layout for layout in layouts if layout["is_current"])
+    saved = {item["id"]: item for item in current["furniture_state"]["furnitures"]}
+    assert saved["chair"]["dimensions"] == dimensions
+
+
+@pytest.mark.asyncio
+async def test_last_leave_saves_room(emitted, client, auth_headers, project_with_layout):
+    """The room is saved when its last member leaves, and the next join loads the saved state."""
+    await join("sid-1", auth_headers, project_with_layout)
+    websocket.layout_writer = LayoutWriteBehind(websocket._save_room_state, interval=60)
+    await websocket.furniture_move("sid-1", _move(project_with_layout, "chair", 6.0))
+
+    await websocket.disconnect("sid-1")
+    assert project_with_layout not in websocket.room_states
+    assert websocket.layout_writer._tasks == {}
+
+    emitted.clear()
+    await join("sid-2", auth_headers, project_with_layout)
+    snapshot = events(emitted, "room_snapshot")[0]["data"]
+    chair = next(item for item in snapshot["furniture_state"]["furnitures"] if item["id"] == "chair")
+    assert chair["position"]["x"] == 6.0
+
+
+@pytest.mark.asyncio
+async def test_multi_worker_rooms_keep_no_live_state(emitted, client, auth_headers, project_with_layout, monkeypatch):
+    """With several workers each would hold its own room copy, so none is kept or saved and clients autosave."""
+    monkeypatch.setattr(settings, "SOCKETIO_MESSAGE_QUEUE", "redis://localhost:6379/0")
+    before = _saved_layouts(client, auth_headers, project_with_layout)
+    await join("sid-1", auth_headers, project_with_layout)
+    await join("sid-2", auth_headers, project_with_layout)
+
+    await websocket.furniture_move("sid-1", _move(project_with_layout, "chair", 5.0))
+    await websocket.furniture_delete("sid-1", {"project_id": project_with_layout, "furniture_id": "desk"})
+    await websocket.disconnect("sid-1")
+    await websocket.disconnect("sid-2")
+
+    assert project_with_layout not in websocket.room_states
+    assert not events(emitted, "room_snapshot") and not events(emitted, "collision_state")
+    assert events(emitted, "furniture_updates") and events(emitted, "furniture_deleted")
+    assert websocket.layout_writer.saves == 0
+    assert _saved_layouts(client, auth_headers, project_with_layout) == before
+
+
+@pytest.mark.asyncio
+async def test_restore_reseeds_room_and_keeps_history(emitted, client, auth_headers, project_with_layout):
+    """A REST restore replaces the live room, and later live saves never rewrite the restored version."""
+    await join("sid-1", auth_headers, project_with_layout)
+    await websocket.furniture_move("sid-1", _move(project_with_layout, "chair", 5.0))
+    first = min(_saved_layouts(client, auth_headers, project_with_layout), key=lambda layout: layout["version"])
+    emitted.clear()
+
+    response = client.post(f"/api/v1/projects/{project_with_layout}/layouts/{first['id']}/restore", headers=auth_headers)
+    assert response.status_code == 200
+    await asyncio.sleep(0)
+    await asyncio.gather(*websocket._background_tasks)
+
+    snapshot = events(emitted, "room_snapshot")[0]
+    assert snapshot["room"] == f"project_{project_with_layout}"
+    assert snapshot["data"]["furniture_state"]["furnitures"] == []
+    assert websocket.room_states.get(project_with_layout).layout_id == first["id"]
+
+    await websocket.furniture_add("sid-1", {"project_id": project_with_layout, "furniture": furniture("lamp", 8, 8)})
+    layouts = {layout["version"]: layout for layout in _saved_layouts(client, auth_headers, project_with_layout)}
+    assert layouts[1]["furniture_state"]["furnitures"] == []
+    assert [item["position"]["x"] for item in layouts[2]["furniture_state"]["furnitures"]] == [0, 5.0]
+    assert layouts[3]["is_current"] is True
+    assert [item["id"] for item in layouts[3]["furniture_state"]["furnitures"]] == ["lamp"]
+
+
+@pytest.mark.asyncio
+async def test_live_save_never_lands_on_a_replaced_layout(emitted, client, auth_headers, project_with_layout):
+    """Edits pending when another layout became current are dropped and the room reloads it."""
+    await join("sid-1", auth_headers, project_with_layout)
+    websocket.layout_writer = LayoutWriteBehind(websocket._save_room_state, interval=60, on_replaced=websocket._reseed_room)
+    await websocket.furniture_move("sid-1", _move(project_with_layout, "chair", 5.0))
+
+    # Saved without going through the REST hook, so only the writer can notice
+    db = TestingSessionLocal()
+    try:
+        project = db.query(websocket.Project).get(project_with_layout)
+        layout = websocket.Layout(
+            project_id=project_with_layout,
+            version=3,
+            furniture_state={"furnitures": [furniture("sofa", 2, 2)]},
+            is_current=True,
+        )
+        db.query(websocket.Layout).filter(websocket.Layout.project_id == project.id).update({"is_current": False})
+        db.add(layout)
+        db.commit()
+    finally:
+        db.close()
+    emitted.clear()
+
+    await websocket.layout_writer.flush(project_with_layout)
+
+    assert websocket.layout_writer.saves == 0
+    assert list(websocket.room_states.get(project_with_layout).furnitures) == ["sofa"]
+    assert events(emitted, "room_snapshot")[0]["room"] == f"project_{project_with_layout}"
+    current = next(layout for layout in _saved_layouts(client, auth_headers, project_with_layout) if layout["is_current"])
+    assert [item["id"] for item in current["furniture_state"]["furnitures"]] == ["sofa"]
+
+
+def test_timer_wheel_expires_only_due_leases():
+    """Leases expire at their deadline; renewed and far-off leases survive wheel turns."""
+    wheel = TimerWheel(tick=1.0, slots=4)
+    wheel.schedule("a", 2.5)
+    wheel.schedule("b", 3.0)
+    wheel.schedule("c", 9.0)
+    wheel.schedule("d", 1.0)
+    wheel.cancel("d")
+
+    assert wheel.advance(2.0) == []
+    wheel.schedule("b", 6.0)
+    assert wheel.advance(3.0) == ["a"]
+    assert wheel.advance(5.9) == []
+    assert wheel.advance(6.0) == ["b"]
+    # A jump of several turns still finds the lease that was slotted a turn ahead
+    assert wheel.advance(30.0) == ["c"]
+    assert len(wheel) == 0
+
+
+@pytest.mark.asyncio
+async def test_lock_leases_expire_unless_renewed(emitted, auth_headers, project_with_layout, monkeypatch):
+    """Unrenewed locks expire in bulk with one objects_unlocked event per room; moves and heartbeats renew."""
+    now = [0.0]
+    store = InMemoryStateStore(clock=lambda: now[0])
+    monkeypatch.setattr(websocket, "state_store", store)
+    monkeypatch.setattr(websocket.settings, "COLLAB_LOCK_TTL", 30.0)
+    await join("sid-1", auth_headers, project_with_layout)
+    await join("sid-2", auth_headers, project_with_layout)
+
+    def lock(furniture_id):
+        return {"project_id": project_with_layout, "furniture_id": furniture_id}
+
+    await websocket.request_lock("sid-1", lock("desk"))
+    await websocket.request_lock("sid-1", lock("chair"))
+    await websocket.request_lock("sid-2", lock("lamp"))
+
+    now[0] = 20.0
+    await websocket.furniture_move("sid-1", _move(project_with_layout, "chair", 4.0))
+    await websocket.lock_heartbeat("sid-2", lock("lamp"))
+    # Heartbeats for locks held by someone else do nothing
+    await websocket.lock_heartbeat("sid-2", lock("desk"))
+
+    now[0] = 31.0
+    await websocket.expire_locks()
+    unlocked = events(emitted, "objects_unlocked")
+    assert [(call["room"], call["data"]) for call in unlocked] == [
+        (f"project_{project_with_layout}", {"furniture_ids": ["desk"]})
+    ]
+
+    emitted.clear()
+    now[0] = 51.0
+    await websocket.expire_locks()
+    unlocked = events(emitted, "objects_unlocked")
+    assert len(unlocked) == 1
+    assert sorted(unlocked[0]["data"]["furniture_ids"]) == ["chair", "lamp"]
+    assert await store.get_locks(project_with_layout) == {}
+    assert await store.release_socket_locks("sid-1") == []
+
+
+def _validate_request(pid, furniture_state):
+    return {
+        "project_id": pid,
+        "furniture_state": furniture_state,
+        "room_dimensions": {"width": 10, "height": 3, "depth": 10},
+    }
+
+
+@pytest.mark.asyncio
+async def test_validation_keeps_only_latest_queued_state(emitted, auth_headers, project_with_layout, monkeypatch):
+    """Requests queued behind a running validation collapse into the newest one."""
+    await join("sid-1", auth_headers, project_with_layout)
+    emitted.clear()
+    started = asyncio.Event()
+    release = asyncio.Event()
+    validated = []
+
+    async def slow_validate(furniture_state, room_dimensions, room_structure):
+        validated.append(furniture_state["tag"])
+        started.set()
+        await release.wait()
+        return {"valid": False, "collisions": [{"id1": "desk", "id2": furniture_state["tag"]}], "out_of_bounds": []}
+
+    runner = ValidationRunner(slow_validate, websocket._publish_collisions)
+    monkeypatch.setattr(websocket, "validation_runner", runner)
+
+    def request(tag):
+        payload = _validate_request(project_with_layout, {"tag": tag})
+        return asyncio.create_task(websocket.validate_furniture("sid-1", payload))
+
+    # The first request is running before the others are queued behind it
+    requests = [request("first")]
+    await started.wait()
+    requests += [request("stale"), request("latest")]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*requests)
+
+    assert validated == ["first", "latest"]
+    assert runner.superseded == 1
+    results = [call["data"]["collisions"][0]["id2"] for call in events(emitted, "validation_result")]
+    assert results == ["first", "latest", "latest"]
+    # Only the state nothing was queued behind is broadcast
+    detected = events(emitted, "collision_detected")
+    assert [call["data"]["collisions"][0]["id2"] for call in detected] == ["latest"]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_validation_result_is_broadcast_once(emitted, auth_headers, project_with_layout):
+    """Revalidating the same colliding state answers the requester without another broadcast."""
+    await join("sid-1", auth_headers, project_with_layout)
+    emitted.clear()
+    overlapping = {"furnitures": [furniture("desk", 0, 0, width=2), furniture("chair", 0.5, 0)]}
+
+    for _ in range(3):
+        await websocket.validate_furniture("sid-1", _validate_request(project_with_layout, overlapping))
+
+    results = events(emitted, "validation_result")
+    assert len(results) == 3
+    assert results[0]["data"]["collisions"] == [{"id1": "desk", "id2": "chair"}]
+    assert len(events(emitted, "collision_detected")) == 1
+    assert websocket.validation_runner.runs == 3
+
+
+def test_token_buckets_refill_per_socket_and_event():
+    """Each socket gets its own burst, refilled at the configured rate."""
+    now = [0.0]
+    limiter = EventRateLimiter({"furniture_move": (2, 3), "validate_furniture": (0, 1)}, clock=lambda: now[0])
+
+    assert [limiter.allow("sid-1", "furniture_move") for _ in range(4)] == [True, True, True, False]
+    assert limiter.allow("sid-2", "furniture_move") is True
+    assert limiter.retry_after("sid-1", "furniture_move") == pytest.approx(0.5)
+
+    now[0] = 0.5
+    assert limiter.allow("sid-1", "furniture_move") is True
+    assert limiter.allow("sid-1", "furniture_move") is False
+    # A rate of 0 leaves the event unlimited
+    assert all(limiter.allow("sid-1", "validate_furniture") for _ in range(10))
+
+    limiter.forget("sid-1")
+    assert limiter.allow("sid-1", "furniture_move") is True
+
+
+@pytest.mark.asyncio
+async def test_flooded_validation_is_dropped_with_notice(emitted, auth_headers, project_with_layout, monkeypatch):
+    """Requests over the socket's budget are dropped, counted and announced once."""
+    limiter = EventRateLimiter({"validate_furniture": (0.001, 2)})
+    monkeypatch.setattr(websocket, "rate_limiter", limiter)
+    await join("sid-1", auth_headers, project_with_layout)
+    emitted.clear()
+
+    layout = {"furnitures": [furniture("desk", 0, 0)]}
+    for _ in range(5):
+        await websocket.validate_furniture("sid-1", _validate_request(project_with_layout, layout))
+
+    assert len(events(emitted, "validation_result")) == 2
+    assert limiter.dropped == {"validate_furniture": 3}
+    notices = events(emitted, "rate_limited")
+    assert len(notices) == 1
+    assert notices[0]["to"] == "sid-1"
+    assert notices[0]["data"]["event"] == "validate_furniture"
+    assert notices[0]["data"]["coalesced"] is False
+
+
+@pytest.mark.asyncio
+async def test_flooded_moves_are_coalesced_to_the_latest(emitted, auth_headers, project_with_layout, monkeypatch):
+    """Moves over budget are not lost: the newest one per item is applied once a token frees up."""
+    limiter = EventRateLimiter({"furniture_move": (50, 1)})
+    monkeypatch.setattr(websocket, "rate_limiter", limiter)
+    await join("sid-1", auth_headers, project_with_layout)
+    await join("sid-2", auth_headers, project_with_layout)
+    emitted.clear()
+
+    for x in (5.0, 6.0, 7.0, 8.0):
+        await websocket.furniture_move("sid-1", _move(project_with_layout, "chair", x))
+
+    state = websocket.room_states.get(project_with_layout)
+    assert state.furnitures["chair"]["position"]["x"] == 5.0
+    assert limiter.coalesced == {"furniture_move": 2}
+
+    await asyncio.sleep(0.1)
+    assert state.furnitures["chair"]["position"]["x"] == 8.0
+    frames = [call["data"]["updates"] for call in events(emitted, "furniture_updates")]
+    assert [frame[0]["position"]["x"] for frame in frames] == [5.0, 8.0]
+    assert events(emitted, "rate_limited")[0]["data"]["coalesced"] is True
+
+    # Disconnecting cancels parked events
+    await websocket.furniture_move("sid-2", _move(project_with_layout, "desk", 1.0))
+    await websocket.furniture_move("sid-2", _move(project_with_layout, "desk", 2.0))
+    await websocket.disconnect("sid-2")
+    await asyncio.sleep(0.1)
+    assert state.furnitures["desk"]["position"]["x"] == 1.0
+
+
+def test_room_state_keeps_a_bounded_op_log():
+    """Edits are numbered in order; clients further back than the ring buffer get None."""
+    room_dimensions = {"width": 10, "height": 3, "depth": 10}
+    state = RoomState(1, {"furnitures": [furniture("desk", 0, 0)]}, room_dimensions, op_log_size=3)
+    state.add(furniture("chair", 3, 0))
+    state.move("chair", {"x": 4, "y": 0, "z": 0})
+    state.move("missing", {"x": 4, "y": 0, "z": 0})
+    state.remove("desk")
+
+    assert state.version == 3
+    assert [(op["seq"], op["event"]) for op in state.ops_since(1)] == [
+        (2, "furniture_updates"),
+        (3, "furniture_deleted"),
+    ]
+    assert state.ops_since(3) == []
+    assert state.ops_since(4) is None
+
+    state.move("chair", {"x": 5, "y": 0, "z": 0})
+    state.move("chair", {"x": 6, "y": 0, "z": 0})
+    # Seqs 1-2 have left the ring buffer
+    assert state.ops_since(1) is None
+    assert [op["seq"] for op in state.ops_since(2)] == [3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_rejoin_resumes_from_last_seen_seq(emitted, auth_headers, project_with_layout):
+    """A client rejoining with its last seq gets only the ops it missed."""
+    await join("sid-1", auth_headers, project_with_layout)
+    await join("sid-2", auth_headers, project_with_layout)
+    snapshot = events(emitted, "room_snapshot")[-1]["data"]
+    assert snapshot["seq"] == 0
+
+    await websocket.disconnect("sid-2")
+    emitted.clear()
+    await websocket.furniture_move("sid-1", _move(project_with_layout, "chair", 4.0))
+    await websocket.furniture_add("sid-1", {"project_id": project_with_layout, "furniture": furniture("lamp", 6, 6)})
+    await websocket.furniture_delete("sid-1", {"project_id": project_with_layout, "furniture_id": "desk"})
+
+    # Broadcasts carry the seq they bring the room to, in order
+    edits = ("furniture_updates", "furniture_added", "furniture_deleted")
+    seqs = [call["data"]["seq"] for call in emitted if call["event"] in edits]
+    assert seqs == [1, 2, 3]
+
+    emitted.clear()
+    token = auth_headers["Authorization"].removeprefix("Bearer ")
+    await websocket.connect("sid-2", {}, {"token": token})
+    rejoin = {"project_id": project_with_layout, "last_seq": 1, "epoch": snapshot["epoch"]}
+    await websocket.join_project("sid-2", rejoin)
+
+    assert events(emitted, "room_snapshot") == []
+    resume = events(emitted, "room_resume")[0]
+    assert resume["to"] == "sid-2"
+    assert resume["data"]["seq"] == 3
+    ops = resume["data"]["ops"]
+    assert [(op["seq"], op["event"]) for op in ops] == [(2, "furniture_added"), (3, "furniture_deleted")]
+    assert ops[0]["data"]["furniture"]["id"] == "lamp"
+
+
+@pytest.mark.asyncio
+async def test_rejoin_falls_back_to_snapshot(emitted, auth_headers, project_with_layout, monkeypatch):
+    """Clients too far behind, or from an earlier load of the room, get a full snapshot."""
+    monkeypatch.setattr(settings, "COLLAB_OP_LOG_SIZE", 2)
+    await join("sid-1", auth_headers, project_with_layout)
+    epoch = events(emitted, "room_snapshot")[-1]["data"]["epoch"]
+    for x in (4.0, 5.0, 6.0):
+        await websocket.furniture_move("sid-1", _move(project_with_layout, "chair", x))
+
+    emitted.clear()
+    await websocket.join_project("sid-1", {"project_id": project_with_layout, "last_seq": 0, "epoch": epoch})
+    await websocket.join_project("sid-1", {"project_id": project_with_layout, "last_seq": 3, "epoch": "stale"})
+
+    snapshots = events(emitted, "room_snapshot")
+    assert len(snapshots) == 2
+    assert events(emitted, "room_resume") == []
+    assert snapshots[0]["data"]["seq"] == 3
+    chair = next(item for item in snapshots[0]["data"]["furniture_state"]["furnitures"] if item["id"] == "chair")
+    assert chair["position"]["x"] == 6.0
@@ -6,6 +6,7 @@ import { useLoader } from '@react-three/fiber';
 import { GLTFLoader } from 'three/addons/loaders/GLTFLoader.js';
 import { useEditorStore } from '@/store/editorStore';
 import { useToastStore } from '@/store/toastStore';
+import { socketService } from '@/lib/socket';
 import type { FurnitureItem } from '@/types/furniture';
 
 // Helper function to calculate rotated dimensions (bounding box after rotation)
@@ -812,13 +813,10 @@ export function Furniture(props: FurnitureProps) {
     }
     
     // Rotation is valid - proceed with update
-    updateFurniture(props.id, {
-      rotation: {
-        x: 0,
-        y: newRotationY,
-        z: 0,
-      }
-    });
+    const newRotation = { x: 0, y: newRotationY, z: 0 };
+    updateFurniture(props.id, { rotation: newRotation });
+    // Share the rotation so collaborators and the server-side room state see it
+    socketService.emitFurnitureMove(props.id, props.position, newRotation);
   };
 
   // Position furniture: use stored position directly
@@ -851,6 +849,8 @@ export function Furniture(props: FurnitureProps) {
         onDimensionsUpdate={(newDims: { width: number; height: number; depth: number }) => {
           // Update furniture dimensions in store when GLB loads with actual size
           updateFurniture(props.id, { dimensions: newDims });
+          // Share the size so collaborators, live saves and collision checks use it
+          socketService.emitFurnitureResize(props.id, newDims);
         }}
       />
 
@@ -9,10 +9,15 @@ import * as THREE from 'three';
 interface Collaborator {
   userId: string;
   sid: string;
+  nickname?: string;
   cursorPosition: [number, number, number];
   color: string;
 }
 
+interface PresenceSnapshot {
+  cursors: Collaborator[];
+}
+
 export function PresenceManager() {
   const { projectId } = useEditorStore();
   const { user } = useAuthStore();
@@ -33,11 +38,19 @@ export function PresenceManager() {
   useEffect(() => {
     if (!projectId || !user) return;
 
-    const handlePresenceUpdated = (data: Collaborator) => {
-      setCollaborators(prev => ({
-        ...prev,
-        [data.sid]: data
-      }));
+    // One snapshot per server tick carries every cursor that moved; our own is skipped
+    const handlePresenceSnapshot = (data: PresenceSnapshot) => {
+      const ownSid = socketService.socket?.id;
+      const cursors = data.cursors.filter(cursor => cursor.sid !== ownSid);
+      if (cursors.length === 0) return;
+
+      setCollaborators(prev => {
+        const next = { ...prev };
+        for (const cursor of cursors) {
+          next[cursor.sid] = cursor;
+        }
+        return next;
+      });
     };
 
     const handleUserLeft = (data: { sid: string }) => {
@@ -48,11 +61,11 @@ export function PresenceManager() {
       });
     };
 
-    socketService.on('presence_updated', handlePresenceUpdated);
+    socketService.on('presence_snapshot', handlePresenceSnapshot);
     socketService.on('user_left', handleUserLeft);
 
     return () => {
-      socketService.off('presence_updated', handlePresenceUpdated);
+      socketService.off('presence_snapshot', handlePresenceSnapshot);
       socketService.off('user_left', handleUserLeft);
     };
   }, [projectId, user]);
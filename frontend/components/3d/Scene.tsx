@@ -2121,6 +2121,7 @@ export function Scene({
 
       const newFurniture: FurnitureItem = {
         id: `${catalogItem.id}-${Date.now()}`,
+        catalogId: catalogItem.id,
         type: catalogItem.type,
         position: { x: initialX, y: initialY, z: initialZ },
         rotation: { x: 0, y: 0, z: 0 },
@@ -2129,6 +2130,7 @@ export function Scene({
         color: catalogItem.color,
         mountType: catalogItem.mountType,
         glbUrl: catalogItem.glbUrl,
+        footprint: catalogItem.footprint,
         price: catalogItem.price,
       };
 
@@ -83,8 +83,11 @@ export function EditorContainer({ projectId }: EditorContainerProps) {
     loadProject();
   }, [loadProject]);
 
-  // Setup auto-save (5 seconds)
-  useAutoSave(5000);
+  // Setup WebSocket connection
+  const { isLiveSaving } = useSocket(projectId, user?.id || null);
+
+  // Setup auto-save (5 seconds); while the server keeps the room state it saves it instead
+  useAutoSave(5000, !isLiveSaving);
 
   // Setup Ctrl+S keyboard shortcut
   useEffect(() => {
@@ -102,9 +105,6 @@ export function EditorContainer({ projectId }: EditorContainerProps) {
   // Setup other keyboard shortcuts
   useKeyboard();
 
-  // Setup WebSocket connection
-  useSocket(projectId, user?.id || null);
-
   // Setup locking event handlers
   useLockingEvents();
 
@@ -94,6 +94,7 @@ export function Sidebar() {
 
     const newFurniture: FurnitureItem = {
       id: `${catalogItem.id}-${Date.now()}`,
+      catalogId: catalogItem.id,
       type: catalogItem.type,
       position: { x: 0, y: initialY, z: 0 },
       rotation: { x: 0, y: 0, z: 0 },
@@ -102,6 +103,7 @@ export function Sidebar() {
       color: catalogItem.color,
       mountType: catalogItem.mountType,
       glbUrl: catalogItem.glbUrl, // S3 GLB URL
+      footprint: catalogItem.footprint,
       price: catalogItem.price, // Include price for budget calculation
     };
 
@@ -5,11 +5,13 @@
 import { useEffect, useRef } from 'react';
 import { useEditorStore } from '@/store/editorStore';
 
-export function useAutoSave(intervalMs: number = 5000) {
+export function useAutoSave(intervalMs: number = 5000, enabled: boolean = true) {
   const { saveLayout, hasUnsavedChanges, isSaving } = useEditorStore();
   const intervalRef = useRef<NodeJS.Timeout | null>(null);
 
   useEffect(() => {
+    if (!enabled) return;
+
     intervalRef.current = setInterval(() => {
       if (hasUnsavedChanges && !isSaving) {
         console.log('Auto-saving layout...');
@@ -22,5 +24,5 @@ export function useAutoSave(intervalMs: number = 5000) {
         clearInterval(intervalRef.current);
       }
     };
-  }, [saveLayout, hasUnsavedChanges, isSaving, intervalMs]);
+  }, [saveLayout, hasUnsavedChanges, isSaving, intervalMs, enabled]);
 }
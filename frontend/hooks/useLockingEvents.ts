@@ -25,6 +25,11 @@ export function useLockingEvents() {
       removeLockedItem(data.furniture_id);
     };
 
+    // Leases that ran out are released in one event per room
+    const handleObjectsUnlocked = (data: { furniture_ids: string[] }) => {
+      data.furniture_ids.forEach((furnitureId) => removeLockedItem(furnitureId));
+    };
+
     const handleLockRejected = (data: { furniture_id: string; locked_by: string }) => {
       addToast('다른 사용자가 편집 중인 가구입니다', 'warning');
       addLockedItem(data.furniture_id, data.locked_by);
@@ -47,6 +52,7 @@ export function useLockingEvents() {
     // Subscribe to events
     socketService.on('object_locked', handleObjectLocked);
     socketService.on('object_unlocked', handleObjectUnlocked);
+    socketService.on('objects_unlocked', handleObjectsUnlocked);
     socketService.on('lock_rejected', handleLockRejected);
     socketService.on('current_locks', handleCurrentLocks);
 
@@ -54,6 +60,7 @@ export function useLockingEvents() {
     return () => {
       socketService.off('object_locked', handleObjectLocked);
       socketService.off('object_unlocked', handleObjectUnlocked);
+      socketService.off('objects_unlocked', handleObjectsUnlocked);
       socketService.off('lock_rejected', handleLockRejected);
       socketService.off('current_locks', handleCurrentLocks);
     };
@@ -13,23 +13,59 @@ interface UserJoinedEvent {
   nickname: string;
 }
 
-interface FurnitureUpdatedEvent {
+interface FurnitureUpdate {
   furniture_id: string;
   position: FurnitureItem['position'];
   rotation: FurnitureItem['rotation'];
 }
 
+interface FurnitureUpdatesEvent {
+  updates: FurnitureUpdate[];
+  seq?: number;
+}
+
+interface RoomSnapshotEvent {
+  project_id: number;
+  epoch: string;
+  seq: number;
+  version: number;
+  furniture_state: { furnitures: FurnitureItem[] };
+}
+
 interface FurnitureAddedEvent {
   furniture: FurnitureItem;
+  seq?: number;
 }
 
 interface FurnitureDeletedEvent {
   furniture_id: string;
+  seq?: number;
+}
+
+interface FurnitureResizedEvent {
+  furniture_id: string;
+  dimensions: FurnitureItem['dimensions'];
+  seq?: number;
+}
+
+type RoomOp =
+  | { seq: number; event: 'furniture_updates'; data: FurnitureUpdatesEvent }
+  | { seq: number; event: 'furniture_added'; data: FurnitureAddedEvent }
+  | { seq: number; event: 'furniture_resized'; data: FurnitureResizedEvent }
+  | { seq: number; event: 'furniture_deleted'; data: FurnitureDeletedEvent };
+
+interface RoomResumeEvent {
+  project_id: number;
+  epoch: string;
+  seq: number;
+  ops: RoomOp[];
 }
 
 export function useSocket(projectId: number | null, userId: number | null) {
   const [isConnected, setIsConnected] = useState(false);
-  const { updateFurniture, addFurniture, deleteFurniture } = useEditorStore();
+  // The server keeps and saves the room's state; only true with a single backend worker
+  const [isLiveSaving, setIsLiveSaving] = useState(false);
+  const { setFurnitures, updateFurniture, addFurniture, deleteFurniture } = useEditorStore();
   const addToast = useToastStore((state) => state.addToast);
 
   useEffect(() => {
@@ -44,6 +80,7 @@ export function useSocket(projectId: number | null, userId: number | null) {
 
     socket.on('disconnect', () => {
       setIsConnected(false);
+      setIsLiveSaving(false);
       addToast('Disconnected from server', 'warning');
     });
 
@@ -60,23 +97,69 @@ export function useSocket(projectId: number | null, userId: number | null) {
       addToast(`${data.nickname}님이 입장하셨습니다`, 'info');
     });
 
-    socket.on('furniture_updated', (data: FurnitureUpdatedEvent) => {
-      updateFurniture(data.furniture_id, {
-        position: data.position,
-        rotation: data.rotation,
+    // Moves arrive in frames holding the latest pose of each moved item
+    const applyUpdates = (data: FurnitureUpdatesEvent) => {
+      data.updates.forEach((update) => {
+        updateFurniture(update.furniture_id, {
+          position: update.position,
+          rotation: update.rotation,
+        });
       });
-    });
+    };
 
-    socket.on('furniture_added', (data: FurnitureAddedEvent) => {
+    const applyAdded = (data: FurnitureAddedEvent) => {
       // Only add if not already present (prevent duplicates from WebSocket)
       const { furnitures } = useEditorStore.getState();
       if (!furnitures.some(f => f.id === data.furniture.id)) {
         addFurniture(data.furniture);
       }
+    };
+
+    const applyResized = (data: FurnitureResizedEvent) => {
+      updateFurniture(data.furniture_id, { dimensions: data.dimensions });
+    };
+
+    const applyDeleted = (data: FurnitureDeletedEvent) => {
+      deleteFurniture(data.furniture_id);
+    };
+
+    // Live room state on join, including collaborators' unsaved edits
+    socket.on('room_snapshot', (data: RoomSnapshotEvent) => {
+      setFurnitures(data.furniture_state.furnitures ?? []);
+      socketService.setRoomPosition(data.epoch, data.seq);
+      setIsLiveSaving(true);
+    });
+
+    // After a short drop, only the edits missed since the last seen seq
+    socket.on('room_resume', (data: RoomResumeEvent) => {
+      data.ops.forEach((op) => {
+        if (op.event === 'furniture_updates') applyUpdates(op.data);
+        else if (op.event === 'furniture_added') applyAdded(op.data);
+        else if (op.event === 'furniture_resized') applyResized(op.data);
+        else if (op.event === 'furniture_deleted') applyDeleted(op.data);
+      });
+      socketService.setRoomPosition(data.epoch, data.seq);
+      setIsLiveSaving(true);
+    });
+
+    socket.on('furniture_updates', (data: FurnitureUpdatesEvent) => {
+      applyUpdates(data);
+      socketService.noteSeq(data.seq);
+    });
+
+    socket.on('furniture_added', (data: FurnitureAddedEvent) => {
+      applyAdded(data);
+      socketService.noteSeq(data.seq);
+    });
+
+    socket.on('furniture_resized', (data: FurnitureResizedEvent) => {
+      applyResized(data);
+      socketService.noteSeq(data.seq);
     });
 
     socket.on('furniture_deleted', (data: FurnitureDeletedEvent) => {
-      deleteFurniture(data.furniture_id);
+      applyDeleted(data);
+      socketService.noteSeq(data.seq);
     });
 
     socket.on('validation_result', (data: ValidationResult) => {
@@ -92,8 +175,9 @@ export function useSocket(projectId: number | null, userId: number | null) {
     return () => {
       socketService.disconnect();
       setIsConnected(false);
+      setIsLiveSaving(false);
     };
-  }, [projectId, userId, updateFurniture, addFurniture, deleteFurniture, addToast]);
+  }, [projectId, userId, setFurnitures, updateFurniture, addFurniture, deleteFurniture, addToast]);
 
-  return { isConnected };
+  return { isConnected, isLiveSaving };
 }
@@ -25,9 +25,16 @@ class SocketService {
   private pendingMove: { furnitureId: string; position: Vector3; rotation: Vector3 } | null = null;
   private moveThrottleTimeout: NodeJS.Timeout | null = null;
   private readonly MOVE_THROTTLE_MS = 200; // Throttle furniture move events to 5 per second
+  private lockHeartbeats = new Map<string, NodeJS.Timeout>();
+  private readonly LOCK_HEARTBEAT_MS = 10000; // Well inside the server's lock lease (30s by default)
+  // Room position for resuming after a dropped connection
+  private roomEpoch: string | null = null;
+  private lastSeq: number | null = null;
 
   connect(projectId: number): Socket {
     this.projectId = projectId;
+    this.roomEpoch = null;
+    this.lastSeq = null;
     const token = getAuthToken();
 
     this.socket = io(SOCKET_URL, {
@@ -39,15 +46,54 @@ class SocketService {
     });
 
     this.socket.on('connect', () => {
+      // On reconnect the server sends only the edits missed since lastSeq, or a snapshot
       this.socket?.emit('join_project', {
         project_id: projectId,
+        ...(this.roomEpoch !== null && this.lastSeq !== null
+          ? { epoch: this.roomEpoch, last_seq: this.lastSeq }
+          : {}),
       });
     });
 
+    // Heartbeats run only while the server says this socket holds the lock
+    this.socket.on('object_locked', (data: { furniture_id: string; sid?: string }) => {
+      if (data.sid && data.sid === this.socket?.id) {
+        this.startLockHeartbeat(data.furniture_id);
+      }
+    });
+    this.socket.on('lock_rejected', (data: { furniture_id: string }) => {
+      this.stopLockHeartbeat(data.furniture_id);
+    });
+    this.socket.on('object_unlocked', (data: { furniture_id: string }) => {
+      this.stopLockHeartbeat(data.furniture_id);
+    });
+    this.socket.on('objects_unlocked', (data: { furniture_ids: string[] }) => {
+      data.furniture_ids.forEach((furnitureId) => this.stopLockHeartbeat(furnitureId));
+    });
+    this.socket.on('disconnect', () => {
+      // The server releases a disconnected socket's locks
+      this.clearLocks();
+    });
+
     return this.socket;
   }
 
+  /** Record the room load and sequence number a snapshot or resume brought us to. */
+  setRoomPosition(epoch: string, seq: number) {
+    this.roomEpoch = epoch;
+    this.lastSeq = seq;
+  }
+
+  /** Advance the last seen sequence number from a room broadcast. */
+  noteSeq(seq: number | undefined) {
+    if (seq !== undefined && (this.lastSeq === null || seq > this.lastSeq)) {
+      this.lastSeq = seq;
+    }
+  }
+
   disconnect() {
+    this.clearLocks();
+
     if (this.socket) {
       this.socket.disconnect();
       this.socket = null;
@@ -100,6 +146,24 @@ class SocketService {
     }
   }
 
+  // Unthrottled move, for edits that are not drags (e.g. undo/redo)
+  emitFurnitureMoveNow(furnitureId: string, position: Vector3, rotation: Vector3) {
+    if (!this.socket || !this.projectId) return;
+
+    if (this.pendingMove?.furnitureId === furnitureId) {
+      // A drag's throttled position would land after this one
+      this.pendingMove = null;
+    } else {
+      this.flushPendingMove();
+    }
+    this.socket.emit('furniture_move', {
+      project_id: this.projectId,
+      furniture_id: furnitureId,
+      position,
+      rotation,
+    });
+  }
+
   emitFurnitureAdd(furniture: FurnitureItem) {
     if (this.socket && this.projectId) {
       this.socket.emit('furniture_add', {
@@ -109,6 +173,16 @@ class SocketService {
     }
   }
 
+  emitFurnitureResize(furnitureId: string, dimensions: FurnitureItem['dimensions']) {
+    if (this.socket && this.projectId) {
+      this.socket.emit('furniture_resize', {
+        project_id: this.projectId,
+        furniture_id: furnitureId,
+        dimensions,
+      });
+    }
+  }
+
   emitFurnitureDelete(furnitureId: string) {
     if (this.socket && this.projectId) {
       this.socket.emit('furniture_delete', {
@@ -138,6 +212,8 @@ class SocketService {
   }
 
   releaseLock(furnitureId: string) {
+    this.stopLockHeartbeat(furnitureId);
+
     if (this.socket && this.projectId) {
       this.socket.emit('release_lock', {
         project_id: this.projectId,
@@ -146,6 +222,33 @@ class SocketService {
     }
   }
 
+  // Keep the lease alive while the lock is held, even when the item is not being dragged
+  private startLockHeartbeat(furnitureId: string) {
+    if (this.lockHeartbeats.has(furnitureId)) return;
+    this.lockHeartbeats.set(
+      furnitureId,
+      setInterval(() => {
+        this.socket?.emit('lock_heartbeat', {
+          project_id: this.projectId,
+          furniture_id: furnitureId,
+        });
+      }, this.LOCK_HEARTBEAT_MS)
+    );
+  }
+
+  private stopLockHeartbeat(furnitureId: string) {
+    const heartbeat = this.lockHeartbeats.get(furnitureId);
+    if (heartbeat) {
+      clearInterval(heartbeat);
+      this.lockHeartbeats.delete(furnitureId);
+    }
+  }
+
+  private clearLocks() {
+    this.lockHeartbeats.forEach((timer) => clearInterval(timer));
+    this.lockHeartbeats.clear();
+  }
+
   emit(event: string, data: unknown) {
     if (this.socket) {
       this.socket.emit(event, data);
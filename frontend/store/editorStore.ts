@@ -71,6 +71,43 @@ interface EditorState {
   paste: () => void;
 }
 
+/**
+ * Send the edits turning one furniture list into another to collaborators.
+ * Undo/redo replace the whole list, so the live room needs them as
+ * add/move/delete events like any other edit.
+ */
+function emitFurnitureDiff(before: FurnitureItem[], after: FurnitureItem[]) {
+  const previous = new Map(before.map((f) => [f.id, f]));
+  const next = new Map(after.map((f) => [f.id, f]));
+
+  previous.forEach((_, id) => {
+    if (!next.has(id)) socketService.emitFurnitureDelete(id);
+  });
+
+  next.forEach((item, id) => {
+    const old = previous.get(id);
+    if (!old) {
+      socketService.emitFurnitureAdd(item);
+      return;
+    }
+    if (old === item) return;
+
+    // isColliding is a local collision highlight, not an edit
+    const { position: oldPosition, rotation: oldRotation, isColliding: _oldColliding, ...oldRest } = old;
+    const { position, rotation, isColliding: _colliding, ...rest } = item;
+    if (JSON.stringify(oldRest) !== JSON.stringify(rest)) {
+      // Collaborators ignore adds of ids they have, so replace the item
+      socketService.emitFurnitureDelete(id);
+      socketService.emitFurnitureAdd(item);
+    } else if (
+      JSON.stringify(oldPosition) !== JSON.stringify(position) ||
+      JSON.stringify(oldRotation) !== JSON.stringify(rotation)
+    ) {
+      socketService.emitFurnitureMoveNow(id, position, rotation);
+    }
+  });
+}
+
 export const useEditorStore = create<EditorState>((set, get) => ({
   projectId: null,
   projectOwnerId: null,
@@ -222,6 +259,7 @@ export const useEditorStore = create<EditorState>((set, get) => ({
     const newIndex = state.historyIndex - 1;
     const previousState = state.historyStack[newIndex];
 
+    emitFurnitureDiff(state.furnitures, previousState.furnitures);
     set({
       furnitures: [...previousState.furnitures],
       historyIndex: newIndex,
@@ -240,6 +278,7 @@ export const useEditorStore = create<EditorState>((set, get) => ({
     const newIndex = state.historyIndex + 1;
     const nextState = state.historyStack[newIndex];
 
+    emitFurnitureDiff(state.furnitures, nextState.furnitures);
     set({
       furnitures: [...nextState.furnitures],
       historyIndex: newIndex,
@@ -14,6 +14,7 @@ export interface FurnitureCatalogItem {
   tags: string[];
   mountType?: 'floor' | 'wall' | 'surface'; // floor: 바닥, wall: 벽걸이, surface: 가구 위
   glbUrl?: string; // S3 GLB file presigned URL
+  footprint?: number[][][]; // Convex footprint parts in unit-box XZ coordinates (server collision)
   glbKey?: string; // S3 GLB file key
 }
 
@@ -25,10 +25,12 @@ export interface FurnitureItem {
   dimensions: Dimensions3D;
   color?: string;
   isColliding?: boolean;
+  catalogId?: string; // Catalog item this was placed from; the server applies its mount type
   mountType?: 'floor' | 'wall' | 'surface'; // floor: 바닥, wall: 벽걸이, surface: 가구 위
   mountedOn?: string; // ID of furniture this is mounted on (for surface type)
   wallSide?: 'north' | 'south' | 'east' | 'west'; // Which wall it's mounted on
   glbUrl?: string; // S3 GLB file URL for 3D model
+  footprint?: number[][][]; // Catalog footprint parts (unit-box XZ coordinates)
   price?: number; // Price of the furniture item
 }
 